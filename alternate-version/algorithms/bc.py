@@ -8,7 +8,14 @@ class BackwardChaining:
     Implements the Backward Chaining algorithm for Horn clauses
     """
 
-    def __init__(self):
+    # Supported strategies: plain depth-first search, search with a table of
+    # proven and failed goals, or search in fail-first cost order
+    MODES = ("search", "tabled", "cost")
+
+    def __init__(self, mode: str = "search"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown backward chaining mode: {mode}")
+        self.mode = mode
         self.kb: KnowledgeBase = None
         self.inferred: Set[str] = set()
         self.implications: Dict[str, List[Tuple[Set[str], str]]] = {}
@@ -71,39 +78,221 @@ class BackwardChaining:
                 else:  # Implication
                     self.implications[conclusion].append(premises)
 
-    def _bc_or(self, goal: str, visited: Set[str]) -> bool:
+        if self.mode == "cost":
+            self._order_by_cost(set(self.inferred))
+
+    def _order_by_cost(self, facts: Set[str]) -> None:
         """
-        OR step of backward chaining - checks if any clause can prove the goal
+        Reorders the implications for the "cost" mode
+
+        Within a body, premises no rule concludes (and that are not facts)
+        come first since they fail at once, then the derived premises with
+        the fewest defining rules and the shallowest dependency cone, and
+        facts last. Rules are tried cheapest body first, a body costing the
+        sum of its premises' costs: 0 for a fact, 1 for a premise that fails
+        at once, else 1 + its cone depth. Remaining ties are broken by name
+        and clause order, so unlike the set order of the other modes the
+        search is reproducible.
+
+        The cone depth is 0 for facts and symbols no rule concludes, and
+        otherwise one more than the deepest premise of its rules. It is found
+        by peeling the premise -> conclusion graph bottom up; symbols on or
+        above a cycle are never peeled and get one more than the deepest
+        peeled symbol.
         """
-        if goal in self.inferred:
-            return True
+        rule_counts = {s: len(rules) for s, rules in self.implications.items()}
+
+        # Premise occurrences not yet peeled, per conclusion (facts need none)
+        pending: Dict[str, int] = {}
+        users: Dict[str, List[str]] = {}
+        for conclusion, premise_sets in self.implications.items():
+            if conclusion in facts:
+                continue
+            for premises in premise_sets:
+                for premise in premises:
+                    pending[conclusion] = pending.get(conclusion, 0) + 1
+                    users.setdefault(premise, []).append(conclusion)
 
-        if goal in visited:
-            return False
+        depth = dict.fromkeys(set(self.implications) | set(users), 0)
+        agenda = [s for s in depth if not pending.get(s)]
+        while agenda:
+            s = agenda.pop()
+            for conclusion in users.get(s, ()):
+                depth[conclusion] = max(depth[conclusion], depth[s] + 1)
+                pending[conclusion] -= 1
+                if not pending[conclusion]:
+                    agenda.append(conclusion)
+        cyclic = max(depth.values(), default=0) + 1
+        for s, count in pending.items():
+            if count:
+                depth[s] = cyclic
 
-        visited.add(goal)
+        def premise_key(s: str) -> Tuple[int, int, int, str]:
+            group = 2 if s in facts else (1 if rule_counts.get(s) else 0)
+            return group, rule_counts.get(s, 0), depth.get(s, 0), s
 
-        if goal in self.implications:
-            for premises in self.implications[goal]:
-                if self._bc_and(premises, visited):
-                    self.inferred.add(goal)
-                    return True
+        def cost(s: str) -> int:
+            return 0 if s in facts else (1 + depth.get(s, 0) if rule_counts.get(s) else 1)
 
-        return False
+        for conclusion, premise_sets in self.implications.items():
+            bodies = [tuple(sorted(premises, key=premise_key)) for premises in premise_sets]
+            bodies.sort(key=lambda body: sum(cost(s) for s in body))
+            self.implications[conclusion] = bodies
 
-    def _bc_and(self, goals: Set[str], visited: Set[str]) -> bool:
+    def _bc_search(self, query: str) -> bool:
         """
-        AND step of backward chaining - checks if all premises can be proved
+        Depth-first backward chaining over an explicit stack
+
+        Each goal whose rules are being tried has a frame instead of a
+        Python call, so proof depth is not bounded by the recursion limit.
+        A goal fails if it is already on the current path (a cycle); once
+        its search returns it may be proven from another branch.
         """
-        for goal in goals:
-            if not self._bc_or(goal, visited):
-                return False
-        return True
+        visited: Set[str] = set()  # Goals on the current path
+        # Frames [goal, iterator over its premise sets, iterator over the
+        # premise set being proven (None between rules)]
+        frames: List[list] = []
+        goal, result = query, None
+        while True:
+            # OR step: the goal is known, blocked by a cycle, or gets a frame
+            if goal is not None:
+                if goal in self.inferred:
+                    result = True
+                elif goal in visited:
+                    result = False
+                else:
+                    visited.add(goal)
+                    frames.append([goal, iter(self.implications.get(goal, ())), None])
+                goal = None
+
+            if not frames:
+                return result
+
+            # AND step: a failed premise abandons the rule for the next one
+            frame = frames[-1]
+            if result is False:
+                frame[2] = None
+            result = None
+            if frame[2] is None:
+                premises = next(frame[1], None)
+                if premises is None:
+                    visited.discard(frame[0])
+                    frames.pop()
+                    result = False
+                    continue
+                frame[2] = iter(premises)
+
+            goal = next(frame[2], None)
+            if goal is None:
+                self.inferred.add(frame[0])
+                visited.discard(frame[0])
+                frames.pop()
+                result = True
+
+    def _bc_tabled(self, query: str) -> bool:
+        """
+        Backward chaining with a table of proven and failed goals
+
+        A proven goal is final as soon as one of its rules succeeds, since
+        goals still in progress never count as proven. A goal that fails
+        while depending on a goal still in progress only fails tentatively:
+        the open goals form strongly connected components, tracked as in
+        Tarjan's algorithm, and failures are recorded once the whole
+        component is complete. If a goal of the component was proven in the
+        meantime, the tentative failures may be wrong, so they are dropped
+        and the component is searched again (each pass proves a new goal).
+        Every other subgoal is resolved at most once per query. Runs over an
+        explicit stack of frames like _bc_search.
+        """
+        failed: Set[str] = set()
+        index: Dict[str, int] = {}  # Search numbers of the goals of open components
+        low: Dict[str, int] = {}
+        stack: List[str] = []  # Goals of open components, in search order
+        # Frames [goal, premise set iterator, premise iterator, position of goal
+        # in stack] of the goals whose rules are being tried
+        frames: List[list] = []
+        counter = 0
+
+        def enter(goal: str) -> None:
+            nonlocal counter
+            index[goal] = low[goal] = counter
+            counter += 1
+            frames.append([goal, iter(self.implications.get(goal, ())), None, len(stack)])
+            stack.append(goal)
+
+        goal, result = query, None
+        while True:
+            if goal is not None:
+                if goal in self.inferred:
+                    result = True
+                elif goal in failed:
+                    result = False
+                # In progress, or tentatively failed in an open component
+                elif goal in index:
+                    caller = frames[-1][0]
+                    low[caller] = min(low[caller], index[goal])
+                    result = False
+                else:
+                    enter(goal)
+                goal = None
+
+            if not frames:
+                return result
+
+            frame = frames[-1]
+            if result is False:
+                frame[2] = None
+            result = None
+            if frame[2] is None:
+                premises = next(frame[1], None)
+                proven = False
+                if premises is not None:
+                    frame[2] = iter(premises)
+            if frame[2] is not None:
+                goal = next(frame[2], None)
+                if goal is not None:
+                    continue
+                proven = True
+
+            # Rules exhausted, or all premises of the current rule hold
+            head, position = frame[0], frame[3]
+            frames.pop()
+            if proven:
+                self.inferred.add(head)
+
+            # Not the root of its component: the root completes it
+            if low[head] < index[head]:
+                caller = frames[-1][0]
+                low[caller] = min(low[caller], low[head])
+                result = proven
+                continue
+
+            component = stack[position:]
+            del stack[position:]
+            for s in component:
+                del index[s], low[s]
+            if proven or not any(s in self.inferred for s in component):
+                if not proven:
+                    failed.update(component)
+                result = proven
+            else:
+                enter(head)
+
+    def _prove(self, query: str) -> bool:
+        """Runs the search of the selected mode for query"""
+        if self.mode == "tabled":
+            return self._bc_tabled(query)
+        return self._bc_search(query)
 
     def check_entailment(self, kb: KnowledgeBase, query: str) -> Tuple[bool, List[str]]:
         """
         Determines if KB entails query using backward chaining
 
+        The "search" mode only remembers proven goals, so a failed subgoal is
+        explored again whenever another rule needs it. The "tabled" mode
+        (see _bc_tabled) also remembers failures, and the "cost" mode
+        searches like "search" in the order of _order_by_cost.
+
         Args:
             kb (KnowledgeBase): The knowledge base containing Horn clauses
             query (str): The query to check
@@ -119,6 +308,62 @@ class BackwardChaining:
         self._process_knowledge_base(kb)
 
         # Run backward chaining
-        result = self._bc_or(query, set())
+        result = self._prove(query)
 
         return result, list(self.inferred)
+
+    def check_entailments(self, kb: KnowledgeBase, queries: List[str]) -> List[Tuple[bool, List[str]]]:
+        """
+        Answers many queries from one processed knowledge base
+
+        The implications are extracted once. Backward chaining with cycle
+        detection proves exactly the symbols in their forward closure, so
+        that closure is computed once and queries outside it are answered
+        immediately with an empty proof; only provable queries run the
+        backward search. Repeated queries are answered once.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base containing Horn clauses
+            queries (List[str]): The queries to check
+
+        Returns:
+            List[Tuple[bool, List[str]]]: (True if entailed, list of inferred
+            symbols) for each query
+        """
+        kb.horn_only = True
+
+        self.inferred.clear()
+        self._process_knowledge_base(kb)
+        facts = set(self.inferred)
+        provable = self._provable_symbols(facts)
+
+        results = {}
+        for query in queries:
+            if query in results:
+                continue
+            if query not in provable:
+                results[query] = (False, [])
+                continue
+            self.inferred = set(facts)
+            results[query] = (self._prove(query), list(self.inferred))
+        return [results[query] for query in queries]
+
+    def _provable_symbols(self, facts: Set[str]) -> Set[str]:
+        """Computes the closure of the facts under the extracted implications"""
+        waiting: Dict[str, List[Tuple[str, int]]] = {}
+        count = []
+        for conclusion, premise_sets in self.implications.items():
+            for premises in premise_sets:
+                for premise in premises:
+                    waiting.setdefault(premise, []).append((conclusion, len(count)))
+                count.append(len(premises))
+
+        provable = set(facts)
+        agenda = list(facts)
+        while agenda:
+            for conclusion, i in waiting.pop(agenda.pop(), ()):
+                count[i] -= 1
+                if count[i] == 0 and conclusion not in provable:
+                    provable.add(conclusion)
+                    agenda.append(conclusion)
+        return provable
@@ -0,0 +1,303 @@
+# /algorithms/bdd.py
+import logging
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, Union
+from data.input_parser import InputParser
+from data.knowledge_base import KnowledgeBase, Literal, Expression, LogicalOperator
+
+
+class BDD:
+    """
+    Reduced ordered binary decision diagram manager
+
+    Nodes are integers indexing 'nodes'; 0 and 1 are the FALSE and TRUE
+    terminals. The unique table guarantees that equal functions share one
+    node, so equivalence and tautology checks are node comparisons, and the
+    computed cache memoizes every apply call.
+
+    Attributes:
+        order (List[str]): Variables from top (level 0) to bottom
+        nodes (List[Tuple[int, int, int]]): (level, low child, high child) per node
+    """
+
+    FALSE = 0
+    TRUE = 1
+
+    # Level of the terminal nodes, below every variable
+    TERMINAL_LEVEL = sys.maxsize
+
+    # Truth tables of the supported binary operators
+    OPERATORS = {
+        "and": lambda a, b: a and b,
+        "or": lambda a, b: a or b,
+        "xor": lambda a, b: a != b,
+        "implies": lambda a, b: (not a) or b,
+        "iff": lambda a, b: a == b,
+    }
+
+    def __init__(self, order: List[str]):
+        self.order: List[str] = []
+        self.levels: Dict[str, int] = {}
+        self.nodes: List[Tuple[int, int, int]] = [
+            (self.TERMINAL_LEVEL, 0, 0), (self.TERMINAL_LEVEL, 1, 1)]
+        self.unique: Dict[Tuple[int, int, int], int] = {}
+        self.cache: Dict[Tuple[str, int, int], int] = {}
+        for name in order:
+            self.add_variable(name)
+
+    def add_variable(self, name: str) -> None:
+        """Appends a variable below all existing ones"""
+        if name not in self.levels:
+            self.levels[name] = len(self.order)
+            self.order.append(name)
+
+    def make(self, level: int, low: int, high: int) -> int:
+        """Returns the node testing 'level', sharing or skipping it when possible"""
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            node = len(self.nodes)
+            self.nodes.append(key)
+            self.unique[key] = node
+        return node
+
+    def variable(self, name: str) -> int:
+        """Returns the node of a single variable"""
+        self.add_variable(name)
+        return self.make(self.levels[name], self.FALSE, self.TRUE)
+
+    def negate(self, u: int) -> int:
+        return self.apply("xor", u, self.TRUE)
+
+    def apply(self, op: str, u: int, v: int) -> int:
+        """
+        Combines two diagrams with a binary operator
+
+        Runs over an explicit stack of operand pairs rather than recursing
+        once per level, so diagrams over thousands of variables do not hit
+        the recursion limit.
+
+        Args:
+            op (str): One of BDD.OPERATORS
+            u (int): Left operand node
+            v (int): Right operand node
+
+        Returns:
+            int: Node of the combined function
+        """
+        nodes, cache = self.nodes, self.cache
+        # Entries (u, v, None) for pairs to combine, (u, v, level) for pairs
+        # whose cofactors are being combined; results are pushed on values
+        stack = [(u, v, None)]
+        values = []
+        while stack:
+            u, v, level = stack.pop()
+            if level is not None:
+                high, low = values.pop(), values.pop()
+                result = self.make(level, low, high)
+                cache[(op, u, v)] = result
+                values.append(result)
+                continue
+
+            result = self._shortcut(op, u, v)
+            if result is None:
+                result = cache.get((op, u, v))
+            if result is not None:
+                values.append(result)
+                continue
+
+            u_level, u_low, u_high = nodes[u]
+            v_level, v_low, v_high = nodes[v]
+            level = min(u_level, v_level)
+            if u_level != level:
+                u_low = u_high = u
+            if v_level != level:
+                v_low = v_high = v
+            stack.append((u, v, level))
+            stack.append((u_high, v_high, None))
+            stack.append((u_low, v_low, None))
+        return values.pop()
+
+    def _shortcut(self, op: str, u: int, v: int) -> Optional[int]:
+        """Returns the result of apply when it follows from the terminals, else None"""
+        if u <= 1 and v <= 1:
+            return int(self.OPERATORS[op](u == 1, v == 1))
+        if op == "and":
+            if u == 0 or v == 0:
+                return 0
+            if u == 1 or u == v:
+                return v
+            if v == 1:
+                return u
+        elif op == "or":
+            if u == 1 or v == 1:
+                return 1
+            if u == 0 or u == v:
+                return v
+            if v == 0:
+                return u
+        return None
+
+    def conjoin(self, nodes: List[int]) -> int:
+        """Conjoins many diagrams pairwise, keeping intermediate results small"""
+        if not nodes:
+            return self.TRUE
+        while len(nodes) > 1:
+            paired = [self.apply("and", nodes[i], nodes[i + 1]) for i in range(0, len(nodes) - 1, 2)]
+            if len(nodes) % 2:
+                paired.append(nodes[-1])
+            nodes = paired
+        return nodes[0]
+
+    def from_expression(self, expr: Union[Literal, Expression]) -> int:
+        """
+        Builds the diagram of a logical expression
+
+        The expression tree is walked in post-order over an explicit stack,
+        so deeply nested expressions do not hit the recursion limit.
+        """
+        # Entries (expression, whether its operands are already on values)
+        stack = [(expr, False)]
+        values: List[int] = []
+        while stack:
+            expr, expanded = stack.pop()
+            if isinstance(expr, Literal):
+                node = self.variable(expr.name)
+                values.append(self.negate(node) if expr.negative else node)
+            elif not isinstance(expr, Expression):
+                raise ValueError(f"Unknown expression type: {type(expr)}")
+            elif not expanded:
+                stack.append((expr, True))
+                stack.extend((op, False) for op in reversed(expr.operands))
+            else:
+                count = len(expr.operands)
+                operands = values[len(values) - count:]
+                del values[len(values) - count:]
+                values.append(self._combine(expr.operator, operands))
+        return values.pop()
+
+    def _combine(self, operator: LogicalOperator, operands: List[int]) -> int:
+        """Applies a logical operator to the diagrams of its operands"""
+        if operator == LogicalOperator.NOT:
+            return self.negate(operands[0])
+        elif operator == LogicalOperator.AND:
+            return self.conjoin(operands)
+        elif operator == LogicalOperator.OR:
+            result = self.FALSE
+            for node in operands:
+                result = self.apply("or", result, node)
+            return result
+        elif operator == LogicalOperator.IMPLIES:
+            return self.apply("implies", self.conjoin(operands[:-1]), operands[-1])
+        elif operator == LogicalOperator.BICON:
+            if len(operands) != 2:
+                raise ValueError("Biconditional must have exactly two operands")
+            return self.apply("iff", operands[0], operands[1])
+
+        raise ValueError(f"Unknown operator: {operator}")
+
+    def count(self, u: int, variable_count: int) -> int:
+        """
+        Counts the satisfying assignments of the first variable_count variables
+
+        Every node below u is visited once, in increasing id order, which is
+        a topological order because children are always created first.
+        """
+        reachable, stack = set(), [u]
+        while stack:
+            node = stack.pop()
+            if node > 1 and node not in reachable:
+                reachable.add(node)
+                stack.extend(self.nodes[node][1:])
+
+        def level(node: int) -> int:
+            return variable_count if node <= 1 else self.nodes[node][0]
+
+        counts = {0: 0, 1: 1}
+        for node in sorted(reachable):
+            node_level, low, high = self.nodes[node]
+            counts[node] = (counts[low] << (level(low) - node_level - 1)) + \
+                (counts[high] << (level(high) - node_level - 1))
+        return counts[u] << level(u)
+
+
+class BDDEntailment:
+    """
+    Answers entailment queries from a knowledge base compiled into a BDD
+
+    The KB is compiled on first use and again whenever its version shows
+    that clauses were added or retracted since. Every query is then a
+    single implication test against the compiled diagram, and the model
+    count a linear-time traversal of it.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.bdd: Optional[BDD] = None
+        self.kb_node: Optional[int] = None
+        # The compiled KnowledgeBase and its version at compile time
+        self._compiled: Optional[Tuple[KnowledgeBase, int]] = None
+        self._symbol_count = 0
+
+    @staticmethod
+    def variable_order(kb: KnowledgeBase) -> List[str]:
+        """
+        Static variable ordering from clause co-occurrence
+
+        Greedily picks the symbol most strongly tied to the symbols already
+        placed (ties broken by overall connectivity, then name), so symbols
+        sharing clauses end up close together in the order.
+        """
+        weights = defaultdict(lambda: defaultdict(int))
+        for clause in kb.clauses:
+            names = sorted(clause.get_symbols())
+            for a in names:
+                for b in names:
+                    if a != b:
+                        weights[a][b] += 1
+        degree = {name: sum(weights[name].values()) for name in kb.symbols}
+
+        order, attached = [], defaultdict(int)
+        remaining = set(kb.symbols)
+        while remaining:
+            best = min(remaining, key=lambda name: (-attached[name], -degree[name], name))
+            remaining.remove(best)
+            order.append(best)
+            for neighbour, weight in weights[best].items():
+                attached[neighbour] += weight
+        return order
+
+    def compile(self, kb: KnowledgeBase) -> None:
+        """Compiles the knowledge base into a BDD"""
+        self.bdd = BDD(self.variable_order(kb))
+        self.kb_node = self.bdd.conjoin(
+            [self.bdd.from_expression(clause.expression) for clause in kb.clauses])
+        self._compiled = (kb, kb.version)
+        self._symbol_count = len(kb.symbols)
+        self.logger.info(
+            f"Compiled {len(kb.clauses)} clauses into a BDD of {len(self.bdd.nodes)} nodes")
+
+    def check_entailment(self, kb: KnowledgeBase,
+                         query: Union[str, Literal, Expression]) -> Tuple[bool, int]:
+        """
+        Checks if KB entails query, compiling the KB on first use
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            query (Union[str, Literal, Expression]): The query to check
+
+        Returns:
+            Tuple[bool, int]: (Whether KB entails query, Number of models where KB is true)
+        """
+        if self._compiled is None or self._compiled[0] is not kb or self._compiled[1] != kb.version:
+            self.compile(kb)
+
+        query_expr = query if isinstance(query, (Literal, Expression)) else \
+            InputParser.parse_expression(InputParser.tokenize(query))
+        query_node = self.bdd.from_expression(query_expr)
+
+        entailed = self.bdd.apply("implies", self.kb_node, query_node) == BDD.TRUE
+        return entailed, self.bdd.count(self.kb_node, self._symbol_count)
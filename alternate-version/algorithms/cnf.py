@@ -0,0 +1,122 @@
+# /algorithms/cnf.py
+from typing import Dict, List, Union
+from data.knowledge_base import Literal, Expression, LogicalOperator
+
+
+class CNFConverter:
+    """
+    Converts knowledge base expressions into clausal normal form
+
+    Clauses are lists of non-zero integers in DIMACS style: variable v is
+    true in literal v and false in literal -v. Expressions that are already
+    clausal (literals, disjunctions, implications between literal
+    conjunctions and literals) are translated directly. Nested sub-formulas
+    that do not fit in a clause are replaced by a fresh auxiliary variable
+    with a full Tseitin equivalence, so every model of the original
+    expressions extends to exactly one model of the CNF.
+
+    Attributes:
+        clauses (List[List[int]]): The generated clauses
+        variables (Dict[str, int]): Maps each symbol to its variable
+        variable_count (int): Number of variables, including auxiliary ones
+    """
+
+    def __init__(self):
+        self.clauses: List[List[int]] = []
+        self.variables: Dict[str, int] = {}
+        self.variable_count = 0
+
+    def add_symbol(self, name: str) -> int:
+        """Returns the variable of a symbol, allocating it on first use"""
+        if name not in self.variables:
+            self.variable_count += 1
+            self.variables[name] = self.variable_count
+        return self.variables[name]
+
+    def add_expression(self, expr: Union[Literal, Expression], value: bool = True) -> None:
+        """
+        Adds clauses forcing expr to take the given truth value
+
+        Args:
+            expr (Union[Literal, Expression]): The expression to assert
+            value (bool): False asserts the negation of expr instead
+        """
+        # Peel negations and split conjunctions without introducing variables
+        pending = [(expr, value)]
+        while pending:
+            expr, value = pending.pop()
+            if isinstance(expr, Expression):
+                if expr.operator == LogicalOperator.NOT:
+                    pending.append((expr.operands[0], not value))
+                    continue
+                if expr.operator == LogicalOperator.AND and value:
+                    pending.extend((op, True) for op in expr.operands)
+                    continue
+                if expr.operator == LogicalOperator.OR and not value:
+                    pending.extend((op, False) for op in expr.operands)
+                    continue
+                if expr.operator == LogicalOperator.IMPLIES and not value:
+                    pending.extend((op, True) for op in expr.operands[:-1])
+                    pending.append((expr.operands[-1], False))
+                    continue
+            self.clauses.append(self._disjuncts(expr, value))
+
+    def _disjuncts(self, expr: Union[Literal, Expression], value: bool) -> List[int]:
+        """Builds one clause equivalent to expr having the given truth value"""
+        if isinstance(expr, Expression):
+            if expr.operator == LogicalOperator.OR and value:
+                return [lit for op in expr.operands for lit in self._disjuncts(op, True)]
+            if expr.operator == LogicalOperator.AND and not value:
+                return [lit for op in expr.operands for lit in self._disjuncts(op, False)]
+            if expr.operator == LogicalOperator.IMPLIES and value:
+                clause = [lit for op in expr.operands[:-1] for lit in self._disjuncts(op, False)]
+                return clause + self._disjuncts(expr.operands[-1], True)
+            if expr.operator == LogicalOperator.NOT:
+                return self._disjuncts(expr.operands[0], not value)
+        lit = self._encode(expr)
+        return [lit if value else -lit]
+
+    def _encode(self, expr: Union[Literal, Expression]) -> int:
+        """
+        Returns a literal equivalent to expr
+
+        Literals map to their symbol's variable. Compound expressions get an
+        auxiliary variable constrained to be equivalent to the expression.
+        """
+        if isinstance(expr, Literal):
+            var = self.add_symbol(expr.name)
+            return -var if expr.negative else var
+
+        if not isinstance(expr, Expression):
+            raise ValueError(f"Unknown expression type: {type(expr)}")
+
+        if expr.operator == LogicalOperator.NOT:
+            return -self._encode(expr.operands[0])
+
+        operands = [self._encode(op) for op in expr.operands]
+        self.variable_count += 1
+        aux = self.variable_count
+
+        if expr.operator == LogicalOperator.AND:
+            self.clauses.extend([-aux, lit] for lit in operands)
+            self.clauses.append([aux] + [-lit for lit in operands])
+        elif expr.operator == LogicalOperator.OR:
+            self.clauses.extend([aux, -lit] for lit in operands)
+            self.clauses.append([-aux] + operands)
+        elif expr.operator == LogicalOperator.IMPLIES:
+            antecedent, consequent = operands[:-1], operands[-1]
+            self.clauses.extend([aux, lit] for lit in antecedent)
+            self.clauses.append([aux, -consequent])
+            self.clauses.append([-aux] + [-lit for lit in antecedent] + [consequent])
+        elif expr.operator == LogicalOperator.BICON:
+            if len(operands) != 2:
+                raise ValueError("Biconditional must have exactly two operands")
+            left, right = operands
+            self.clauses.extend([
+                [-aux, -left, right], [-aux, left, -right],
+                [aux, left, right], [aux, -left, -right],
+            ])
+        else:
+            raise ValueError(f"Unknown operator: {expr.operator}")
+
+        return aux
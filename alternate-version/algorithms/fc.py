@@ -1,6 +1,10 @@
 # algorithms/fc.py
-from typing import Tuple, Set, List, Dict
-from data.knowledge_base import KnowledgeBase, Clause, Literal, Expression, LogicalOperator, InvalidClauseError
+from array import array
+from collections import deque
+from typing import Tuple, Set, List
+from data.knowledge_base import (
+    KnowledgeBase, Clause, Literal, Expression, LogicalOperator, InvalidClauseError, HornView
+)
 
 
 class ForwardChaining:
@@ -8,11 +12,14 @@ class ForwardChaining:
     Implements the Forward Chaining algorithm for Horn clauses
     """
 
-    def __init__(self):
+    # Supported strategies: derive the whole closure, or only what the query needs
+    MODES = ("saturate", "goal")
+
+    def __init__(self, mode: str = "saturate"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown forward chaining mode: {mode}")
+        self.mode = mode
         self.inferred: Set[str] = set()  # Set of inferred symbols
-        self.agenda: Set[str] = set()    # Set of symbols to process
-        # Maps symbols to clauses where they appear in premise
-        self.implications: Dict[str, List[Clause]] = {}
 
     def _process_clause(self, clause: Clause) -> Tuple[Set[str], str]:
         """
@@ -59,10 +66,46 @@ class ForwardChaining:
         extract_elements(clause.expression)
         return premises, conclusion
 
+    @staticmethod
+    def _relevant_rules(view: HornView, target: int) -> bytearray:
+        """
+        Finds the backward dependency cone of the query
+
+        Args:
+            view (HornView): The interned rules
+            target (int): Id of the query symbol, -1 if it does not occur
+
+        Returns:
+            bytearray: 1 for the rules whose conclusion the query depends on
+        """
+        head_offsets, head_rules = view.head_index()
+        relevant = bytearray(view.rule_count)
+        if target < 0:
+            return relevant
+
+        visited = bytearray(len(view.names))
+        visited[target] = 1
+        stack = [target]
+        while stack:
+            s = stack.pop()
+            for i in head_rules[head_offsets[s]:head_offsets[s + 1]]:
+                relevant[i] = 1
+                for p in view.premises[view.offsets[i]:view.offsets[i + 1]]:
+                    if not visited[p]:
+                        visited[p] = 1
+                        stack.append(p)
+        return relevant
+
     def check_entailment(self, kb: KnowledgeBase, query: str) -> Tuple[bool, List[str]]:
         """
         Determines if KB entails query using forward chaining
 
+        The clauses are first interned into a HornView, so chaining counts
+        premises in integer arrays and only the result is named.
+
+        In "goal" mode only the clauses in the query's backward dependency
+        cone take part, and chaining stops as soon as the query is inferred.
+
         Args:
             kb (KnowledgeBase): The knowledge base containing Horn clauses
             query (str): The query to check
@@ -72,49 +115,80 @@ class ForwardChaining:
         """
         # Enable Horn-only mode
         kb.horn_only = True
-
-        # Initialize data structures
         self.inferred.clear()
-        self.agenda.clear()
-        self.implications.clear()
 
-        # Count number of premises for each clause
-        count = {}  # Maps clause index to number of unfulfilled premises
-
-        # Process each clause
-        for i, clause in enumerate(kb.clauses):
-            if not clause.is_horn():
-                raise InvalidClauseError(
-                    f"Clause {clause} is not a Horn clause")
+        view = self.horn_view(kb)
+        target = view.ids.get(query, -1)
+        occurrence_offsets, occurrence_rules = view.occurrence_index()
+        offsets, conclusions = view.offsets, view.conclusions
 
-            premises, conclusion = self._process_clause(clause)
+        # Count number of unfulfilled premises for each rule
+        count = array('i', (offsets[i + 1] - offsets[i] for i in range(view.rule_count)))
+        relevant = self._relevant_rules(view, target) if self.mode == "goal" else None
+        if relevant is not None:
+            for i in range(view.rule_count):
+                if not relevant[i]:
+                    count[i] = -1  # Rules outside the cone never fire
 
-            if not premises:  # Fact
-                self.agenda.add(conclusion)
-            else:  # Implication
-                count[i] = len(premises)
-                # Index the clause by each premise
-                for premise in premises:
-                    if premise not in self.implications:
-                        self.implications[premise] = []
-                    self.implications[premise].append(
-                        (i, premises, conclusion))
+        agenda = deque(conclusions[i] for i in range(view.rule_count) if count[i] == 0)
+        inferred = bytearray(len(view.names))
 
         # Track inference order
         inference_order = []
 
         # Main forward chaining loop
-        while self.agenda:
-            p = self.agenda.pop()
-            if p not in self.inferred:
-                self.inferred.add(p)
+        while agenda:
+            p = agenda.popleft()
+            if not inferred[p]:
+                inferred[p] = 1
                 inference_order.append(p)
+                if relevant is not None and p == target:
+                    break
+
+                # Check all rules where p appears in premise
+                for i in occurrence_rules[occurrence_offsets[p]:occurrence_offsets[p + 1]]:
+                    count[i] -= 1
+                    if count[i] == 0 and not inferred[conclusions[i]]:
+                        agenda.append(conclusions[i])
 
-                # Check all implications where p appears in premise
-                if p in self.implications:
-                    for clause_idx, premises, conclusion in self.implications[p]:
-                        count[clause_idx] -= 1
-                        if count[clause_idx] == 0 and conclusion not in self.inferred:
-                            self.agenda.add(conclusion)
+        names = [view.names[s] for s in inference_order]
+        self.inferred.update(names)
+        return query in self.inferred, names
+
+    def horn_view(self, kb: KnowledgeBase) -> HornView:
+        """
+        Builds the interned rule view of a Horn knowledge base
+
+        Clauses without a positive conclusion (such as '~a') constrain nothing
+        forward chaining can derive and are left out.
+
+        Raises:
+            InvalidClauseError: If a clause is not a Horn clause
+        """
+        view = HornView()
+        for clause in kb.clauses:
+            if not clause.is_horn():
+                raise InvalidClauseError(
+                    f"Clause {clause} is not a Horn clause")
+            premises, conclusion = self._process_clause(clause)
+            if conclusion is not None:
+                view.add_rule(sorted(premises), conclusion)
+        return view
+
+    def check_entailments(self, kb: KnowledgeBase, queries: List[str]) -> List[Tuple[bool, List[str]]]:
+        """
+        Answers many queries from a single forward chaining closure
+
+        Args:
+            kb (KnowledgeBase): The knowledge base containing Horn clauses
+            queries (List[str]): The queries to check
+
+        Returns:
+            List[Tuple[bool, List[str]]]: check_entailment's result for each query;
+            in "goal" mode every query runs its own goal-directed search
+        """
+        if self.mode == "goal":
+            return [self.check_entailment(kb, query) for query in queries]
 
-        return query in self.inferred, inference_order
+        _, inference_order = self.check_entailment(kb, None)
+        return [(query in self.inferred, inference_order) for query in queries]
@@ -0,0 +1,211 @@
+# /algorithms/model_counter.py
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# A clause is a sorted tuple of DIMACS literals
+ClauseTuple = Tuple[int, ...]
+
+
+class ModelCounter:
+    """
+    Exact model counter (#SAT) for clauses in DIMACS form
+
+    Counting follows the classic DPLL-style scheme used by component caching
+    counters: simplify by unit propagation, split the clause set into
+    connected components (clauses sharing no variable are independent),
+    count each component by branching on its most frequent variable, and
+    multiply the component counts. Component counts are cached, so groups of
+    rules that recur after different branches are only counted once.
+
+    Attributes:
+        cache (Dict[FrozenSet[ClauseTuple], int]): Model counts per component
+    """
+
+    # Kinds of the frames of _count_formula
+    FORMULA = 0
+    COMPONENT = 1
+
+    def __init__(self):
+        self.cache: Dict[FrozenSet[ClauseTuple], int] = {}
+
+    def count(self, variable_count: int, clauses: List[List[int]]) -> int:
+        """
+        Counts the assignments of variables 1..variable_count satisfying clauses
+
+        Args:
+            variable_count (int): Number of variables
+            clauses (List[List[int]]): Clauses as lists of DIMACS literals
+
+        Returns:
+            int: The exact number of models
+        """
+        normalized = set()
+        for clause in clauses:
+            lits = set(clause)
+            if any(-lit in lits for lit in lits):
+                continue  # Tautologies constrain nothing
+            normalized.add(tuple(sorted(lits)))
+
+        simplified = self._propagate(list(normalized), [])
+        if simplified is None:
+            return 0
+        remaining, assigned = simplified
+
+        free = variable_count - len(assigned) - len(self._variables(remaining))
+        return self._count_formula(remaining) << free
+
+    @staticmethod
+    def _variables(clauses: List[ClauseTuple]) -> set:
+        return {abs(lit) for clause in clauses for lit in clause}
+
+    @staticmethod
+    def _propagate(clauses: List[ClauseTuple],
+                   units: List[int]) -> Optional[Tuple[List[ClauseTuple], set]]:
+        """
+        Applies the given literals and then unit propagation
+
+        Each assignment only visits the clauses of its variable, which keep
+        a count of their unassigned literals, so a long chain of implied
+        units costs time linear in the clauses rather than one pass over
+        all of them per unit.
+
+        Returns:
+            Optional[Tuple[List[ClauseTuple], set]]: (Simplified clauses, set of
+                assigned variables), or None if a clause became empty
+        """
+        occurrences = defaultdict(list)
+        for i, clause in enumerate(clauses):
+            for lit in clause:
+                occurrences[abs(lit)].append(i)
+
+        values: Dict[int, int] = {}  # Assigned variable -> its true literal
+        open_counts = [len(clause) for clause in clauses]
+        satisfied = [False] * len(clauses)
+        queue = list(units) + [clause[0] for clause in clauses if len(clause) == 1]
+        while queue:
+            lit = queue.pop()
+            var = abs(lit)
+            if var in values:
+                if values[var] != lit:
+                    return None
+                continue
+            values[var] = lit
+
+            for i in occurrences[var]:
+                if satisfied[i]:
+                    continue
+                if lit in clauses[i]:
+                    satisfied[i] = True
+                    continue
+                open_counts[i] -= 1
+                if open_counts[i] == 0:
+                    return None
+                if open_counts[i] == 1:
+                    queue.extend(other for other in clauses[i] if abs(other) not in values)
+
+        if not values:
+            return clauses, set()
+        simplified = [tuple(lit for lit in clause if abs(lit) not in values)
+                      for i, clause in enumerate(clauses) if not satisfied[i]]
+        return simplified, set(values)
+
+    @staticmethod
+    def _components(clauses: List[ClauseTuple]) -> List[List[ClauseTuple]]:
+        """Splits clauses into groups that share no variables"""
+        occurrences = defaultdict(list)
+        for i, clause in enumerate(clauses):
+            for lit in clause:
+                occurrences[abs(lit)].append(i)
+
+        visited = [False] * len(clauses)
+        visited_vars = set()
+        components = []
+        for start in range(len(clauses)):
+            if visited[start]:
+                continue
+            visited[start] = True
+            stack, component = [start], []
+            while stack:
+                clause = clauses[stack.pop()]
+                component.append(clause)
+                for lit in clause:
+                    var = abs(lit)
+                    if var in visited_vars:
+                        continue
+                    visited_vars.add(var)
+                    for i in occurrences[var]:
+                        if not visited[i]:
+                            visited[i] = True
+                            stack.append(i)
+            components.append(component)
+        return components
+
+    def _count_formula(self, clauses: List[ClauseTuple]) -> int:
+        """
+        Counts models over the variables of clauses as a product of components
+
+        Branching runs over an explicit stack of frames rather than
+        recursing once per branching variable, so components that need
+        thousands of decisions do not hit the recursion limit. A formula
+        frame [FORMULA, components, next component, product] multiplies
+        the counts of its components; a component frame [COMPONENT,
+        clauses, key, variable, next branch, total, free] sums the counts
+        of its two branches, each shifted by the variables it leaves free.
+        """
+        stack = [[self.FORMULA, self._components(clauses), 0, 1]]
+        result = None  # Count returned by the frame popped last
+        while stack:
+            frame = stack[-1]
+            if frame[0] == self.FORMULA:
+                _, components, index, product = frame
+                if result is not None:
+                    product = frame[3] = product * result
+                    result = None
+                if index == len(components) or not product:
+                    stack.pop()
+                    result = product
+                    continue
+
+                frame[2] += 1
+                component = components[index]
+                key = frozenset(component)
+                result = self.cache.get(key)
+                if result is None:
+                    stack.append([self.COMPONENT, component, key,
+                                  self._branch_variable(component), 0, 0, 0])
+            else:
+                _, component, key, var, branch, total, free = frame
+                if result is not None:
+                    total = frame[5] = total + (result << free)
+                    result = None
+                if branch == 2:
+                    stack.pop()
+                    self.cache[key] = result = total
+                    continue
+
+                frame[4] += 1
+                simplified = self._propagate(component, [var if branch == 0 else -var])
+                if simplified is not None:
+                    remaining, assigned = simplified
+                    frame[6] = len(self._variables(component)) - len(assigned) \
+                        - len(self._variables(remaining))
+                    stack.append([self.FORMULA, self._components(remaining), 0, 1])
+        return result
+
+    @staticmethod
+    def _branch_variable(clauses: List[ClauseTuple]) -> int:
+        """
+        Returns the most frequent variable of clauses
+
+        Ties go to the median variable number: in the chains of rules that
+        generated KBs are made of, consecutive numbers are neighbours, so
+        the middle one splits the component in two instead of peeling one
+        variable off its end.
+        """
+        occurrences = defaultdict(int)
+        for clause in clauses:
+            for lit in clause:
+                occurrences[abs(lit)] += 1
+        most = max(occurrences.values())
+        candidates = sorted(var for var, count in occurrences.items() if count == most)
+        return candidates[len(candidates) // 2]
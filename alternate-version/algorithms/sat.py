@@ -0,0 +1,337 @@
+# /algorithms/sat.py
+import heapq
+import logging
+from typing import Dict, List, Optional, Tuple, Union
+from algorithms.cnf import CNFConverter
+from data.input_parser import InputParser
+from data.knowledge_base import KnowledgeBase, Literal, Expression
+
+
+def _luby(i: int) -> int:
+    """Returns the i-th element (1-based) of the Luby restart sequence"""
+    while True:
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+class SatSolver:
+    """
+    Conflict-driven clause-learning SAT solver
+
+    Uses two watched literals for unit propagation, first-UIP conflict
+    analysis with non-chronological backjumping, VSIDS variable activities
+    with phase saving for branching, and Luby-scheduled restarts.
+
+    Attributes:
+        variable_count (int): Number of variables (numbered from 1)
+        clauses (List[List[int]]): Original and learnt clauses (DIMACS literals)
+    """
+
+    # Conflicts allowed before the first restart (scaled by the Luby sequence)
+    RESTART_BASE = 100
+
+    # Activity decay applied after every conflict
+    VAR_DECAY = 0.95
+
+    def __init__(self, variable_count: int, clauses: List[List[int]]):
+        self.variable_count = variable_count
+        self.clauses: List[List[int]] = []
+
+        size = variable_count + 1
+        self.values: List[int] = [0] * size       # 1 true, -1 false, 0 unassigned
+        self.levels: List[int] = [0] * size
+        self.reasons: List[Optional[int]] = [None] * size
+        self.phases: List[int] = [-1] * size
+        self.activity: List[float] = [0.0] * size
+        self.var_inc = 1.0
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.qhead = 0
+        self.conflicts = 0
+        # Watch lists are indexed by literal: 2v for v, 2v + 1 for -v
+        self.watches: List[List[int]] = [[] for _ in range(2 * size)]
+        self.order = [(0.0, var) for var in range(1, size)]
+        self.ok = True
+
+        for clause in clauses:
+            if not self.add_clause(clause):
+                break
+
+    @staticmethod
+    def _index(lit: int) -> int:
+        return 2 * lit if lit > 0 else -2 * lit + 1
+
+    def _value(self, lit: int) -> int:
+        value = self.values[abs(lit)]
+        return value if lit > 0 else -value
+
+    def add_clause(self, clause: List[int]) -> bool:
+        """
+        Adds a problem clause at decision level 0
+
+        Returns:
+            bool: False if the clause set became trivially unsatisfiable
+        """
+        if not self.ok:
+            return False
+
+        lits = []
+        for lit in dict.fromkeys(clause):
+            if -lit in lits:
+                return True  # Tautology
+            value = self._value(lit)
+            if value > 0:
+                return True  # Already satisfied at level 0
+            if value == 0:
+                lits.append(lit)
+
+        if not lits:
+            self.ok = False
+        elif len(lits) == 1:
+            self._enqueue(lits[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._attach(lits)
+        return self.ok
+
+    def _attach(self, lits: List[int]) -> int:
+        self.clauses.append(lits)
+        index = len(self.clauses) - 1
+        self.watches[self._index(lits[0])].append(index)
+        self.watches[self._index(lits[1])].append(index)
+        return index
+
+    def _enqueue(self, lit: int, reason: Optional[int]) -> None:
+        var = abs(lit)
+        self.values[var] = 1 if lit > 0 else -1
+        self.levels[var] = len(self.trail_lim)
+        self.reasons[var] = reason
+        self.trail.append(lit)
+
+    def _propagate(self) -> Optional[int]:
+        """
+        Performs unit propagation over the watched literals
+
+        Returns:
+            Optional[int]: Index of a conflicting clause, or None
+        """
+        clauses, values = self.clauses, self.values
+        while self.qhead < len(self.trail):
+            false_lit = -self.trail[self.qhead]
+            self.qhead += 1
+            watchers = self.watches[self._index(false_lit)]
+            i = j = 0
+            while i < len(watchers):
+                index = watchers[i]
+                i += 1
+                clause = clauses[index]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+
+                first = clause[0]
+                if (values[first] if first > 0 else -values[-first]) > 0:
+                    watchers[j] = index
+                    j += 1
+                    continue
+
+                # Look for a replacement watch among the remaining literals
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if (values[lit] if lit > 0 else -values[-lit]) >= 0:
+                        clause[1], clause[k] = lit, false_lit
+                        self.watches[self._index(lit)].append(index)
+                        break
+                else:
+                    watchers[j] = index
+                    j += 1
+                    if (values[first] if first > 0 else -values[-first]) < 0:
+                        watchers[j:] = watchers[i:]
+                        self.qhead = len(self.trail)
+                        return index
+                    self._enqueue(first, index)
+            del watchers[j:]
+        return None
+
+    def _analyze(self, conflict: int) -> Tuple[List[int], int]:
+        """
+        Derives a first-UIP learnt clause from a conflict
+
+        Returns:
+            Tuple[List[int], int]: (Learnt clause with the asserting literal
+                                    first, level to backjump to)
+        """
+        seen = set()
+        learnt = [0]
+        level = len(self.trail_lim)
+        pending = 0
+        lit = None
+        index = len(self.trail) - 1
+        clause = self.clauses[conflict]
+
+        while True:
+            for q in (clause if lit is None else clause[1:]):
+                var = abs(q)
+                if var not in seen and self.levels[var] > 0:
+                    seen.add(var)
+                    self._bump(var)
+                    if self.levels[var] >= level:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            lit = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.clauses[self.reasons[abs(lit)]]
+
+        learnt[0] = -lit
+
+        # Drop literals implied by other literals of the clause
+        kept = {abs(q) for q in learnt}
+        learnt[1:] = [
+            q for q in learnt[1:]
+            if self.reasons[abs(q)] is None or any(
+                abs(r) not in kept and self.levels[abs(r)] > 0
+                for r in self.clauses[self.reasons[abs(q)]][1:])
+        ]
+
+        if len(learnt) == 1:
+            return learnt, 0
+
+        # Watch the literal from the highest remaining level second
+        best = max(range(1, len(learnt)), key=lambda k: self.levels[abs(learnt[k])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, self.levels[abs(learnt[1])]
+
+    def _bump(self, var: int) -> None:
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self._rebuild_order()
+        elif len(self.order) > 4 * self.variable_count + 1024:
+            self._rebuild_order()
+        else:
+            heapq.heappush(self.order, (-self.activity[var], var))
+
+    def _rebuild_order(self) -> None:
+        """Rebuilds the branching heap without stale entries"""
+        self.order = [(-self.activity[v], v) for v in range(1, self.variable_count + 1)
+                      if not self.values[v]]
+        heapq.heapify(self.order)
+
+    def _backjump(self, level: int) -> None:
+        if len(self.trail_lim) <= level:
+            return
+        for lit in self.trail[self.trail_lim[level]:]:
+            var = abs(lit)
+            self.phases[var] = self.values[var]
+            self.values[var] = 0
+            self.reasons[var] = None
+            heapq.heappush(self.order, (-self.activity[var], var))
+        del self.trail[self.trail_lim[level]:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _pick_branch(self) -> Optional[int]:
+        """Returns the most active unassigned variable with its saved phase"""
+        while self.order:
+            activity, var = heapq.heappop(self.order)
+            # Skip assigned variables and stale heap entries
+            if not self.values[var] and -activity == self.activity[var]:
+                return var if self.phases[var] > 0 else -var
+        for var in range(1, self.variable_count + 1):
+            if not self.values[var]:
+                return var if self.phases[var] > 0 else -var
+        return None
+
+    def solve(self) -> Optional[List[bool]]:
+        """
+        Searches for a satisfying assignment
+
+        Returns:
+            Optional[List[bool]]: Values indexed by variable (index 0 unused),
+                                  or None if the clauses are unsatisfiable
+        """
+        if not self.ok:
+            return None
+
+        restarts = 0
+        while True:
+            restarts += 1
+            budget = self.RESTART_BASE * _luby(restarts)
+
+            while budget > 0:
+                conflict = self._propagate()
+                if conflict is not None:
+                    self.conflicts += 1
+                    budget -= 1
+                    if not self.trail_lim:
+                        self.ok = False
+                        return None
+                    learnt, level = self._analyze(conflict)
+                    self._backjump(level)
+                    if len(learnt) == 1:
+                        self._enqueue(learnt[0], None)
+                    else:
+                        self._enqueue(learnt[0], self._attach(learnt))
+                    self.var_inc /= self.VAR_DECAY
+                    continue
+
+                lit = self._pick_branch()
+                if lit is None:
+                    return [value > 0 for value in self.values]
+                self.trail_lim.append(len(self.trail))
+                self._enqueue(lit, None)
+
+            self._backjump(0)
+
+
+class SatEntailment:
+    """Decides entailment for general knowledge bases by refutation with a SAT solver"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def check_entailment(self, kb: KnowledgeBase,
+                         query: Union[str, Literal, Expression]) -> Tuple[bool, Optional[Dict[str, bool]]]:
+        """
+        Checks if KB entails query by testing KB & ~query for unsatisfiability
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            query (Union[str, Literal, Expression]): The query to check
+
+        Returns:
+            Tuple[bool, Optional[Dict[str, bool]]]: (Whether KB entails query,
+                counterexample model over the KB and query symbols if it does not)
+        """
+        query_expr = query if isinstance(query, (Literal, Expression)) else \
+            InputParser.parse_expression(InputParser.tokenize(query))
+
+        converter = CNFConverter()
+        for symbol in sorted(kb.symbols):
+            converter.add_symbol(symbol)
+        for clause in kb.clauses:
+            converter.add_expression(clause.expression)
+        converter.add_expression(query_expr, value=False)
+
+        self.logger.info(
+            f"Solving {len(converter.clauses)} clauses over {converter.variable_count} variables")
+        solver = SatSolver(converter.variable_count, converter.clauses)
+        model = solver.solve()
+        self.logger.info(f"SAT search finished after {solver.conflicts} conflicts")
+
+        if model is None:
+            return True, None
+
+        counterexample = {name: model[var] for name, var in converter.variables.items()}
+        self.logger.info(
+            f"Found counterexample model where KB is true but query is false: {counterexample}")
+        return False, counterexample
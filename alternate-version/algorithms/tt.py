@@ -1,17 +1,88 @@
 # /algorithms/tt.py
 import logging
-from itertools import product
-from typing import Union, Tuple
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, product, repeat
+from typing import Callable, Dict, Iterator, List, Optional, Union, Tuple
+from algorithms.cnf import CNFConverter
+from algorithms.model_counter import ModelCounter
+from algorithms.sat import SatSolver
 from data.knowledge_base import (
     KnowledgeBase, Clause, Literal, Expression,
     LogicalOperator
 )
 
 
+def _popcount(bits: int) -> int:
+    """Counts the set bits of a non-negative integer"""
+    return bin(bits).count("1")
+
+
+# Per-process state of parallel truth table workers, set up by _init_worker
+_worker = {}
+
+
+def _init_worker(kb: KnowledgeBase, symbols: list, query_expr: Union[Literal, Expression],
+                 first_failed) -> None:
+    """Compiles the KB once in each worker process"""
+    kb_holds, query_holds = TruthTable.compile_kb(kb, symbols, query_expr)
+    _worker.update(kb_holds=kb_holds, query_holds=query_holds,
+                   symbol_count=len(symbols), first_failed=first_failed)
+
+
+def _check_shard(shard: int, prefix_length: int) -> Optional[Tuple[bool, int]]:
+    """
+    Enumerates every model whose first prefix_length values spell out 'shard'
+
+    Returns:
+        Optional[Tuple[bool, int]]: (False, KB models up to the counterexample) if
+        one is found, (True, KB models in the shard) otherwise, or None when an
+        earlier shard already holds a counterexample and this one was abandoned
+    """
+    kb_holds, query_holds = _worker["kb_holds"], _worker["query_holds"]
+    first_failed = _worker["first_failed"]
+    prefix = tuple(bool((shard >> (prefix_length - 1 - i)) & 1) for i in range(prefix_length))
+
+    models_count = 0
+    suffixes = product((False, True), repeat=_worker["symbol_count"] - prefix_length)
+    for checked, suffix in enumerate(suffixes):
+        if not checked & TruthTable.CANCEL_CHECK_MASK and first_failed.value < shard:
+            return None
+
+        values = prefix + suffix
+        if kb_holds(values):
+            models_count += 1
+            if not query_holds(values):
+                with first_failed.get_lock():
+                    first_failed.value = min(first_failed.value, shard)
+                return False, models_count
+
+    return True, models_count
+
+
 class TruthTable:
     """Implementation of the Truth Table checking algorithm with support for all logical operators"""
 
-    def __init__(self):
+    # Supported model enumeration strategies
+    MODES = ("enumerate", "bitset", "compiled", "parallel", "count", "prune", "gray")
+
+    # Number of least significant symbols packed into one bitset block
+    BLOCK_BITS = 16
+
+    # Below this many symbols process start-up costs more than the enumeration
+    PARALLEL_MIN_SYMBOLS = 12
+
+    # Parallel workers poll the cancel flag every CANCEL_CHECK_MASK + 1 models
+    CANCEL_CHECK_MASK = 0xFFF
+
+    def __init__(self, mode: str = "enumerate", workers: Optional[int] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown truth table mode: {mode}")
+        self.mode = mode
+        self.workers = workers
+
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.INFO)
 
@@ -44,9 +115,7 @@ class TruthTable:
         symbols = list(kb.symbols)
 
         # Parse query into an expression if it's not already
-        query_expr = query if isinstance(query, (Literal, Expression)) else \
-                    Literal(query) if '~' not in query else \
-                    Expression(LogicalOperator.NOT, [Literal(query[1:])])
+        query_expr = self._query_expression(query)
 
         self.logger.debug(f"Symbols in knowledge base: {symbols}")
         self.logger.debug(f"Query expression: {query_expr}")
@@ -55,6 +124,19 @@ class TruthTable:
         total_models = 2 ** len(symbols)
         self.logger.info(f"Checking {total_models} possible models")
 
+        if self.mode == "bitset":
+            return self._check_entailment_bitset(kb, symbols, query_expr)
+        if self.mode == "compiled":
+            return self._check_entailment_compiled(kb, symbols, query_expr)
+        if self.mode == "parallel":
+            return self._check_entailment_parallel(kb, symbols, query_expr)
+        if self.mode == "count":
+            return self._check_entailment_count(kb, symbols, query_expr)
+        if self.mode == "prune":
+            return self._check_entailment_prune(kb, symbols, query_expr)
+        if self.mode == "gray":
+            return self._check_entailment_gray(kb, symbols, query_expr)
+
         # Generate all possible truth assignments
         for values in product([False, True], repeat=len(symbols)):
             model = dict(zip(symbols, values))
@@ -77,6 +159,575 @@ class TruthTable:
             f"Query is entailed. KB satisfied in {models_count}/{total_models} models")
         return True, models_count
 
+    def check_entailments(self, kb: KnowledgeBase, queries: list) -> List[Tuple[bool, int]]:
+        """
+        Answers many queries from a single pass over the models
+
+        The enumerate and compiled modes walk the models once with the KB
+        compiled, and the bitset mode evaluates the KB columns of each block
+        once, checking every open query against the same KB models. Results
+        equal those of separate check_entailment calls. Other modes answer
+        the queries one by one.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            queries (list): The queries to check
+
+        Returns:
+            List[Tuple[bool, int]]: check_entailment's result for each query
+        """
+        if not queries or self.mode not in ("enumerate", "compiled", "bitset"):
+            return [self.check_entailment(kb, query) for query in queries]
+
+        symbols = list(kb.symbols)
+        query_exprs = [self._query_expression(query) for query in queries]
+        self.logger.info(
+            f"Checking {len(queries)} queries against {2 ** len(symbols)} possible models")
+
+        if self.mode == "bitset":
+            failed, models_count = self._first_counterexamples_bitset(kb, symbols, query_exprs)
+        else:
+            index = {symbol: i for i, symbol in enumerate(symbols)}
+            kb_holds, _ = self.compile_kb(kb, symbols, query_exprs[0])
+            open_queries = {i: self.compile_expression(expr, index)
+                            for i, expr in enumerate(query_exprs)}
+            failed = {}  # Query position -> KB models seen up to its first counterexample
+            models_count = 0
+            for values in product((False, True), repeat=len(symbols)):
+                if kb_holds(values):
+                    models_count += 1
+                    for i in [i for i, holds in open_queries.items() if not holds(values)]:
+                        failed[i] = models_count
+                        del open_queries[i]
+                    if not open_queries:
+                        break
+
+        return [(False, failed[i]) if i in failed else (True, models_count)
+                for i in range(len(queries))]
+
+    def _first_counterexamples_bitset(self, kb: KnowledgeBase, symbols: list,
+                                      query_exprs: list) -> Tuple[Dict[int, int], int]:
+        """
+        Bit-parallel scan for the first counterexample of each query
+
+        Returns:
+            Tuple[Dict[int, int], int]: (KB models counted up to the first
+                counterexample of each refuted query, total KB models)
+        """
+        low = min(len(symbols), self.BLOCK_BITS)
+        high = len(symbols) - low
+        width = 1 << low
+        full = (1 << width) - 1
+
+        columns = {
+            symbol: self._column_pattern(low - 1 - i, width)
+            for i, symbol in enumerate(symbols[high:])
+        }
+
+        failed = {}
+        open_queries = dict(enumerate(query_exprs))
+        models_count = 0
+        for block in range(1 << high):
+            for i, symbol in enumerate(symbols[:high]):
+                columns[symbol] = full if (block >> (high - 1 - i)) & 1 else 0
+
+            kb_bits = full
+            for clause in kb.clauses:
+                kb_bits &= self._evaluate_bits(clause.expression, columns, full)
+                if not kb_bits:
+                    break
+            if not kb_bits:
+                continue
+
+            for i, query_expr in list(open_queries.items()):
+                counterexamples = kb_bits & ~self._evaluate_bits(query_expr, columns, full)
+                if counterexamples:
+                    first = (counterexamples & -counterexamples).bit_length() - 1
+                    failed[i] = models_count + _popcount(kb_bits & ((1 << (first + 1)) - 1))
+                    del open_queries[i]
+            if not open_queries:
+                break
+
+            models_count += _popcount(kb_bits)
+
+        return failed, models_count
+
+    def _check_entailment_compiled(self, kb: KnowledgeBase, symbols: list,
+                                   query_expr: Union[Literal, Expression]) -> Tuple[bool, int]:
+        """
+        Variant of check_entailment running on compiled model predicates
+
+        The KB and the query are compiled once into plain Python functions over
+        the positional value tuples produced by itertools.product, so the inner
+        loop makes a single call per model instead of walking expression trees.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            symbols (list): Symbols in enumeration order
+            query_expr (Union[Literal, Expression]): The parsed query
+
+        Returns:
+            Tuple[bool, int]: Same contract as check_entailment
+        """
+        kb_holds, query_holds = self.compile_kb(kb, symbols, query_expr)
+
+        models_count = 0
+        for values in product((False, True), repeat=len(symbols)):
+            if kb_holds(values):
+                models_count += 1
+                if not query_holds(values):
+                    model = dict(zip(symbols, values))
+                    self.logger.info(
+                        f"Found counterexample model where KB is true but query is false: {model}")
+                    return False, models_count
+
+        self.logger.info(
+            f"Query is entailed. KB satisfied in {models_count}/{2 ** len(symbols)} models")
+        return True, models_count
+
+    def _check_entailment_prune(self, kb: KnowledgeBase, symbols: list,
+                                query_expr: Union[Literal, Expression]) -> Tuple[bool, int]:
+        """
+        Variant of check_entailment assigning symbols one at a time
+
+        Symbols are ordered by the number of clauses mentioning them, and each
+        clause is checked as soon as its last symbol is assigned. A subtree in
+        which a clause is already false holds no KB models and is skipped.
+        Once every clause and the query are decided, the KB models of the
+        remaining free symbols are credited as a power of two instead of
+        being enumerated. Models are visited in itertools.product order over
+        the reordered symbols, so a negative answer reports the KB models
+        seen before the first counterexample in that order.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            symbols (list): Symbols of the knowledge base
+            query_expr (Union[Literal, Expression]): The parsed query
+
+        Returns:
+            Tuple[bool, int]: Same contract as check_entailment
+        """
+        clause_symbols = [clause.get_symbols() for clause in kb.clauses]
+        occurrences = {symbol: 0 for symbol in symbols}
+        for names in clause_symbols:
+            for name in names:
+                occurrences[name] += 1
+        order = sorted(symbols, key=lambda symbol: (-occurrences[symbol], symbol))
+        position = {symbol: i for i, symbol in enumerate(order)}
+
+        def depth_of(names) -> int:
+            """Number of leading symbols that must be assigned to decide 'names'"""
+            return max((position[name] + 1 for name in names), default=0)
+
+        # checks[d] holds the clauses decided once the first d symbols are assigned
+        checks = [[] for _ in range(len(order) + 1)]
+        for clause, names in zip(kb.clauses, clause_symbols):
+            checks[depth_of(names)].append(
+                self.compile_expression(clause.expression, position))
+        query_holds = self.compile_expression(query_expr, position)
+        decided = max(depth_of(names) for names in clause_symbols + [Clause(query_expr).get_symbols()])
+
+        values = [False] * len(order)
+        models_count = 0
+
+        def visit(depth: int) -> bool:
+            """Explores the subtree below the first 'depth' assignments, False on a counterexample"""
+            nonlocal models_count
+            if not all(check(values) for check in checks[depth]):
+                return True
+
+            if depth == decided:
+                if query_holds(values):
+                    models_count += 1 << (len(order) - depth)
+                    return True
+                # The first model of this subtree is the counterexample
+                models_count += 1
+                return False
+
+            for value in (False, True):
+                values[depth] = value
+                if not visit(depth + 1):
+                    return False
+            return True
+
+        if not visit(0):
+            model = dict(zip(order, values))
+            self.logger.info(
+                f"Found counterexample model where KB is true but query is false: {model}")
+            return False, models_count
+
+        self.logger.info(
+            f"Query is entailed. KB satisfied in {models_count}/{2 ** len(symbols)} models")
+        return True, models_count
+
+    def _check_entailment_gray(self, kb: KnowledgeBase, symbols: list,
+                               query_expr: Union[Literal, Expression]) -> Tuple[bool, int]:
+        """
+        Variant of check_entailment walking the models in Gray-code order
+
+        Consecutive models differ in exactly one symbol, so only the clauses
+        mentioning the flipped symbol are re-evaluated. A running count of
+        falsified clauses tells whether the KB holds in the current model.
+        A negative answer reports the KB models seen before the first
+        counterexample in Gray-code order.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            symbols (list): Symbols in enumeration order
+            query_expr (Union[Literal, Expression]): The parsed query
+
+        Returns:
+            Tuple[bool, int]: Same contract as check_entailment
+        """
+        position = {symbol: i for i, symbol in enumerate(symbols)}
+        checks = [self.compile_expression(clause.expression, position) for clause in kb.clauses]
+        query_holds = self.compile_expression(query_expr, position)
+        query_symbols = {position[name] for name in Clause(query_expr).get_symbols()}
+
+        # Occurrence index from each symbol to the clauses mentioning it
+        occurrences = [[] for _ in symbols]
+        for i, clause in enumerate(kb.clauses):
+            for name in clause.get_symbols():
+                occurrences[position[name]].append(i)
+
+        values = [False] * len(symbols)
+        states = [check(values) for check in checks]
+        falsified = states.count(False)
+        query_value = query_holds(values)
+        models_count = 0
+
+        step = 0
+        while True:
+            if not falsified:
+                models_count += 1
+                if not query_value:
+                    model = dict(zip(symbols, values))
+                    self.logger.info(
+                        f"Found counterexample model where KB is true but query is false: {model}")
+                    return False, models_count
+
+            step += 1
+            if step >> len(symbols):
+                break
+
+            # Gray code step i flips the bit at the position of i's lowest set bit
+            flipped = (step & -step).bit_length() - 1
+            values[flipped] = not values[flipped]
+            for i in occurrences[flipped]:
+                state = checks[i](values)
+                if state != states[i]:
+                    states[i] = state
+                    falsified += -1 if state else 1
+            if flipped in query_symbols:
+                query_value = query_holds(values)
+
+        self.logger.info(
+            f"Query is entailed. KB satisfied in {models_count}/{2 ** len(symbols)} models")
+        return True, models_count
+
+    def _check_entailment_count(self, kb: KnowledgeBase, symbols: list,
+                                query_expr: Union[Literal, Expression]) -> Tuple[bool, int]:
+        """
+        Variant of check_entailment that never enumerates assignments
+
+        The KB is converted to CNF and its models are counted exactly by the
+        component caching ModelCounter. Entailment holds when KB & ~query is
+        unsatisfiable, which the SAT solver decides. Unlike the enumerating
+        modes, the count returned with a negative answer is the full number
+        of KB models rather than the models seen before the counterexample.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            symbols (list): Symbols of the knowledge base
+            query_expr (Union[Literal, Expression]): The parsed query
+
+        Returns:
+            Tuple[bool, int]: (Whether KB entails query, Number of models where KB is true)
+        """
+        converter = CNFConverter()
+        for symbol in sorted(symbols):
+            converter.add_symbol(symbol)
+        for clause in kb.clauses:
+            converter.add_expression(clause.expression)
+
+        # Auxiliary CNF variables are fully determined, so the count is per KB symbol
+        models_count = ModelCounter().count(converter.variable_count, converter.clauses)
+
+        converter.add_expression(query_expr, value=False)
+        entailed = SatSolver(converter.variable_count, converter.clauses).solve() is None
+
+        self.logger.info(
+            f"Query is {'' if entailed else 'not '}entailed. "
+            f"KB satisfied in {models_count}/{2 ** len(symbols)} models")
+        return entailed, models_count
+
+    def _check_entailment_parallel(self, kb: KnowledgeBase, symbols: list,
+                                   query_expr: Union[Literal, Expression]) -> Tuple[bool, int]:
+        """
+        Variant of check_entailment spreading the enumeration over processes
+
+        The assignment space is split into shards by fixing the values of the
+        first few symbols. Every worker receives the KB once, compiles it, and
+        enumerates whole shards. A shared 'first failed shard' value lets later
+        shards stop as soon as an earlier one finds a counterexample, while
+        earlier shards still finish so the partial model count matches the
+        serial scan exactly.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            symbols (list): Symbols in enumeration order
+            query_expr (Union[Literal, Expression]): The parsed query
+
+        Returns:
+            Tuple[bool, int]: Same contract as check_entailment
+        """
+        if len(symbols) < self.PARALLEL_MIN_SYMBOLS:
+            return self._check_entailment_compiled(kb, symbols, query_expr)
+
+        workers = self.workers or os.cpu_count() or 1
+        # Around four shards per worker keeps the load balanced
+        prefix_length = min(len(symbols), (4 * workers - 1).bit_length())
+        shards = 1 << prefix_length
+        first_failed = multiprocessing.Value('i', shards)
+        self.logger.info(f"Checking {shards} shards on {workers} worker processes")
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(kb, symbols, query_expr, first_failed)) as pool:
+            results = list(pool.map(_check_shard, range(shards), repeat(prefix_length)))
+
+        models_count = 0
+        for shard, result in enumerate(results):
+            # Abandoned shards (None) only ever follow the first failing shard
+            entailed, count = result
+            models_count += count
+            if not entailed:
+                self.logger.info(f"Found counterexample model in shard {shard}")
+                return False, models_count
+
+        self.logger.info(
+            f"Query is entailed. KB satisfied in {models_count}/{2 ** len(symbols)} models")
+        return True, models_count
+
+    @classmethod
+    def compile_kb(cls, kb: KnowledgeBase, symbols: list,
+                   query_expr: Union[Literal, Expression]) -> Tuple[Callable, Callable]:
+        """
+        Compiles the KB conjunction and the query into model predicates
+
+        Both returned functions take a sequence of truth values indexed like
+        'symbols'. Clauses are ordered cheapest first so the short-circuiting
+        conjunction rejects most models after a few lookups.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            symbols (list): Symbols giving the position of each value in a model
+            query_expr (Union[Literal, Expression]): The parsed query
+
+        Returns:
+            Tuple[Callable, Callable]: (KB predicate, query predicate)
+        """
+        index = {symbol: i for i, symbol in enumerate(symbols)}
+        clauses = sorted(
+            (cls._expression_source(clause.expression, index) for clause in kb.clauses),
+            key=len)
+        source = (
+            "def kb_holds(m):\n"
+            f"    return {' and '.join(clauses) or 'True'}\n"
+            "def query_holds(m):\n"
+            f"    return {cls._expression_source(query_expr, index)}\n"
+        )
+        namespace = {}
+        exec(compile(source, "<compiled kb>", "exec"), namespace)
+        return namespace["kb_holds"], namespace["query_holds"]
+
+    @classmethod
+    def compile_expression(cls, expr: Union[Literal, Expression], index: dict) -> Callable:
+        """
+        Compiles a single expression into a predicate over positional models
+
+        Args:
+            expr (Union[Literal, Expression]): The expression to compile
+            index (dict): Maps each symbol to its position in a model
+
+        Returns:
+            Callable: Function taking a sequence of truth values
+        """
+        source = f"lambda m: {cls._expression_source(expr, index)}"
+        return eval(compile(source, "<compiled expression>", "eval"))
+
+    @classmethod
+    def _expression_source(cls, expr: Union[Literal, Expression], index: dict) -> str:
+        """
+        Generates a Python boolean expression equivalent to expr
+
+        Literals become positional lookups into the model 'm'. Chains of the
+        same associative operator are flattened into a single and/or so long
+        conjunctions do not turn into deeply nested parentheses.
+        """
+        if isinstance(expr, Literal):
+            lookup = f"m[{index[expr.name]}]"
+            return f"(not {lookup})" if expr.negative else lookup
+
+        if not isinstance(expr, Expression):
+            raise ValueError(f"Unknown expression type: {type(expr)}")
+
+        if expr.operator == LogicalOperator.NOT:
+            return f"(not {cls._expression_source(expr.operands[0], index)})"
+
+        elif expr.operator in (LogicalOperator.AND, LogicalOperator.OR):
+            keyword = " and " if expr.operator == LogicalOperator.AND else " or "
+            operands, stack = [], list(reversed(expr.operands))
+            while stack:
+                op = stack.pop()
+                if isinstance(op, Expression) and op.operator == expr.operator:
+                    stack.extend(reversed(op.operands))
+                else:
+                    operands.append(cls._expression_source(op, index))
+            return f"({keyword.join(operands)})"
+
+        elif expr.operator == LogicalOperator.IMPLIES:
+            antecedent = " and ".join(
+                cls._expression_source(op, index) for op in expr.operands[:-1])
+            consequent = cls._expression_source(expr.operands[-1], index)
+            return f"(not ({antecedent}) or {consequent})"
+
+        elif expr.operator == LogicalOperator.BICON:
+            if len(expr.operands) != 2:
+                raise ValueError("Biconditional must have exactly two operands")
+            left = cls._expression_source(expr.operands[0], index)
+            right = cls._expression_source(expr.operands[1], index)
+            return f"({left} == {right})"
+
+        raise ValueError(f"Unknown operator: {expr.operator}")
+
+    def _check_entailment_bitset(self, kb: KnowledgeBase, symbols: list,
+                                 query_expr: Union[Literal, Expression]) -> Tuple[bool, int]:
+        """
+        Bit-parallel variant of check_entailment
+
+        Models are enumerated in the same order as itertools.product, but in blocks
+        of 2^BLOCK_BITS assignments. Within a block every symbol is a bit column
+        (bit j is the symbol's value in the j-th model of the block), so each clause
+        is evaluated for the whole block with a handful of integer operations and
+        model counts come from popcounts.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            symbols (list): Symbols in enumeration order (first is most significant)
+            query_expr (Union[Literal, Expression]): The parsed query
+
+        Returns:
+            Tuple[bool, int]: Same contract as check_entailment
+        """
+        low = min(len(symbols), self.BLOCK_BITS)
+        high = len(symbols) - low
+        width = 1 << low
+        full = (1 << width) - 1
+
+        # Symbols varying inside a block get fixed periodic patterns
+        columns = {
+            symbol: self._column_pattern(low - 1 - i, width)
+            for i, symbol in enumerate(symbols[high:])
+        }
+
+        models_count = 0
+        for block in range(1 << high):
+            # Symbols fixed for the whole block are all-false or all-true columns
+            for i, symbol in enumerate(symbols[:high]):
+                columns[symbol] = full if (block >> (high - 1 - i)) & 1 else 0
+
+            kb_bits = full
+            for clause in kb.clauses:
+                kb_bits &= self._evaluate_bits(clause.expression, columns, full)
+                if not kb_bits:
+                    break
+            if not kb_bits:
+                continue
+
+            counterexamples = kb_bits & ~self._evaluate_bits(query_expr, columns, full)
+            if counterexamples:
+                # Only count KB models up to the first counterexample, as the serial scan does
+                first = (counterexamples & -counterexamples).bit_length() - 1
+                models_count += _popcount(kb_bits & ((1 << (first + 1)) - 1))
+                index = (block << low) | first
+                model = {symbol: bool((index >> (len(symbols) - 1 - i)) & 1)
+                         for i, symbol in enumerate(symbols)}
+                self.logger.info(
+                    f"Found counterexample model where KB is true but query is false: {model}")
+                return False, models_count
+
+            models_count += _popcount(kb_bits)
+
+        self.logger.info(
+            f"Query is entailed. KB satisfied in {models_count}/{2 ** len(symbols)} models")
+        return True, models_count
+
+    @staticmethod
+    def _column_pattern(shift: int, width: int) -> int:
+        """
+        Builds the bit column of a symbol over a block of 'width' models
+
+        Bit j of the result is set when bit 'shift' of j is set, i.e. runs of
+        2^shift zeros followed by 2^shift ones.
+        """
+        run = 1 << shift
+        pattern = ((1 << run) - 1) << run
+        period = run << 1
+        while period < width:
+            pattern |= pattern << period
+            period <<= 1
+        return pattern
+
+    def _evaluate_bits(self, expr: Union[Literal, Expression], columns: dict, full: int) -> int:
+        """
+        Evaluates an expression over a whole block of models at once
+
+        Args:
+            expr (Union[Literal, Expression]): The expression to evaluate
+            columns (dict): Maps each symbol to its bit column for the block
+            full (int): Mask with one bit set per model in the block
+
+        Returns:
+            int: Bitset of the models in which the expression is true
+        """
+        if isinstance(expr, Literal):
+            value = columns[expr.name]
+            return full ^ value if expr.negative else value
+
+        if not isinstance(expr, Expression):
+            raise ValueError(f"Unknown expression type: {type(expr)}")
+
+        if expr.operator == LogicalOperator.NOT:
+            return full ^ self._evaluate_bits(expr.operands[0], columns, full)
+
+        elif expr.operator == LogicalOperator.AND:
+            result = full
+            for op in expr.operands:
+                result &= self._evaluate_bits(op, columns, full)
+            return result
+
+        elif expr.operator == LogicalOperator.OR:
+            result = 0
+            for op in expr.operands:
+                result |= self._evaluate_bits(op, columns, full)
+            return result
+
+        elif expr.operator == LogicalOperator.IMPLIES:
+            antecedent = full
+            for op in expr.operands[:-1]:
+                antecedent &= self._evaluate_bits(op, columns, full)
+            consequent = self._evaluate_bits(expr.operands[-1], columns, full)
+            return (full ^ antecedent) | consequent
+
+        elif expr.operator == LogicalOperator.BICON:
+            if len(expr.operands) != 2:
+                raise ValueError("Biconditional must have exactly two operands")
+            left = self._evaluate_bits(expr.operands[0], columns, full)
+            right = self._evaluate_bits(expr.operands[1], columns, full)
+            return full ^ (left ^ right)
+
+        raise ValueError(f"Unknown operator: {expr.operator}")
+
     def _evaluate_expression(self, expr: Union[Literal, Expression], model: dict) -> bool:
         """
         Recursively evaluates a logical expression under a given model
@@ -123,13 +774,104 @@ class TruthTable:
         """Evaluates if a clause is true under given model"""
         return self._evaluate_expression(clause.expression, model)
 
-    def print_truth_table(self, kb: KnowledgeBase, query: str) -> None:
+    def iter_models(self, kb: KnowledgeBase, query: str, only_kb_true: bool = False,
+                    limit: Optional[int] = None, offset: int = 0) -> Iterator[Tuple[tuple, bool, bool]]:
+        """
+        Lazily yields the rows of the truth table
+
+        Rows follow itertools.product order over the sorted KB symbols, the
+        same layout print_truth_table uses. The KB and query are compiled once,
+        so rows can be paged through without building the table in memory.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            query (str): The query to evaluate in each row
+            only_kb_true (bool): Only yield models in which the KB holds
+            limit (Optional[int]): Maximum number of rows to yield
+            offset (int): Number of matching rows to skip first
+
+        Yields:
+            Tuple[tuple, bool, bool]: (Symbol values, KB value, query value)
+        """
+        for _, values, kb_value, query_value in self._iter_rows(kb, query, only_kb_true, limit, offset):
+            yield values, kb_value, query_value
+
+    def _iter_rows(self, kb: KnowledgeBase, query: str, only_kb_true: bool,
+                   limit: Optional[int], offset: int) -> Iterator[Tuple[int, tuple, bool, bool]]:
+        """Same as iter_models, additionally yielding each row's model index first"""
+        symbols = sorted(kb.symbols)
+        kb_holds, query_holds = self.compile_kb(kb, symbols, self._query_expression(query))
+
+        rows = enumerate(product((False, True), repeat=len(symbols)))
+        if only_kb_true:
+            rows = ((index, values) for index, values in rows if kb_holds(values))
+        rows = islice(rows, offset, None if limit is None else offset + limit)
+
+        for index, values in rows:
+            yield index, values, only_kb_true or kb_holds(values), query_holds(values)
+
+    def write_truth_table(self, kb: KnowledgeBase, query: str, filename: str, fmt: str = "csv",
+                          only_kb_true: bool = False, limit: Optional[int] = None,
+                          offset: int = 0, chunk_size: int = 65536) -> int:
+        """
+        Writes truth table rows to a file in buffered chunks
+
+        Formats:
+            csv:  a header line of symbol names followed by KB and Q, then one
+                  line of 0/1 values per row
+            bits: the same header line, then one fixed-width big-endian record
+                  per row holding the model index shifted left by two, with
+                  the KB value in bit 1 and the query value in bit 0
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            query (str): The query to evaluate in each row
+            filename (str): Path of the output file
+            fmt (str): Output format, "csv" or "bits"
+            only_kb_true (bool): Only write models in which the KB holds
+            limit (Optional[int]): Maximum number of rows to write
+            offset (int): Number of matching rows to skip first
+            chunk_size (int): Number of rows buffered per write
+
+        Returns:
+            int: Number of rows written
+        """
+        if fmt not in ("csv", "bits"):
+            raise ValueError(f"Unknown truth table format: {fmt}")
+
+        symbols = sorted(kb.symbols)
+        header = ",".join(symbols + ["KB", "Q"]) + "\n"
+        width = (len(symbols) + 2 + 7) // 8
+        rows = self._iter_rows(kb, query, only_kb_true, limit, offset)
+        written = 0
+
+        with open(filename, "w" if fmt == "csv" else "wb") as file:
+            file.write(header if fmt == "csv" else header.encode())
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                if fmt == "csv":
+                    file.write("".join(
+                        ",".join("1" if v else "0" for v in values) + f",{kb_value:d},{query_value:d}\n"
+                        for _, values, kb_value, query_value in chunk))
+                else:
+                    file.write(b"".join(
+                        ((index << 2) | (kb_value << 1) | query_value).to_bytes(width, "big")
+                        for index, _, kb_value, query_value in chunk))
+                written += len(chunk)
+
+        self.logger.info(f"Wrote {written} truth table rows to {filename}")
+        return written
+
+    def print_truth_table(self, kb: KnowledgeBase, query: str, chunk_size: int = 4096) -> None:
         """
         Prints a complete truth table for the knowledge base and query
 
         Args:
             kb (KnowledgeBase): The knowledge base
             query (str): The query to check
+            chunk_size (int): Number of rows buffered per write to stdout
         """
         symbols = sorted(list(kb.symbols))
 
@@ -140,24 +882,24 @@ class TruthTable:
         print(header)
         print("=" * len(header))
 
-        # Parse query
-        query_expr = query if isinstance(query, (Literal, Expression)) else \
-                    Literal(query) if '~' not in query else \
-                    Expression(LogicalOperator.NOT, [Literal(query[1:])])
-
-        # Generate and print each row
-        for values in product([False, True], repeat=len(symbols)):
-            model = dict(zip(symbols, values))
-
-            # Evaluate KB and query
-            kb_value = all(self._evaluate_clause(clause, model) for clause in kb.clauses)
-            query_value = self._evaluate_expression(query_expr, model)
-
-            # Format row
-            row = " | ".join("T" if v else "F" for v in values)
-            row += f" || {'T' if kb_value else 'F'}"
-            row += f" | {'T' if query_value else 'F'}"
-            row += f" | {'T' if (not kb_value or query_value) else 'F'}"
-            print(row)
+        # Generate rows and write them in chunks
+        rows = self.iter_models(kb, query)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            sys.stdout.write("".join(
+                " | ".join("T" if v else "F" for v in values)
+                + f" || {'T' if kb_value else 'F'}"
+                + f" | {'T' if query_value else 'F'}"
+                + f" | {'T' if (not kb_value or query_value) else 'F'}\n"
+                for values, kb_value, query_value in chunk))
 
         print("=" * len(header) + "\n")
+
+    @staticmethod
+    def _query_expression(query: Union[str, Literal, Expression]) -> Union[Literal, Expression]:
+        """Parses a query string into an expression if it's not already"""
+        return query if isinstance(query, (Literal, Expression)) else \
+            Literal(query) if '~' not in query else \
+            Expression(LogicalOperator.NOT, [Literal(query[1:])])
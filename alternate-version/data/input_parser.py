@@ -1,7 +1,9 @@
 # /data/input_parser.py
 from pathlib import Path
+import codecs
+import mmap
 import re
-from typing import Union, Tuple
+from typing import BinaryIO, Iterable, Iterator, Optional, TextIO, Union, Tuple
 from data.knowledge_base import (
     KnowledgeBase, Clause, Literal, Expression,
     LogicalOperator, KnowledgeBaseError
@@ -18,6 +20,13 @@ class FileFormatError(InputParserError):
 class InputParser:
     """Handles parsing of input files into a knowledge base and query"""
 
+    # Characters decoded per step when streaming a file or text stream
+    CHUNK_SIZE = 1 << 20
+
+    # Statement separator and section keywords (whole words only, so symbols
+    # such as TASK or ASKED are left alone)
+    SEPARATOR = re.compile(r';|\b(?:TELL|ASK)\b')
+
     # Operator precedence (higher number = higher precedence)
     PRECEDENCE = {
         LogicalOperator.BICON: 1,
@@ -27,8 +36,20 @@ class InputParser:
         LogicalOperator.NOT: 5
     }
 
-    @staticmethod
-    def tokenize(expression: str) -> list:
+    # (Operator, precedence, right binding power) of each binary operator
+    # token: implication and biconditional bind one level looser to their right
+    BINARY_OPERATORS = {
+        op.value: (op, precedence,
+                   precedence - 1 if op in (LogicalOperator.IMPLIES, LogicalOperator.BICON)
+                   else precedence)
+        for op, precedence in PRECEDENCE.items() if op != LogicalOperator.NOT
+    }
+
+    # Operators, parentheses and symbol names; anything else is skipped
+    TOKEN = re.compile(r'~|\(|\)|&|\|\||=>|<=>|[a-zA-Z_][a-zA-Z0-9_]*')
+
+    @classmethod
+    def tokenize(cls, expression: str) -> list:
         """
         Tokenizes a logical expression into components
 
@@ -38,58 +59,85 @@ class InputParser:
         Returns:
             list: List of tokens (operators and operands)
         """
-        # Define regex pattern for tokenization
-        pattern = r'(~|\(|\)|&|\|\||=>|<=>|[a-zA-Z_][a-zA-Z0-9_]*)'
-        tokens = re.findall(pattern, expression.strip())
-        return [t.strip() for t in tokens if t.strip()]
+        return cls.TOKEN.findall(expression)
 
     @classmethod
     def parse_expression(cls, tokens: list) -> Union[Literal, Expression]:
         """
         Parses a list of tokens into a logical expression using precedence climbing
 
+        All binary operators associate to the right, and chains of & or ||
+        become a single n-ary Expression (a & b & c has three operands).
+        The tokens are classified once and read through an index cursor;
+        instead of recursing, the parser keeps the pending operators and
+        parentheses on an explicit stack, so neither long chains nor deep
+        nesting are bounded by the recursion limit.
+
         Args:
             tokens (list): List of tokens to parse
 
         Returns:
             Union[Literal, Expression]: The parsed expression
         """
-        def parse_primary():
-            token = tokens.pop(0)
-            if token == '(':
-                expr = parse_expression(0)
-                if not tokens or tokens.pop(0) != ')':
-                    raise InputParserError("Missing closing parenthesis")
-                return expr
-            elif token == '~':
-                operand = parse_primary()
-                return Expression(LogicalOperator.NOT, [operand])
-            else:
-                return Literal(token)
-
-        def parse_expression(min_precedence: int):
-            left = parse_primary()
-
-            while tokens and any(op.value == tokens[0] for op in LogicalOperator):
-                op_token = tokens[0]
-                op = next(op for op in LogicalOperator if op.value == op_token)
-
-                if cls.PRECEDENCE[op] < min_precedence:
+        binary = [cls.BINARY_OPERATORS.get(token) for token in tokens]
+        count = len(tokens)
+        NOT, AND, OR = LogicalOperator.NOT, LogicalOperator.AND, LogicalOperator.OR
+
+        # Entries [operator, left operand, enclosing minimum precedence] for
+        # binary operators awaiting their right operand, [NOT] for negations
+        # awaiting their operand and [None, None, enclosing minimum
+        # precedence] for open parentheses
+        stack = []
+        min_precedence = 0
+        position = 0
+        while True:
+            # Operand: negations and open parentheses up to a symbol
+            while True:
+                if position == count:
+                    raise InputParserError("Unexpected end of expression")
+                token = tokens[position]
+                position += 1
+                if token == '~':
+                    stack.append([NOT])
+                elif token == '(':
+                    stack.append([None, None, min_precedence])
+                    min_precedence = 0
+                else:
+                    operand = Literal(token)
                     break
 
-                tokens.pop(0)  # consume operator
-
-                # Handle right associativity for implication and biconditional
-                next_precedence = cls.PRECEDENCE[op]
-                if op in (LogicalOperator.IMPLIES, LogicalOperator.BICON):
-                    next_precedence -= 1
-
-                right = parse_expression(next_precedence)
-                left = Expression(op, [left, right])
-
-            return left
+            # Operator: reduce until an operator binds tightly enough
+            while True:
+                while stack and stack[-1][0] is NOT:
+                    stack.pop()
+                    operand = Expression(NOT, [operand])
+
+                entry = binary[position] if position < count else None
+                if entry is not None and entry[1] >= min_precedence:
+                    stack.append([entry[0], operand, min_precedence])
+                    min_precedence = entry[2]
+                    position += 1
+                    break
 
-        return parse_expression(0)
+                if not stack:
+                    if position < count:
+                        raise InputParserError(f"Unexpected token '{tokens[position]}'")
+                    return operand
+
+                op, left, min_precedence = stack.pop()
+                if op is None:
+                    if position == count or tokens[position] != ')':
+                        raise InputParserError("Missing closing parenthesis")
+                    position += 1
+                elif op is AND or op is OR:
+                    # Collect the whole chain (a & (b & (c & ...)))
+                    chain = [operand, left]
+                    while stack and stack[-1][0] is op:
+                        _, left, min_precedence = stack.pop()
+                        chain.append(left)
+                    operand = Expression(op, chain[::-1])
+                else:
+                    operand = Expression(op, [left, operand])
 
     @classmethod
     def parse_file(cls, filename: str) -> tuple[KnowledgeBase, str]:
@@ -108,62 +156,175 @@ class InputParser:
         Returns:
             tuple[KnowledgeBase, str]: The parsed knowledge base and query
         """
-        try:
-            file_path = Path(filename)
-            if not file_path.exists():
-                raise FileNotFoundError(f"File not found: {filename}")
+        kb, queries = cls.parse_file_queries(filename)
+        if len(queries) != 1:
+            raise FileFormatError(
+                "Invalid file format: File must contain exactly one TELL and one ASK section")
+        return kb, queries[0]
+
+    @classmethod
+    def parse_file_queries(cls, filename: str) -> tuple[KnowledgeBase, list[str]]:
+        """
+        Parses an input file with any number of queries
+
+        The file is memory-mapped and streamed through the parser, so only
+        the knowledge base is built in memory, never a copy of the text.
+
+        Format:
+        TELL
+        [logical expressions separated by semicolons]
+        ASK
+        [queries separated by semicolons]
+        [further ASK sections...]
+
+        Args:
+            filename (str): Path to the input file
 
-            with open(file_path, 'r') as file:
-                content = file.read().strip()
+        Returns:
+            tuple[KnowledgeBase, list[str]]: The parsed knowledge base and
+                                             queries in file order
+        """
+        file_path = Path(filename)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Error reading file: File not found: {filename}")
+
+        with open(file_path, 'rb') as file:
+            return cls._parse_chunks(cls._mapped_chunks(file))
+
+    @classmethod
+    def parse_stream(cls, stream: TextIO) -> tuple[KnowledgeBase, list[str]]:
+        """
+        Parses the input format from a text stream, reading it in chunks
 
-                # Split into TELL and ASK sections
-                tell_ask = content.split('ASK')
-                if len(tell_ask) != 2:
-                    raise FileFormatError(
-                        "File must contain exactly one TELL and one ASK section")
+        Args:
+            stream (TextIO): The stream, e.g. an open file or io.StringIO
 
-                tell_section = tell_ask[0].strip()
-                ask_section = tell_ask[1].strip()
+        Returns:
+            tuple[KnowledgeBase, list[str]]: The parsed knowledge base and
+                                             queries, as parse_file_queries
+        """
+        return cls._parse_chunks(iter(lambda: stream.read(cls.CHUNK_SIZE), ''))
 
-                # Validate TELL section
-                if not tell_section.startswith('TELL'):
-                    raise FileFormatError("File must start with TELL")
+    @classmethod
+    def parse_string(cls, text: str) -> tuple[KnowledgeBase, list[str]]:
+        """
+        Parses the input format from a string
 
-                # Parse TELL section
-                kb = KnowledgeBase()
-                tell_content = tell_section[4:].strip()
+        Args:
+            text (str): The TELL and ASK sections
 
-                if tell_content:  # Only process if there's content
-                    expressions = tell_content.split(';')
+        Returns:
+            tuple[KnowledgeBase, list[str]]: The parsed knowledge base and
+                                             queries, as parse_file_queries
+        """
+        return cls._parse_chunks([text])
 
-                    for expr in expressions:
-                        expr = expr.strip()
-                        if not expr:
-                            continue
+    @classmethod
+    def _mapped_chunks(cls, file: BinaryIO) -> Iterator[str]:
+        """Decodes a memory-mapped file chunk by chunk"""
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped
+            return
 
-                        # Tokenize and parse the expression
-                        tokens = cls.tokenize(expr)
-                        parsed_expr = cls.parse_expression(tokens)
+        with mapped:
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            for start in range(0, len(mapped), cls.CHUNK_SIZE):
+                yield decoder.decode(mapped[start:start + cls.CHUNK_SIZE])
+            yield decoder.decode(b'', final=True)
 
-                        # Add to knowledge base
-                        kb.add_clause(Clause(parsed_expr))
+    @classmethod
+    def _statements(cls, chunks: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Splits streamed text at separators and section keywords
 
-                # Parse and validate query
-                query = ask_section.strip()
-                if not query:
-                    raise FileFormatError("ASK section cannot be empty")
+        Yields:
+            Tuple[str, Optional[str]]: (Text up to the next separator, the
+                separator: ';', 'TELL' or 'ASK'; None after the last text)
+        """
+        pending = ''
+        for chunk in chunks:
+            buffer = pending + chunk
+            if 'ASK' not in buffer and 'TELL' not in buffer:
+                # No keyword: only semicolons separate the statements
+                *statements, pending = buffer.split(';')
+                for statement in statements:
+                    yield statement, ';'
+                continue
+
+            start = 0
+            for match in cls.SEPARATOR.finditer(buffer):
+                # A keyword at the end of the chunk may go on in the next one
+                if match.end() == len(buffer) and match.group() != ';':
+                    break
+                yield buffer[start:match.start()], match.group()
+                start = match.end()
+            pending = buffer[start:]
 
-                # Parse query as expression
-                query_tokens = cls.tokenize(query)
-                query_expr = cls.parse_expression(query_tokens)
+        start = 0
+        for match in cls.SEPARATOR.finditer(pending):
+            yield pending[start:match.start()], match.group()
+            start = match.end()
+        yield pending[start:], None
 
-                # Convert to string representation
-                query_str = str(query_expr)
+    @classmethod
+    def _parse_chunks(cls, chunks: Iterable[str]) -> tuple[KnowledgeBase, list[str]]:
+        """
+        Parses streamed text, adding each expression to the KB as soon as it is read
 
-                return kb, query_str
+        After the first error the rest of the text is only scanned for an ASK
+        section, because a missing ASK section is reported before any other
+        error.
+        """
+        try:
+            kb = KnowledgeBase()
+            queries = []
+            section = None  # Becomes 'TELL', then 'ASK'
+            ask_empty = False
+            asked = False
+            error = None
+
+            for text, separator in cls._statements(chunks):
+                asked = asked or separator == 'ASK'
+                if error is not None:
+                    continue
+                text = text.strip()
+
+                try:
+                    # Validate TELL section
+                    if section is None:
+                        if text or separator != 'TELL':
+                            raise FileFormatError("File must start with TELL")
+                        section = 'TELL'
+                        continue
+
+                    if section == 'TELL':
+                        if text:
+                            # Tokenize and parse the expression, then add it to the KB
+                            kb.add_clause(Clause(cls.parse_expression(cls.tokenize(text))))
+                    elif text:
+                        ask_empty = False
+                        # Parse query as expression, kept as its string representation
+                        queries.append(str(cls.parse_expression(cls.tokenize(text))))
+
+                    if separator == 'TELL':
+                        raise FileFormatError("TELL may only start the file")
+                    if separator == 'ASK':
+                        if ask_empty:
+                            raise FileFormatError("ASK section cannot be empty")
+                        section, ask_empty = 'ASK', True
+                except (InputParserError, KnowledgeBaseError) as e:
+                    error = e
+
+            if not asked:
+                raise FileFormatError(
+                    "File must contain a TELL section and at least one ASK section")
+            if error is not None:
+                raise error
+            if ask_empty:
+                raise FileFormatError("ASK section cannot be empty")
+            return kb, queries
 
-        except FileNotFoundError as e:
-            raise FileNotFoundError(f"Error reading file: {str(e)}")
         except FileFormatError as e:
             raise FileFormatError(f"Invalid file format: {str(e)}")
         except KnowledgeBaseError as e:
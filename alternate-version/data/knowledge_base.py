@@ -1,6 +1,7 @@
 # /data/knowledge_base.py
-from dataclasses import dataclass
-from typing import List, Set, Union
+from array import array
+from typing import Callable, Dict, Iterable, List, Sequence, Set, Tuple, Union
+from weakref import WeakValueDictionary
 from enum import Enum
 
 class LogicalOperator(Enum):
@@ -23,60 +24,148 @@ class InvalidClauseError(KnowledgeBaseError):
     """Raised when an invalid clause is provided"""
     pass
 
-@dataclass
 class Literal:
     """
     Represents a propositional logic literal (e.g., 'p' or '~p')
 
+    Literals are immutable flyweights: constructing an existing (name,
+    negative) pair returns the same instance, so each name is validated
+    once and equal literals are identical. The table of instances only
+    holds them weakly, so the symbols of knowledge bases that are no longer
+    used are freed.
+
     Attributes:
         name (str): The symbol name (e.g., 'p', 'q')
         negative (bool): True if this is a negated literal (e.g., '~p')
     """
-    name: str
-    negative: bool = False
+    __slots__ = ("name", "negative", "__weakref__")
+
+    # The one live instance of each (name, negative) pair
+    _instances: "WeakValueDictionary[tuple, Literal]" = WeakValueDictionary()
 
-    def __post_init__(self):
-        if not isinstance(self.name, str):
+    def __new__(cls, name: str, negative: bool = False):
+        if not isinstance(name, str):
             raise InvalidLiteralError("Literal name must be a string")
-        if not self.name.strip():
-            raise InvalidLiteralError("Literal name cannot be empty")
-        if not all(c.isalnum() or c == '_' for c in self.name):
-            raise InvalidLiteralError(
-                f"Invalid literal name '{self.name}'. Only alphanumeric characters and underscores are allowed.")
+        key = (name, bool(negative))
+        literal = cls._instances.get(key)
+        if literal is None:
+            if not name.strip():
+                raise InvalidLiteralError("Literal name cannot be empty")
+            if not all(c.isalnum() or c == '_' for c in name):
+                raise InvalidLiteralError(
+                    f"Invalid literal name '{name}'. Only alphanumeric characters and underscores are allowed.")
+            literal = object.__new__(cls)
+            object.__setattr__(literal, "name", name)
+            object.__setattr__(literal, "negative", key[1])
+            cls._instances[key] = literal
+        return literal
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete field '{name}'")
+
+    def __reduce__(self):
+        return Literal, (self.name, self.negative)
+
+    def __repr__(self):
+        return f"Literal(name={self.name!r}, negative={self.negative!r})"
 
     def __str__(self):
         return f"{'~' if self.negative else ''}{self.name}"
 
     def negate(self):
-        """Returns a new literal with opposite polarity"""
+        """Returns the literal with opposite polarity"""
         return Literal(self.name, not self.negative)
 
-@dataclass
 class Expression:
     """
     Represents a logical expression that can contain multiple literals and operators
 
+    Expressions are immutable and hashable; the hash is computed once from
+    the already hashed operands, so nested expressions hash in constant time.
+
     Attributes:
         operator (LogicalOperator): The main logical operator of this expression
-        operands (List[Union[Literal, 'Expression']]): The operands (can be literals or nested expressions)
+        operands (Tuple[Union[Literal, 'Expression'], ...]): The operands (can be literals or
+            nested expressions), given as a list or tuple
     """
-    operator: LogicalOperator
-    operands: List[Union[Literal, 'Expression']]
+    __slots__ = ("operator", "operands", "_hash")
+
+    def __init__(self, operator: LogicalOperator, operands: Sequence[Union[Literal, 'Expression']]):
+        operands = tuple(operands)
+        object.__setattr__(self, "operator", operator)
+        object.__setattr__(self, "operands", operands)
+        object.__setattr__(self, "_hash", hash((operator, operands)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other):
+        if not isinstance(other, Expression):
+            return NotImplemented
+        return self is other or (self._hash == other._hash and self.operator == other.operator
+                                 and self.operands == other.operands)
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return Expression, (self.operator, self.operands)
+
+    def __repr__(self):
+        return f"Expression(operator={self.operator!r}, operands={list(self.operands)!r})"
 
     def __str__(self):
+        # Nested binary expressions are parenthesized, so the text parses
+        # back into the same expression
+        def operand(op: Union[Literal, 'Expression']) -> str:
+            if isinstance(op, Expression) and op.operator != LogicalOperator.NOT:
+                return f"({op})"
+            return str(op)
+
         if self.operator == LogicalOperator.NOT:
-            return f"~{self.operands[0]}"
-        return f" {self.operator.value} ".join(str(op) for op in self.operands)
+            return f"~{operand(self.operands[0])}"
+        return f" {self.operator.value} ".join(operand(op) for op in self.operands)
 
-@dataclass
 class Clause:
     """
     Represents a general logical clause that can contain complex expressions
 
+    Clauses are immutable and hashable, so they can be deduplicated with
+    sets or used as dictionary keys.
+
     Attributes:
         expression (Union[Literal, Expression]): The logical expression
     """
-    expression: Union[Literal, Expression]
+    __slots__ = ("expression",)
+
+    def __init__(self, expression: Union[Literal, Expression]):
+        object.__setattr__(self, "expression", expression)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other):
+        if not isinstance(other, Clause):
+            return NotImplemented
+        return self.expression == other.expression
+
+    def __hash__(self):
+        return hash(self.expression)
+
+    def __reduce__(self):
+        return Clause, (self.expression,)
+
+    def __repr__(self):
+        return f"Clause(expression={self.expression!r})"
 
     def is_horn(self) -> bool:
         """Checks if this is a Horn clause"""
@@ -115,15 +204,26 @@ class KnowledgeBase:
 
     Attributes:
         clauses (List[Clause]): List of all clauses in the knowledge base
+            (retracting a clause moves the last clause into its place)
         facts (Set[str]): Set of known facts (atomic propositions)
         symbols (Set[str]): Set of all unique symbols used
         horn_only (bool): Whether to restrict to Horn clauses only
+        version (int): Number of additions and retractions so far
     """
     def __init__(self, horn_only: bool = False):
         self.clauses: List[Clause] = []
         self.facts: Set[str] = set()
         self.symbols: Set[str] = set()
         self.horn_only = horn_only
+        # Number of clauses using each symbol, so retraction can update symbols
+        self._references: Dict[str, int] = {}
+        # Positions in clauses of each clause, and number of fact clauses of
+        # each symbol, so retraction needs no scan of the clause list
+        self._positions: Dict[Clause, Dict[int, None]] = {}
+        self._fact_counts: Dict[str, int] = {}
+        # Bumped by every addition or retraction, so compiled forms can tell
+        # whether they are stale
+        self.version = 0
 
     def add_clause(self, clause: Clause) -> None:
         """
@@ -141,11 +241,160 @@ class KnowledgeBase:
         # Extract atomic facts (single positive literals)
         if isinstance(clause.expression, Literal) and not clause.expression.negative:
             self.facts.add(clause.expression.name)
+            self._fact_counts[clause.expression.name] = \
+                self._fact_counts.get(clause.expression.name, 0) + 1
 
         # Update symbols
-        self.symbols.update(clause.get_symbols())
+        for symbol in clause.get_symbols():
+            self.symbols.add(symbol)
+            self._references[symbol] = self._references.get(symbol, 0) + 1
 
+        self._positions.setdefault(clause, {})[len(self.clauses)] = None
         self.clauses.append(clause)
+        self.version += 1
+
+    def retract_clause(self, clause: Clause) -> None:
+        """
+        Removes one occurrence of a clause from the knowledge base
+
+        The last clause is moved into the freed position, so the cost does
+        not depend on the size of the knowledge base. Unlike swin-version,
+        this knowledge base maintains no forward chaining closure, so there
+        is nothing to rederive.
+
+        Args:
+            clause (Clause): The clause to remove
+
+        Raises:
+            InvalidClauseError: If the clause is not in the knowledge base
+        """
+        positions = self._positions.get(clause) if isinstance(clause, Clause) else None
+        if not positions:
+            raise InvalidClauseError(f"Clause not in knowledge base: {clause}")
+
+        index = positions.popitem()[0]
+        if not positions:
+            del self._positions[clause]
+        last = len(self.clauses) - 1
+        if index != last:
+            moved = self.clauses[last]
+            self.clauses[index] = moved
+            moved_positions = self._positions[moved]
+            del moved_positions[last]
+            moved_positions[index] = None
+        self.clauses.pop()
+
+        if isinstance(clause.expression, Literal) and not clause.expression.negative:
+            self._fact_counts[clause.expression.name] -= 1
+            if not self._fact_counts[clause.expression.name]:
+                del self._fact_counts[clause.expression.name]
+                self.facts.discard(clause.expression.name)
+
+        for symbol in clause.get_symbols():
+            self._references[symbol] -= 1
+            if not self._references[symbol]:
+                del self._references[symbol]
+                self.symbols.discard(symbol)
+        self.version += 1
+
+    def retract_fact(self, symbol: str) -> None:
+        """
+        Removes a fact from the knowledge base
+
+        Args:
+            symbol (str): The fact to withdraw
+
+        Raises:
+            InvalidClauseError: If the fact is not in the knowledge base
+        """
+        self.retract_clause(Clause(Literal(symbol)))
 
     def __str__(self):
         return "\n".join(str(clause) for clause in self.clauses)
+
+
+def group_rules(symbol_count: int, pairs: Callable[[], Iterable[Tuple[int, int]]]) -> Tuple[array, array]:
+    """
+    Counting-sorts (symbol, rule id) pairs by symbol into CSR form
+
+    Called by every HornView index. pairs is iterated twice and must yield
+    the same sequence each time; rule ids stay in order within a symbol.
+    """
+    offsets = array('i', [0]) * (symbol_count + 1)
+    for symbol, _ in pairs():
+        offsets[symbol + 1] += 1
+    for s in range(symbol_count):
+        offsets[s + 1] += offsets[s]
+
+    rule_ids = array('i', [0]) * offsets[symbol_count]
+    fill = array('i', offsets)
+    for symbol, rule_id in pairs():
+        rule_ids[fill[symbol]] = rule_id
+        fill[symbol] += 1
+    return offsets, rule_ids
+
+
+class HornView:
+    """
+    Interned, columnar view of the Horn clauses of a knowledge base
+
+    Symbols are numbered densely in order of first appearance, and rule i
+    has the premises premises[offsets[i]:offsets[i + 1]] and the conclusion
+    conclusions[i], all as symbol ids. Facts are rules without premises.
+    Chaining over the view indexes plain arrays instead of hashing strings;
+    names are only looked up again to report results.
+
+    Attributes:
+        names (List[str]): Name of each symbol id
+        ids (Dict[str, int]): Id of each symbol name
+        offsets (array): Start of each rule's premises, followed by the end
+        premises (array): Premise ids of all rules, concatenated
+        conclusions (array): Conclusion id of each rule
+    """
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.offsets = array('i', [0])
+        self.premises = array('i')
+        self.conclusions = array('i')
+
+    @property
+    def rule_count(self) -> int:
+        return len(self.conclusions)
+
+    def intern(self, name: str) -> int:
+        """Returns the id of a symbol, allocating it on first use"""
+        symbol = self.ids.get(name)
+        if symbol is None:
+            symbol = len(self.names)
+            self.names.append(name)
+            self.ids[name] = symbol
+        return symbol
+
+    def add_rule(self, premises: Iterable[str], conclusion: str) -> None:
+        """Appends the rule premises => conclusion (a fact if there are no premises)"""
+        self.premises.extend(self.intern(p) for p in premises)
+        self.offsets.append(len(self.premises))
+        self.conclusions.append(self.intern(conclusion))
+
+    def occurrence_index(self) -> Tuple[array, array]:
+        """
+        Maps each symbol to the rules using it as a premise
+
+        Returns:
+            Tuple[array, array]: CSR (offsets, rule ids)
+        """
+        def pairs():
+            for i in range(self.rule_count):
+                for p in self.premises[self.offsets[i]:self.offsets[i + 1]]:
+                    yield p, i
+        return group_rules(len(self.names), pairs)
+
+    def head_index(self) -> Tuple[array, array]:
+        """
+        Maps each symbol to the rules concluding it
+
+        Returns:
+            Tuple[array, array]: CSR (offsets, rule ids), in rule order
+        """
+        return group_rules(len(self.names), lambda: zip(self.conclusions, range(self.rule_count)))
@@ -5,6 +5,8 @@ from data.input_parser import InputParser
 from algorithms.tt import TruthTable
 from algorithms.fc import ForwardChaining
 from algorithms.bc import BackwardChaining
+from algorithms.sat import SatEntailment
+from algorithms.bdd import BDDEntailment
 from data.knowledge_base import KnowledgeBase, InvalidClauseError
 
 
@@ -24,20 +26,24 @@ def main():
     """
     Main entry point for the inference engine
 
-    Usage: python main.py <filename> <method>
-    where method is one of: TT, FC, BC
+    Usage: python main.py <filename> <method> [mode]
+    where method is one of: TT, FC, BC, SAT, BDD
+    and mode optionally selects the strategy of the method:
+    TT (enumerate, bitset, compiled, parallel, count, prune, gray), FC (saturate, goal),
+    BC (search, tabled, cost)
     """
     # Setup logging
     setup_logging()
     logger = logging.getLogger(__name__)
 
-    if len(sys.argv) != 3:
+    if len(sys.argv) not in (3, 4):
         logger.error("Invalid number of arguments")
-        print("Usage: python main.py <filename> <method>")
+        print("Usage: python main.py <filename> <method> [mode]")
         sys.exit(1)
 
     filename = sys.argv[1]
     method = sys.argv[2].upper()
+    mode = sys.argv[3].lower() if len(sys.argv) == 4 else None
 
     try:
         # Create knowledge base with appropriate settings
@@ -47,8 +53,8 @@ def main():
         # Parse input file
         logger.info(f"Parsing input file: {filename}")
         try:
-            kb, query = InputParser.parse_file(filename)
-            logger.info(f"Successfully parsed input file. Query: {query}")
+            kb, queries = InputParser.parse_file_queries(filename)
+            logger.info(f"Successfully parsed input file. Queries: {', '.join(queries)}")
         except InvalidClauseError as e:
             if horn_only:
                 logger.error("Non-Horn clauses detected in input file")
@@ -57,24 +63,39 @@ def main():
                 sys.exit(1)
             raise
 
-        # Run requested inference method
+        # Run requested inference method, printing one line per query
         if method == "TT":
             logger.info("Using Truth Table method")
-            tt = TruthTable()
-            result, models = tt.check_entailment(kb, query)
-            print(f"YES: {models}" if result else "NO")
+            tt = TruthTable(mode=mode or "enumerate")
+            for result, models in tt.check_entailments(kb, queries):
+                print(f"YES: {models}" if result else "NO")
 
         elif method == "FC":
             logger.info("Using Forward Chaining method")
-            fc = ForwardChaining()
-            result, inferred = fc.check_entailment(kb, query)
-            print(f"YES: {', '.join(inferred)}" if result else "NO")
+            fc = ForwardChaining(mode=mode or "saturate")
+            for result, inferred in fc.check_entailments(kb, queries):
+                print(f"YES: {', '.join(inferred)}" if result else "NO")
 
         elif method == "BC":
             logger.info("Using Backward Chaining method")
-            bc = BackwardChaining()
-            result, inferred = bc.check_entailment(kb, query)
-            print(f"YES: {', '.join(inferred)}" if result else "NO")
+            bc = BackwardChaining(mode=mode or "search")
+            for result, inferred in bc.check_entailments(kb, queries):
+                print(f"YES: {', '.join(inferred)}" if result else "NO")
+
+        elif method == "SAT":
+            logger.info("Using SAT refutation method")
+            sat = SatEntailment()
+            for query in queries:
+                result, _ = sat.check_entailment(kb, query)
+                print("YES" if result else "NO")
+
+        elif method == "BDD":
+            logger.info("Using BDD knowledge compilation method")
+            bdd = BDDEntailment()
+            # The KB is compiled on the first query and reused for the rest
+            for query in queries:
+                result, models = bdd.check_entailment(kb, query)
+                print(f"YES: {models}" if result else "NO")
 
         else:
             logger.error(f"Unknown method: {method}")
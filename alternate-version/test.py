@@ -0,0 +1,243 @@
+import gc
+import unittest
+from pathlib import Path
+from unittest import mock
+from data.input_parser import InputParser, InputParserError
+from data.knowledge_base import (
+    KnowledgeBase, Clause, Literal, Expression, LogicalOperator, InvalidClauseError
+)
+from algorithms.tt import TruthTable
+from algorithms.sat import SatEntailment
+from algorithms.model_counter import ModelCounter
+from algorithms.bdd import BDDEntailment
+
+
+class TestLogicEngine(unittest.TestCase):
+    def setUp(self):
+        self.test_files_dir = Path("test_files")
+        self.test_files_dir.mkdir(exist_ok=True)
+        self.kb, _ = InputParser.parse_string("TELL a => b; a || c; ASK b")
+
+    def implication(self, premise: str, conclusion: str) -> Clause:
+        return Clause(Expression(LogicalOperator.IMPLIES, [Literal(premise), Literal(conclusion)]))
+
+    def test_literals_are_interned_while_referenced(self):
+        self.assertIs(Literal("p1"), Literal("p1"))
+        self.assertIsNot(Literal("p1"), Literal("p1", True))
+        kb, _ = InputParser.parse_string("TELL unused_symbol => b; ASK b")
+        self.assertIn(("unused_symbol", False), Literal._instances)
+        del kb
+        gc.collect()
+        self.assertNotIn(("unused_symbol", False), Literal._instances)
+
+    def test_parser_flattens_chains(self):
+        expr = InputParser.parse_expression(InputParser.tokenize("a & b & (c || d || ~e) => f"))
+        self.assertEqual(expr.operator, LogicalOperator.IMPLIES)
+        self.assertEqual(len(expr.operands[0].operands), 3)
+        self.assertEqual(expr.operands[0].operands[2].operator, LogicalOperator.OR)
+        self.assertEqual(len(expr.operands[0].operands[2].operands), 3)
+        self.assertEqual(expr.operands[1], Literal("f"))
+
+    def test_parser_handles_long_and_deeply_nested_expressions(self):
+        chain = InputParser.parse_expression(
+            InputParser.tokenize(" & ".join(f"p{i}" for i in range(5000))))
+        self.assertEqual(len(chain.operands), 5000)
+        nested = InputParser.parse_expression(InputParser.tokenize("(" * 3000 + "a" + ")" * 3000))
+        self.assertEqual(nested, Literal("a"))
+        for text in ("(a & b", "a &", "a b"):
+            with self.assertRaises(InputParserError):
+                InputParser.parse_expression(InputParser.tokenize(text))
+
+    def test_parser_defers_only_input_errors(self):
+        with self.assertRaisesRegex(InputParserError, "must contain a TELL section"):
+            InputParser.parse_string("TELL a => ; b")
+        # Anything else is a bug, reported at once instead of after the scan
+        with mock.patch.object(KnowledgeBase, "add_clause", side_effect=RuntimeError("boom")) as add:
+            with self.assertRaisesRegex(InputParserError, "boom"):
+                InputParser.parse_string("TELL a; b; c")
+        self.assertEqual(add.call_count, 1)
+
+    def assert_matches_enumeration(self, mode: str):
+        kb, queries = InputParser.parse_string("TELL a => b; a; c || d; d => e; ASK b; ~c; e; d; a;")
+        # Model counts of non-entailed queries depend on where a mode stops
+        def outcome(result):
+            return result[0], result[1] if result[0] else None
+        expected = [outcome(result) for result in TruthTable().check_entailments(kb, queries)]
+        self.assertEqual([outcome(result) for result in TruthTable(mode).check_entailments(kb, queries)],
+                         expected)
+        self.assertEqual([outcome(TruthTable(mode).check_entailment(kb, query)) for query in queries],
+                         expected)
+
+    def test_truth_table_bitset_mode(self):
+        self.assert_matches_enumeration("bitset")
+        # Several blocks per table
+        with mock.patch.object(TruthTable, "BLOCK_BITS", 2):
+            self.assert_matches_enumeration("bitset")
+            self.assertEqual(TruthTable("bitset").check_entailment(self.kb, "b"),
+                             TruthTable().check_entailment(self.kb, "b"))
+
+    def test_truth_table_compiled_mode(self):
+        self.assert_matches_enumeration("compiled")
+        kb_holds, query_holds = TruthTable.compile_kb(self.kb, ["a", "b", "c"], Literal("b"))
+        self.assertEqual([kb_holds(values) for values in ((True, False, True), (False, False, True))],
+                         [False, True])
+        self.assertFalse(query_holds((False, False, True)))
+
+    def test_truth_table_parallel_mode(self):
+        self.assert_matches_enumeration("parallel")
+        # Small tables are enumerated in-process; force the worker pool
+        with mock.patch.object(TruthTable, "PARALLEL_MIN_SYMBOLS", 0):
+            self.assertEqual(TruthTable("parallel", workers=2).check_entailment(self.kb, "b"),
+                             TruthTable().check_entailment(self.kb, "b"))
+            kb, _ = InputParser.parse_string("TELL a => b; a; c || d; ASK b")
+            self.assertEqual(TruthTable("parallel", workers=2).check_entailment(kb, "b"), (True, 3))
+
+    def test_truth_table_prune_mode(self):
+        self.assert_matches_enumeration("prune")
+
+    def test_truth_table_gray_mode(self):
+        self.assert_matches_enumeration("gray")
+
+    def test_truth_table_count_mode(self):
+        kb, queries = InputParser.parse_string("TELL a => b; a; c || d; d => e; ASK b; ~c; e; a;")
+        # Counts are exact, and cover every KB model even when not entailed
+        self.assertEqual(TruthTable("count").check_entailments(kb, queries),
+                         [(True, 4), (False, 4), (False, 4), (True, 4)])
+
+    def test_model_counter_multiplies_components(self):
+        self.assertEqual(ModelCounter().count(4, [[1, 2], [3, 4]]), 9)
+        self.assertEqual(ModelCounter().count(3, [[1], [-1, 2]]), 2)
+        self.assertEqual(ModelCounter().count(2, [[1], [-1]]), 0)
+
+    def test_model_counter_deep_component(self):
+        text = "; ".join(f"(x{i} & y{i}) || (~x{i + 1} & z{i})" for i in range(800))
+        kb, _ = InputParser.parse_string(f"TELL {text}; ASK x0")
+        entailed, models = TruthTable("count").check_entailment(kb, "x0")
+        self.assertFalse(entailed)
+        self.assertEqual(models, BDDEntailment().check_entailment(kb, "x0")[1])
+
+        kb, _ = InputParser.parse_string(f"TELL {text[:text.index('; (x5')]}; ASK x0")
+        self.assertEqual(TruthTable("count").check_entailment(kb, "x0")[1],
+                         len(list(TruthTable().iter_models(kb, "x0", only_kb_true=True))))
+
+    def test_sat_entailment(self):
+        sat = SatEntailment()
+        self.assertEqual(sat.check_entailment(self.kb, "b || c"), (True, None))
+        entailed, model = sat.check_entailment(self.kb, "b")
+        self.assertFalse(entailed)
+        self.assertEqual(model, {"a": False, "b": False, "c": True})
+
+    def test_sat_entailment_of_compound_queries(self):
+        kb, queries = InputParser.parse_string(
+            "TELL a & ~b; ASK ~(a & b); (a || b) & ~b; ~(a => b); a => (b || ~a);")
+        self.assertEqual(queries, ["~(a & b)", "(a || b) & ~b", "~(a => b)", "a => (b || ~a)"])
+        self.assertEqual([SatEntailment().check_entailment(kb, query)[0] for query in queries],
+                         [True, True, True, False])
+
+        # Queries are kept as text, which parses back into the same expression
+        for text in ("~(a & b) <=> ~a || ~b", "(a => b) => c", "a => b => c", "~~a & (b || c & d)"):
+            expr = InputParser.parse_expression(InputParser.tokenize(text))
+            self.assertEqual(InputParser.parse_expression(InputParser.tokenize(str(expr))), expr)
+
+    def test_iter_models_paging(self):
+        tt = TruthTable()
+        rows = list(tt.iter_models(self.kb, "b"))
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(rows[1], ((False, False, True), True, False))
+        self.assertEqual(list(tt.iter_models(self.kb, "b", limit=3, offset=2)), rows[2:5])
+
+        models = [row for row in rows if row[1]]
+        self.assertEqual(list(tt.iter_models(self.kb, "b", only_kb_true=True)), models)
+        self.assertEqual(list(tt.iter_models(self.kb, "b", only_kb_true=True, limit=2, offset=1)),
+                         models[1:3])
+        self.assertEqual(list(tt.iter_models(self.kb, "b", offset=8)), [])
+
+    def test_write_truth_table_csv(self):
+        tt = TruthTable()
+        path = self.test_files_dir / "table.csv"
+        self.assertEqual(tt.write_truth_table(self.kb, "b", str(path), only_kb_true=True), 4)
+        self.assertEqual(path.read_text().splitlines(),
+                         ["a,b,c,KB,Q", "0,0,1,1,0", "0,1,1,1,1", "1,1,0,1,1", "1,1,1,1,1"])
+
+        # Chunk boundaries do not change the output
+        expected = path.read_text()
+        for chunk_size in (1, 3, 4):
+            tt.write_truth_table(self.kb, "b", str(path), only_kb_true=True, chunk_size=chunk_size)
+            self.assertEqual(path.read_text(), expected)
+
+    def test_write_truth_table_bits(self):
+        tt = TruthTable()
+        path = self.test_files_dir / "table.bits"
+        self.assertEqual(tt.write_truth_table(self.kb, "b", str(path), fmt="bits",
+                                              limit=5, offset=1, chunk_size=2), 5)
+        header, records = path.read_bytes().split(b"\n", 1)
+        self.assertEqual(header, b"a,b,c,KB,Q")
+        # One byte per row: model index, KB value, query value
+        self.assertEqual([(r >> 2, (r >> 1) & 1, r & 1) for r in records],
+                         [(1, 1, 0), (2, 0, 1), (3, 1, 1), (4, 0, 0), (5, 0, 0)])
+        with self.assertRaises(ValueError):
+            tt.write_truth_table(self.kb, "b", str(path), fmt="json")
+
+    def test_retraction_moves_last_clause_and_counts_duplicate_facts(self):
+        kb = KnowledgeBase()
+        fact, rule = Clause(Literal("a")), self.implication("a", "b")
+        for clause in (fact, rule, fact, self.implication("b", "c")):
+            kb.add_clause(clause)
+
+        kb.retract_clause(rule)
+        self.assertEqual([str(c) for c in kb.clauses], ["a", "b => c", "a"])
+        kb.retract_fact("a")
+        self.assertIn("a", kb.facts)
+        kb.retract_fact("a")
+        self.assertNotIn("a", kb.facts)
+        self.assertEqual(kb.symbols, {"b", "c"})
+        with self.assertRaises(InvalidClauseError):
+            kb.retract_clause(rule)
+
+    def test_bdd_entailment(self):
+        kb, queries = InputParser.parse_string(
+            "TELL a => b; b & c => d; a; c || e; ~e; ASK d; e; a <=> b;")
+        bdd = BDDEntailment()
+        self.assertEqual([bdd.check_entailment(kb, query) for query in queries],
+                         [(True, 1), (False, 1), (True, 1)])
+
+    def test_bdd_entailment_of_compound_queries(self):
+        kb, queries = InputParser.parse_string("TELL a & ~b; ASK ~(a & b); ~(a => b); (a => b) || b;")
+        bdd = BDDEntailment()
+        self.assertEqual([bdd.check_entailment(kb, query) for query in queries],
+                         [(True, 1), (True, 1), (False, 1)])
+
+    def test_bdd_long_horn_chain(self):
+        kb = KnowledgeBase()
+        for i in range(1200):
+            kb.add_clause(self.implication(f"p{i}", f"p{i + 1}"))
+        kb.add_clause(Clause(Literal("p0")))
+        bdd = BDDEntailment()
+        self.assertEqual(bdd.check_entailment(kb, "p1200"), (True, 1))
+        self.assertFalse(bdd.check_entailment(kb, "~p600")[0])
+
+    def test_bdd_recompiles_after_changes(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause(Literal("a")))
+        rule = self.implication("a", "b")
+        kb.add_clause(rule)
+        bdd = BDDEntailment()
+        self.assertTrue(bdd.check_entailment(kb, "b")[0])
+
+        # Same clause count as before, but b no longer follows
+        kb.retract_clause(rule)
+        kb.add_clause(self.implication("b", "a"))
+        self.assertFalse(bdd.check_entailment(kb, "b")[0])
+
+        other = KnowledgeBase()
+        other.add_clause(Clause(Literal("b")))
+        self.assertEqual(bdd.check_entailment(other, "b"), (True, 1))
+
+    def tearDown(self):
+        for file in self.test_files_dir.iterdir():
+            file.unlink()
+        self.test_files_dir.rmdir()
+
+
+if __name__ == '__main__':
+    unittest.main()
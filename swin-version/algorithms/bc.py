@@ -1,74 +1,467 @@
 # /algorithms/bc.py
-from data.knowledge_base import KnowledgeBase
+from data.knowledge_base import KnowledgeBase, CompactKnowledgeBase
+from array import array
 from collections import OrderedDict  # For consistent ordering
+from typing import Optional
 
 
 class BackwardChaining:
     """Implementation of the Backward Chaining algorithm"""
 
+    # Supported strategies: plain depth-first search, search with a table of
+    # proven and failed goals, or search in fail-first cost order
+    MODES = ("search", "tabled", "cost")
+
+    # Table states of a goal in the tabled search
+    UNKNOWN, PROVEN, FAILED = 0, 1, 2
+
     @staticmethod
-    def check_entailment(kb: KnowledgeBase, query: str) -> tuple[bool, list[str]]:
+    def check_entailment(kb: KnowledgeBase, query: str,
+                         mode: str = "search") -> tuple[bool, list[str]]:
         """
         Checks if KB entails query using backward chaining
 
+        The "search" mode only remembers proven goals, so a failed subgoal is
+        explored again whenever another rule needs it. The "tabled" mode
+        (see _check_tabled) also remembers failures, and the "cost" mode
+        searches in the order of cost_ordered_rules.
+
+        A CompactKnowledgeBase is searched directly over its integer columns.
+
         Args:
             kb (KnowledgeBase): The knowledge base
             query (str): The query to check
+            mode (str): Strategy, one of BackwardChaining.MODES
 
         Returns:
             tuple[bool, list[str]]: (Whether KB entails query,
                                     List of symbols used in proof in order)
         """
+        if mode not in BackwardChaining.MODES:
+            raise ValueError(f"Unknown backward chaining mode: {mode}")
+
+        if mode == "tabled":
+            compact = kb if isinstance(kb, CompactKnowledgeBase) else \
+                CompactKnowledgeBase.from_knowledge_base(kb)
+            return BackwardChaining._check_tabled(compact, query)
+        if mode == "cost":
+            compact = kb if isinstance(kb, CompactKnowledgeBase) else \
+                CompactKnowledgeBase.from_knowledge_base(kb)
+            return BackwardChaining._check_compact(
+                compact, query, BackwardChaining.cost_ordered_rules(compact))
+
+        if isinstance(kb, CompactKnowledgeBase):
+            return BackwardChaining._check_compact(kb, query)
+
         # Use OrderedDict to maintain consistent ordering of inferred symbols
         inferred = OrderedDict()
         goals = set()  # Track current goals for cycle detection
 
-        def bc_or(goal: str) -> bool:
-            """
-            Tries to prove goal symbol using OR strategy
-            (prove goal directly or through any applicable rule)
-            """
-            # Base case: goal is a known fact
-            if goal in kb.facts:
-                if goal not in inferred:
+        # The search runs on an explicit stack instead of recursing, so proof
+        # depth is not bounded by the interpreter. Each goal whose rules are
+        # being tried has a frame [goal, rules, rule position, premise position];
+        # goal is the next symbol to prove and result the outcome of the last one
+        frames = []
+        goal, result = query, None
+        while True:
+            if goal is not None:
+                # Base case: goal is a known fact
+                if goal in kb.facts:
+                    if goal not in inferred:
+                        inferred[goal] = None
+                    result = True
+                # Check for cycles
+                elif goal in goals:
+                    result = False
+                else:
+                    goals.add(goal)
+                    # Rules that could prove goal, in clause order, with their
+                    # premises already sorted by name for a consistent evaluation order
+                    frames.append([goal, kb.by_head.get(goal, ()), 0, 0])
+                goal = None
+
+            if not frames:
+                return result, list(inferred.keys())
+
+            frame = frames[-1]
+            head, rules = frame[0], frame[1]
+            if result is not None:
+                # A premise succeeded: go on with the rule, otherwise try the next rule
+                if result:
+                    frame[3] += 1
+                else:
+                    frame[2] += 1
+                    frame[3] = 0
+                result = None
+
+            if frame[2] == len(rules):
+                goals.remove(head)
+                frames.pop()
+                result = False
+            elif frame[3] < len(rules[frame[2]][1]):
+                goal = rules[frame[2]][1][frame[3]]
+            else:
+                # All premises of the rule hold
+                if head not in inferred:
+                    inferred[head] = None
+                goals.remove(head)
+                frames.pop()
+                result = True
+
+    @staticmethod
+    def check_entailments(kb: KnowledgeBase, queries: list[str],
+                          mode: str = "search") -> list[tuple[bool, list[str]]]:
+        """
+        Answers many queries, sharing one table of provable symbols
+
+        Backward chaining with cycle detection proves exactly the symbols in
+        the forward closure of the KB (premises taken by name, as bc_or
+        does). That closure is computed once, so queries outside it are
+        answered immediately with an empty proof instead of exploring every
+        rule, and only provable queries run the backward search for their
+        proof order. Repeated queries are answered once, and the "cost" mode
+        orders the rules once for all queries.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            queries (list[str]): The queries to check
+            mode (str): Strategy, one of BackwardChaining.MODES
+
+        Returns:
+            list[tuple[bool, list[str]]]: (Whether KB entails each query,
+                                          List of symbols used in its proof)
+        """
+        if mode not in BackwardChaining.MODES:
+            raise ValueError(f"Unknown backward chaining mode: {mode}")
+
+        if mode == "cost":
+            kb = kb if isinstance(kb, CompactKnowledgeBase) else \
+                CompactKnowledgeBase.from_knowledge_base(kb)
+            rules = BackwardChaining.cost_ordered_rules(kb)
+
+        provable = BackwardChaining._provable_symbols(kb)
+        results = {}
+        for query in queries:
+            if query in results:
+                continue
+            if query not in provable:
+                results[query] = (False, [])
+            elif mode == "cost":
+                results[query] = BackwardChaining._check_compact(kb, query, rules)
+            else:
+                results[query] = BackwardChaining.check_entailment(kb, query, mode)
+        return [results[query] for query in queries]
+
+    @staticmethod
+    def symbol_statistics(kb: CompactKnowledgeBase) -> tuple[array, array]:
+        """
+        Computes the per-symbol statistics behind the "cost" mode
+
+        The depth of a symbol's dependency cone is 0 for facts and symbols no
+        rule concludes, and otherwise one more than the deepest premise of its
+        rules. It is found by peeling the premise -> conclusion graph bottom
+        up; symbols on or above a cycle are never peeled and get one more
+        than the deepest peeled symbol.
+
+        Returns:
+            tuple[array, array]: (Number of rules concluding each symbol,
+                                 depth of its dependency cone)
+        """
+        head_offsets, _ = kb.head_index()
+        symbol_count = len(kb.names)
+        rule_counts = array('i', (head_offsets[s + 1] - head_offsets[s] for s in range(symbol_count)))
+
+        # Premise occurrences not yet peeled, per conclusion (facts need none)
+        pending = array('i', [0]) * symbol_count
+        users = [[] for _ in range(symbol_count)]
+        offsets, premises, conclusions = kb.offsets, kb.premises, kb.conclusions
+        for i in range(kb.clause_count):
+            head = conclusions[i]
+            if not kb.is_fact[head]:
+                for p in premises[offsets[i]:offsets[i + 1]]:
+                    pending[head] += 1
+                    users[p if p >= 0 else ~p].append(head)
+
+        depth = array('i', [0]) * symbol_count
+        agenda = [s for s in range(symbol_count) if not pending[s]]
+        while agenda:
+            s = agenda.pop()
+            for head in users[s]:
+                depth[head] = max(depth[head], depth[s] + 1)
+                pending[head] -= 1
+                if not pending[head]:
+                    agenda.append(head)
+
+        cyclic = max(depth, default=0) + 1
+        for s in range(symbol_count):
+            if pending[s]:
+                depth[s] = cyclic
+        return rule_counts, depth
+
+    @staticmethod
+    def cost_ordered_rules(kb: CompactKnowledgeBase) -> tuple[array, array, array]:
+        """
+        Orders rule bodies fail-first and rules cheapest-body-first
+
+        Within a body, premises no rule concludes (and that are not facts)
+        come first since they fail at once, then the derived premises with
+        the fewest defining rules and the shallowest dependency cone, and
+        facts last. A rule costs the sum of its premises' costs: 0 for a
+        fact, 1 for a premise that fails at once, else 1 + its cone depth.
+        Ties keep the order of the "search" mode (premises by name, rules in
+        clause order), so the search is reproducible.
+
+        Returns:
+            tuple[array, array, array]: (head offsets, clause ids of each head
+                in cost order, premises laid out like kb.premises with each
+                body in fail-first order)
+        """
+        rule_counts, depth = BackwardChaining.symbol_statistics(kb)
+        names, is_fact, offsets = kb.names, kb.is_fact, kb.offsets
+
+        def premise_key(p: int) -> tuple:
+            s = p if p >= 0 else ~p
+            group = 2 if is_fact[s] else (1 if rule_counts[s] else 0)
+            return group, rule_counts[s], depth[s], names[s]
+
+        def cost(p: int) -> int:
+            s = p if p >= 0 else ~p
+            return 0 if is_fact[s] else (1 + depth[s] if rule_counts[s] else 1)
+
+        premises = array('i', kb.premises)
+        for i in range(kb.clause_count):
+            start, end = offsets[i], offsets[i + 1]
+            if end - start > 1:
+                premises[start:end] = array('i', sorted(premises[start:end], key=premise_key))
+
+        head_offsets, head_clauses = kb.head_index()
+        head_clauses = array('i', head_clauses)
+        for s in range(len(names)):
+            start, end = head_offsets[s], head_offsets[s + 1]
+            if end - start > 1:
+                head_clauses[start:end] = array('i', sorted(
+                    head_clauses[start:end],
+                    key=lambda i: sum(cost(p) for p in premises[offsets[i]:offsets[i + 1]])))
+        return head_offsets, head_clauses, premises
+
+    @staticmethod
+    def _check_compact(kb: CompactKnowledgeBase, query: str,
+                       rules: Optional[tuple[array, array, array]] = None) -> tuple[bool, list[str]]:
+        """
+        Same search as check_entailment over interned ids, naming only the proof
+
+        rules optionally replaces the (head offsets, head clause ids, premises)
+        searched, e.g. by cost_ordered_rules; by default rules are tried in
+        clause order with premises sorted by name.
+        """
+        if rules is None:
+            rules = kb.head_index() + (kb.sorted_premises(),)
+        head_offsets, head_clauses, premises = rules
+        names, offsets = kb.names, kb.offsets
+        inferred = OrderedDict()
+        goals = bytearray(len(names))
+
+        # Frames [goal, position in head_clauses, premise position], as in check_entailment
+        frames = []
+        goal, result = kb.ids.get(query), None
+        if goal is None:
+            return False, []
+        while True:
+            if goal is not None:
+                if kb.is_fact[goal]:
                     inferred[goal] = None
-                return True
+                    result = True
+                elif goals[goal]:
+                    result = False
+                else:
+                    goals[goal] = 1
+                    k = head_offsets[goal]
+                    frames.append([goal, k, offsets[head_clauses[k]] if k < head_offsets[goal + 1] else 0])
+                goal = None
 
-            # Check for cycles
-            if goal in goals:
-                return False
+            if not frames:
+                return result, [names[s] for s in inferred]
 
-            goals.add(goal)
+            frame = frames[-1]
+            head, k, j = frame
+            if result is not None:
+                if result:
+                    j += 1
+                else:
+                    k += 1
+                    j = offsets[head_clauses[k]] if k < head_offsets[head + 1] else 0
+                frame[1], frame[2] = k, j
+                result = None
 
-            # Sort clauses by conclusion to ensure consistent processing order
-            applicable_clauses = sorted(
-                [clause for clause in kb.clauses if clause.conclusion.name == goal],
-                key=lambda x: x.conclusion.name
-            )
-
-            # Try each rule that could prove goal
-            for clause in applicable_clauses:
-                # Sort premises to ensure consistent order of evaluation
-                sorted_premises = sorted(clause.premises, key=lambda x: x.name)
-                if bc_and(sorted_premises):
-                    if goal not in inferred:
-                        inferred[goal] = None
-                    goals.remove(goal)
-                    return True
+            if k == head_offsets[head + 1]:
+                goals[head] = 0
+                frames.pop()
+                result = False
+            elif j < offsets[head_clauses[k] + 1]:
+                # Negated premises are proven by name, as in check_entailment
+                goal = premises[j] if premises[j] >= 0 else ~premises[j]
+            else:
+                inferred[head] = None
+                goals[head] = 0
+                frames.pop()
+                result = True
 
-            goals.remove(goal)
-            return False
+    @staticmethod
+    def _check_tabled(kb: CompactKnowledgeBase, query: str) -> tuple[bool, list[str]]:
+        """
+        Backward chaining with a table of proven and failed goals
 
-        def bc_and(premises) -> bool:
-            """
-            Tries to prove all premises using AND strategy
-            (all premises must be true)
-            """
-            # Process premises in sorted order for consistency
-            return all(bc_or(premise.name) for premise in premises)
+        A proven goal is final as soon as one of its rules succeeds, since
+        goals still in progress never count as proven. A goal that fails
+        while depending on a goal still in progress only fails tentatively:
+        the open goals form strongly connected components, tracked as in
+        Tarjan's algorithm, and failures are recorded once the whole
+        component is complete. If a goal of the component was proven in the
+        meantime, the tentative failures may be wrong, so they are dropped
+        and the component is searched again (each pass proves a new goal).
+        Every other subgoal is resolved at most once per query.
 
-        result = bc_or(query)
-        return result, list(inferred.keys())
+        Args:
+            kb (CompactKnowledgeBase): The knowledge base
+            query (str): The query to check
+
+        Returns:
+            tuple[bool, list[str]]: (Whether KB entails query,
+                                    List of symbols proven, in order)
+        """
+        head_offsets, head_clauses = kb.head_index()
+        names, offsets, premises = kb.names, kb.offsets, kb.sorted_premises()
+        UNKNOWN, PROVEN, FAILED = BackwardChaining.UNKNOWN, BackwardChaining.PROVEN, \
+            BackwardChaining.FAILED
+        table = bytearray(len(names))
+        inferred = OrderedDict()
+        index, low = {}, {}  # Search numbers of the goals of open components
+        stack = []  # Goals of open components, in search order
+        # Frames [goal, position in head_clauses, premise position, position
+        # of goal in stack] of the goals whose rules are being tried
+        frames = []
+        counter = 0
+
+        def enter(goal: int) -> None:
+            nonlocal counter
+            index[goal] = low[goal] = counter
+            counter += 1
+            k = head_offsets[goal]
+            frames.append([goal, k, offsets[head_clauses[k]] if k < head_offsets[goal + 1] else 0,
+                           len(stack)])
+            stack.append(goal)
+
+        goal, result = kb.ids.get(query), None
+        if goal is None:
+            return False, []
+        while True:
+            if goal is not None:
+                if table[goal] != UNKNOWN:
+                    result = table[goal] == PROVEN
+                elif kb.is_fact[goal]:
+                    table[goal] = PROVEN
+                    inferred[goal] = None
+                    result = True
+                # In progress, or tentatively failed in an open component
+                elif goal in index:
+                    caller = frames[-1][0]
+                    low[caller] = min(low[caller], index[goal])
+                    result = False
+                else:
+                    enter(goal)
+                goal = None
+
+            if not frames:
+                return result, [names[s] for s in inferred]
+
+            frame = frames[-1]
+            head, k, j, position = frame
+            if result is not None:
+                if result:
+                    j += 1
+                else:
+                    k += 1
+                    j = offsets[head_clauses[k]] if k < head_offsets[head + 1] else 0
+                frame[1], frame[2] = k, j
+                result = None
+
+            if k < head_offsets[head + 1] and j < offsets[head_clauses[k] + 1]:
+                # Negated premises are proven by name, as in check_entailment
+                goal = premises[j] if premises[j] >= 0 else ~premises[j]
+                continue
+
+            # Rules exhausted, or all premises of rule k hold
+            proven = k < head_offsets[head + 1]
+            frames.pop()
+            if proven:
+                table[head] = PROVEN
+                inferred[head] = None
+
+            # Not the root of its component: the root completes it
+            if low[head] < index[head]:
+                caller = frames[-1][0]
+                low[caller] = min(low[caller], low[head])
+                result = proven
+                continue
+
+            component = stack[position:]
+            del stack[position:]
+            for s in component:
+                del index[s], low[s]
+            if proven or not any(table[s] == PROVEN for s in component):
+                if not proven:
+                    for s in component:
+                        table[s] = FAILED
+                result = proven
+            else:
+                enter(head)
+
+    @staticmethod
+    def _provable_symbols(kb: KnowledgeBase) -> set[str]:
+        """Computes the closure of the KB under its rules, reading premises by name"""
+        if isinstance(kb, CompactKnowledgeBase):
+            return BackwardChaining._provable_compact(kb)
+
+        waiting = {}
+        count = []
+        for i, clause in enumerate(kb.clauses):
+            names = {premise.name for premise in clause.premises}
+            count.append(len(names))
+            for name in names:
+                waiting.setdefault(name, []).append(i)
+
+        provable = set(kb.facts)
+        agenda = list(kb.facts)
+        while agenda:
+            for i in waiting.pop(agenda.pop(), ()):
+                count[i] -= 1
+                if count[i] == 0 and kb.clauses[i].conclusion.name not in provable:
+                    provable.add(kb.clauses[i].conclusion.name)
+                    agenda.append(kb.clauses[i].conclusion.name)
+        return provable
+
+    @staticmethod
+    def _provable_compact(kb: CompactKnowledgeBase) -> set[str]:
+        """_provable_symbols over interned ids"""
+        offsets, premises = kb.offsets, kb.premises
+        count = array('i', [0]) * kb.clause_count
+        waiting = {}
+        for i in range(kb.clause_count):
+            distinct = {p if p >= 0 else ~p for p in premises[offsets[i]:offsets[i + 1]]}
+            count[i] = len(distinct)
+            for p in distinct:
+                waiting.setdefault(p, []).append(i)
+
+        provable = bytearray(kb.is_fact)
+        agenda = list(kb.facts)
+        while agenda:
+            for i in waiting.pop(agenda.pop(), ()):
+                count[i] -= 1
+                conclusion = kb.conclusions[i]
+                if count[i] == 0 and not provable[conclusion]:
+                    provable[conclusion] = 1
+                    agenda.append(conclusion)
+        return {name for name, flag in zip(kb.names, provable) if flag}
 
 
 """
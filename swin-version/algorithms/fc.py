@@ -1,13 +1,71 @@
 # /algorithms/fc.py
+from array import array
 from collections import deque
-from data.knowledge_base import KnowledgeBase
+from typing import Optional
+from data.knowledge_base import KnowledgeBase, CompactKnowledgeBase, Clause
+from algorithms.parallel_fc import ParallelForwardChaining
+from algorithms.sparse_fc import SparseForwardChaining
 
 
 class ForwardChaining:
     """Implementation of the Forward Chaining algorithm"""
 
+    # Supported strategies: derive the whole closure, only what the query needs,
+    # the whole closure level by level on a sparse matrix (needs numpy/scipy),
+    # or the whole closure with independent parts in worker processes
+    MODES = ("saturate", "goal", "sparse", "parallel")
+
     @staticmethod
-    def check_entailment(kb: KnowledgeBase, query: str) -> tuple[bool, list[str]]:
+    def build_index(kb: KnowledgeBase) -> tuple[dict[str, list[int]], array]:
+        """
+        Builds the premise occurrence index of a knowledge base
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+
+        Returns:
+            tuple[dict[str, list[int]], array]: (Map from each symbol to the ids
+                of the clauses using it as a premise, once per occurrence and in
+                clause order; number of premises of each clause)
+        """
+        occurrences = {}
+        count = array('i', (len(clause.premises) for clause in kb.clauses))
+        for i, clause in enumerate(kb.clauses):
+            for premise in clause.premises:
+                if not premise.negative:
+                    occurrences.setdefault(premise.name, []).append(i)
+        return occurrences, count
+
+    @staticmethod
+    def relevant_clauses(kb: KnowledgeBase, query: str) -> list[Clause]:
+        """
+        Finds the backward dependency cone of a query
+
+        The cone is walked through the KB's maintained head index (by_head),
+        so only the clauses in it are visited. A CompactKnowledgeBase's cone
+        is found over its head_index() by _relevant_compact instead.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            query (str): The query symbol
+
+        Returns:
+            list[Clause]: The clauses whose conclusion the query transitively
+                          depends on, in the order they are reached
+        """
+        relevant, visited, stack = [], {query}, [query]
+        while stack:
+            for clause, premises in kb.by_head.get(stack.pop(), ()):
+                relevant.append(clause)
+                for name in premises:
+                    if name not in visited:
+                        visited.add(name)
+                        stack.append(name)
+        return relevant
+
+    @staticmethod
+    def check_entailment(kb: KnowledgeBase, query: str, mode: str = "saturate",
+                         workers: Optional[int] = None) -> tuple[bool, list[str]]:
         """
         Checks if KB entails query using forward chaining
 
@@ -16,17 +74,62 @@ class ForwardChaining:
         1. Query is derived (entailed)
         2. No new facts can be derived (not entailed)
 
+        Each symbol taken from the agenda only visits the clauses that use it
+        as a premise, so the whole run is linear in the size of the KB. If the
+        KB maintains a materialized closure, it is returned directly.
+
+        In "goal" mode only the clauses in the query's dependency cone take
+        part, and chaining stops as soon as the query is derived; a
+        materialized closure is then cut off after the query and limited to
+        the symbols of the cone, or chained over the cone as usual if it
+        lacks the query. The "sparse"
+        mode runs SparseForwardChaining, which lists the derived symbols
+        level by level, and the "parallel" mode ParallelForwardChaining.
+
+        A CompactKnowledgeBase is chained directly over its integer columns.
+
         Args:
             kb (KnowledgeBase): The knowledge base
             query (str): The query to check
+            mode (str): Strategy, one of ForwardChaining.MODES
+            workers (Optional[int]): Process count for the parallel mode
+                                     (defaults to the number of CPUs)
 
         Returns:
             tuple[bool, list[str]]: (Whether KB entails query,
                                     List of symbols derived in order)
         """
+        if mode not in ForwardChaining.MODES:
+            raise ValueError(f"Unknown forward chaining mode: {mode}")
+
+        if mode == "sparse":
+            return SparseForwardChaining.check_entailment(kb, query)
+        if mode == "parallel":
+            return ParallelForwardChaining.check_entailment(kb, query, workers)
+
+        if isinstance(kb, CompactKnowledgeBase):
+            return ForwardChaining._check_compact(kb, query, mode)
+
+        if kb.materialized:
+            if mode != "goal":
+                return query in kb.closure, list(kb.closure)
+            if query in kb.closure:
+                cone = {query}
+                for clause in ForwardChaining.relevant_clauses(kb, query):
+                    cone.update(p.name for p in clause.premises if not p.negative)
+                inferred_order = []
+                for symbol in kb.closure:
+                    if symbol in cone:
+                        inferred_order.append(symbol)
+                        if symbol == query:
+                            return True, inferred_order
+
+        if mode == "goal":
+            return ForwardChaining._check_goal(kb, query)
+
         # Track how many premises remain unknown for each clause
-        count = {i: len(clause.premises)
-                 for i, clause in enumerate(kb.clauses)}
+        occurrences, count = ForwardChaining.build_index(kb)
+        clauses = kb.clauses
 
         # Start with known facts
         agenda = deque(kb.facts)
@@ -36,20 +139,143 @@ class ForwardChaining:
         while agenda:
             p = agenda.popleft()
 
-            # Check each clause
-            for i, clause in enumerate(kb.clauses):
-                if count[i] == 0:  # Skip if clause already triggered
-                    continue
-
-                # Check if p appears in premises
-                for premise in clause.premises:
-                    if premise.name == p and not premise.negative:
-                        count[i] -= 1
-                        if count[i] == 0:  # All premises are known
-                            conclusion = clause.conclusion.name
-                            if conclusion not in inferred:
-                                agenda.append(conclusion)
-                                inferred.add(conclusion)
-                                inferred_order.append(conclusion)
+            # Check each clause where p appears in the premises
+            for i in occurrences.get(p, ()):
+                count[i] -= 1
+                if count[i] == 0:  # All premises are known
+                    conclusion = clauses[i].conclusion.name
+                    if conclusion not in inferred:
+                        agenda.append(conclusion)
+                        inferred.add(conclusion)
+                        inferred_order.append(conclusion)
 
         return query in inferred, inferred_order
+
+    @staticmethod
+    def check_entailments(kb: KnowledgeBase, queries: list[str], mode: str = "saturate",
+                          workers: Optional[int] = None) -> list[tuple[bool, list[str]]]:
+        """
+        Answers many queries from a single forward chaining closure
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            queries (list[str]): The queries to check
+            mode (str): Strategy, one of ForwardChaining.MODES; "goal" runs
+                        one goal-directed search per query
+            workers (Optional[int]): Process count for the parallel mode
+
+        Returns:
+            list[tuple[bool, list[str]]]: check_entailment's result for each
+                                          query (all sharing one order list)
+        """
+        if mode == "goal":
+            return [ForwardChaining.check_entailment(kb, query, mode) for query in queries]
+
+        _, inferred_order = ForwardChaining.check_entailment(kb, None, mode, workers)
+        inferred = set(inferred_order)
+        return [(query in inferred, inferred_order) for query in queries]
+
+    @staticmethod
+    def _check_goal(kb: KnowledgeBase, query: str) -> tuple[bool, list[str]]:
+        """Forward chains over the query's dependency cone, stopping at the query"""
+        clauses = ForwardChaining.relevant_clauses(kb, query)
+
+        occurrences = {}
+        count = array('i', (len(clause.premises) for clause in clauses))
+        for i, clause in enumerate(clauses):
+            for premise in clause.premises:
+                if not premise.negative:
+                    occurrences.setdefault(premise.name, []).append(i)
+
+        # Start with the known facts inside the cone
+        facts = [fact for fact in kb.facts if fact in occurrences or fact == query]
+        agenda = deque(facts)
+        inferred = set(facts)
+        inferred_order = list(facts)
+        if query in inferred:
+            return True, inferred_order
+
+        while agenda:
+            p = agenda.popleft()
+
+            for i in occurrences.get(p, ()):
+                count[i] -= 1
+                if count[i] == 0:
+                    conclusion = clauses[i].conclusion.name
+                    if conclusion not in inferred:
+                        agenda.append(conclusion)
+                        inferred.add(conclusion)
+                        inferred_order.append(conclusion)
+                        if conclusion == query:
+                            return True, inferred_order
+
+        return False, inferred_order
+
+    @staticmethod
+    def _check_compact(kb: CompactKnowledgeBase, query: str, mode: str) -> tuple[bool, list[str]]:
+        """Forward chains over interned ids, naming only the derived symbols"""
+        occurrence_offsets, occurrence_clauses = kb.occurrence_index()
+        offsets, conclusions = kb.offsets, kb.conclusions
+        target = kb.ids.get(query, -1)
+        count = array('i', (offsets[i + 1] - offsets[i] for i in range(kb.clause_count)))
+        facts = kb.facts
+
+        if mode == "goal":
+            # Clauses outside the query's cone never fire
+            cone = ForwardChaining._relevant_compact(kb, target)
+            for i in range(kb.clause_count):
+                if not cone[i]:
+                    count[i] = -1
+            used = bytearray(len(kb.names))
+            for i in range(kb.clause_count):
+                if cone[i]:
+                    for p in kb.premises[offsets[i]:offsets[i + 1]]:
+                        if p >= 0:
+                            used[p] = 1
+            facts = [fact for fact in facts if used[fact] or fact == target]
+            if target >= 0 and kb.is_fact[target]:
+                return True, [kb.names[fact] for fact in facts]
+
+        inferred = bytearray(len(kb.names))
+        for fact in facts:
+            inferred[fact] = 1
+        agenda = deque(facts)
+        inferred_order = list(facts)
+
+        while agenda:
+            p = agenda.popleft()
+            for i in occurrence_clauses[occurrence_offsets[p]:occurrence_offsets[p + 1]]:
+                count[i] -= 1
+                if count[i] == 0:
+                    conclusion = conclusions[i]
+                    if not inferred[conclusion]:
+                        agenda.append(conclusion)
+                        inferred[conclusion] = 1
+                        inferred_order.append(conclusion)
+                        if mode == "goal" and conclusion == target:
+                            return True, [kb.names[s] for s in inferred_order]
+
+        entailed = target >= 0 and bool(inferred[target])
+        return entailed, [kb.names[s] for s in inferred_order]
+
+    @staticmethod
+    def _relevant_compact(kb: CompactKnowledgeBase, target: int) -> bytearray:
+        """Marks the clauses in the backward dependency cone of a symbol id"""
+        head_offsets, head_clauses = kb.head_index()
+        cone = bytearray(kb.clause_count)
+        if target < 0:
+            return cone
+
+        visited = bytearray(len(kb.names))
+        visited[target] = 1
+        stack = [target]
+        while stack:
+            s = stack.pop()
+            for i in head_clauses[head_offsets[s]:head_offsets[s + 1]]:
+                cone[i] = 1
+                for p in kb.premises[kb.offsets[i]:kb.offsets[i + 1]]:
+                    p = p if p >= 0 else ~p
+                    if not visited[p]:
+                        visited[p] = 1
+                        stack.append(p)
+        return cone
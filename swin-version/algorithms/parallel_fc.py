@@ -0,0 +1,287 @@
+# /algorithms/parallel_fc.py
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from data.knowledge_base import KnowledgeBase, CompactKnowledgeBase
+
+
+def _chain_part(part: tuple[array, array, array, set]) -> list[int]:
+    """
+    Forward chains one part of a stage in a worker process
+
+    Args:
+        part: (offsets, premises, conclusions, known) of the part's clauses in
+              CSR form, where known holds the premises already derived by
+              earlier stages; premises outside it and the part are false
+
+    Returns:
+        list[int]: The symbols derived by the part, in derivation order
+    """
+    offsets, premises, conclusions, known = part
+    occurrences = {}
+    count = array('i', [0]) * len(conclusions)
+    for i in range(len(conclusions)):
+        for p in premises[offsets[i]:offsets[i + 1]]:
+            if p not in known:
+                count[i] += 1
+                occurrences.setdefault(p, []).append(i)
+
+    derived, order = set(), []
+    agenda = deque()
+    for i in range(len(conclusions)):
+        if count[i] == 0 and conclusions[i] not in derived:
+            derived.add(conclusions[i])
+            order.append(conclusions[i])
+            agenda.append(conclusions[i])
+
+    while agenda:
+        for i in occurrences.get(agenda.popleft(), ()):
+            count[i] -= 1
+            if count[i] == 0 and conclusions[i] not in derived:
+                derived.add(conclusions[i])
+                order.append(conclusions[i])
+                agenda.append(conclusions[i])
+    return order
+
+
+class ParallelForwardChaining:
+    """
+    Forward chaining split over a pool of worker processes
+
+    The symbol dependency graph (premise -> conclusion) is condensed into
+    its strongly connected components. When the KB falls apart into several
+    independent modules (weakly connected components), each module is
+    chained by one worker in a single stage. Otherwise the components are
+    layered into strata by longest path in the condensation DAG: components
+    of one stratum never depend on each other, so each stratum is one stage
+    whose components are chained concurrently, seeded with the boundary
+    symbols derived by the earlier stages. Consecutive strata too narrow to
+    pay for a round trip to the pool are merged into one stage chained in
+    this process, so chain-shaped KBs do not take one stage per link.
+    """
+
+    # Below this many clauses process start-up costs more than the chaining
+    PARALLEL_MIN_CLAUSES = 20000
+
+    # A stratum is a stage of its own only with at least this many units and
+    # clauses; runs of narrower ones are merged and chained in this process
+    STAGE_MIN_UNITS = 2
+    STAGE_MIN_CLAUSES = 2000
+
+    # Parts per worker in each stage, to balance uneven parts
+    PARTS_PER_WORKER = 4
+
+    @staticmethod
+    def check_entailment(kb: KnowledgeBase, query: str,
+                         workers: Optional[int] = None) -> tuple[bool, list[str]]:
+        """
+        Checks if KB entails query, chaining independent parts in parallel
+
+        Args:
+            kb (KnowledgeBase): The knowledge base (or a CompactKnowledgeBase)
+            query (str): The query to check
+            workers (Optional[int]): Process count (defaults to the number of CPUs)
+
+        Returns:
+            tuple[bool, list[str]]: (Whether KB entails query, List of derived
+                symbols; the same symbols as the serial ForwardChaining, listed
+                stage by stage and in derivation order within each part)
+        """
+        compact = kb if isinstance(kb, CompactKnowledgeBase) else \
+            CompactKnowledgeBase.from_knowledge_base(kb)
+        workers = workers or os.cpu_count() or 1
+
+        # Clauses with a negated premise never fire and take no part
+        offsets, premises = compact.offsets, compact.premises
+        if min(premises, default=0) >= 0:
+            live = list(range(compact.clause_count))
+        else:
+            live = [i for i in range(compact.clause_count)
+                    if min(premises[offsets[i]:offsets[i + 1]], default=0) >= 0]
+
+        inferred = bytearray(len(compact.names))
+        order = []
+        pool = None
+        if workers > 1 and len(live) >= ParallelForwardChaining.PARALLEL_MIN_CLAUSES:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            stages = ParallelForwardChaining.plan_stages(compact, live)
+        else:
+            # Not worth a pool: chain everything as one part in this process
+            stages = [[live]]
+        try:
+            for units in stages:
+                parts = ParallelForwardChaining._parts(
+                    compact, units, inferred, workers * ParallelForwardChaining.PARTS_PER_WORKER)
+                results = pool.map(_chain_part, parts) if pool and len(parts) > 1 \
+                    else map(_chain_part, parts)
+                for derived in results:
+                    for symbol in derived:
+                        inferred[symbol] = 1
+                    order.extend(derived)
+        finally:
+            if pool:
+                pool.shutdown()
+
+        target = compact.ids.get(query)
+        entailed = target is not None and bool(inferred[target])
+        return entailed, [compact.names[s] for s in order]
+
+    @staticmethod
+    def plan_stages(compact: CompactKnowledgeBase, live: list[int]) -> list[list[list[int]]]:
+        """
+        Groups the clauses into stages of independent units
+
+        Args:
+            compact (CompactKnowledgeBase): The knowledge base
+            live (list[int]): Ids of the clauses taking part
+
+        Returns:
+            list[list[list[int]]]: For each stage in evaluation order, its
+                units as lists of clause ids; units of a stage share no
+                symbol they could derive for each other, and a stage with
+                a single unit is meant to be chained in this process
+        """
+        offsets, premises, conclusions = compact.offsets, compact.premises, compact.conclusions
+
+        # Weakly connected modules, by union-find over the clause edges
+        parent = list(range(len(compact.names)))
+
+        def find(s: int) -> int:
+            while parent[s] != s:
+                parent[s] = parent[parent[s]]
+                s = parent[s]
+            return s
+
+        for i in live:
+            root = find(conclusions[i])
+            for p in premises[offsets[i]:offsets[i + 1]]:
+                parent[find(p)] = root
+
+        modules = {}
+        for i in live:
+            modules.setdefault(find(conclusions[i]), []).append(i)
+        if len(modules) > 1:
+            return [list(modules.values())]
+
+        # A single module: layer its components by longest path from the sources
+        component, topological = ParallelForwardChaining.strongly_connected_components(compact, live)
+        stratum = [0] * len(topological)
+        users = {}
+        for i in live:
+            for p in premises[offsets[i]:offsets[i + 1]]:
+                users.setdefault(component[p], []).append(component[conclusions[i]])
+        for c in topological:
+            for d in users.get(c, ()):
+                if d != c and stratum[d] <= stratum[c]:
+                    stratum[d] = stratum[c] + 1
+
+        layers = {}
+        for i in live:
+            c = component[conclusions[i]]
+            layers.setdefault(stratum[c], {}).setdefault(c, []).append(i)
+
+        # Merge runs of narrow strata into single units
+        stages, narrow = [], []
+        for level in sorted(layers):
+            units = list(layers[level].values())
+            if len(units) >= ParallelForwardChaining.STAGE_MIN_UNITS \
+                    and sum(map(len, units)) >= ParallelForwardChaining.STAGE_MIN_CLAUSES:
+                if narrow:
+                    stages.append([narrow])
+                    narrow = []
+                stages.append(units)
+            else:
+                for unit in units:
+                    narrow.extend(unit)
+        if narrow:
+            stages.append([narrow])
+        return stages
+
+    @staticmethod
+    def strongly_connected_components(compact: CompactKnowledgeBase,
+                                      live: list[int]) -> tuple[list[int], list[int]]:
+        """
+        Finds the strongly connected components of the symbol dependency graph
+
+        Uses an iterative Tarjan search, so deep dependency chains do not hit
+        the recursion limit.
+
+        Returns:
+            tuple[list[int], list[int]]: (Component of each symbol, components
+                in topological order, every premise's before its conclusion's)
+        """
+        offsets, premises, conclusions = compact.offsets, compact.premises, compact.conclusions
+        successors = [[] for _ in compact.names]
+        for i in live:
+            for p in premises[offsets[i]:offsets[i + 1]]:
+                successors[p].append(conclusions[i])
+
+        index = [-1] * len(compact.names)
+        low = [0] * len(compact.names)
+        component = [-1] * len(compact.names)
+        on_stack = bytearray(len(compact.names))
+        stack, emitted, counter = [], 0, 0
+
+        for root in range(len(compact.names)):
+            if index[root] >= 0:
+                continue
+            work = [(root, 0)]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            while work:
+                s, k = work[-1]
+                if k < len(successors[s]):
+                    work[-1] = (s, k + 1)
+                    t = successors[s][k]
+                    if index[t] < 0:
+                        index[t] = low[t] = counter
+                        counter += 1
+                        stack.append(t)
+                        on_stack[t] = 1
+                        work.append((t, 0))
+                    elif on_stack[t]:
+                        low[s] = min(low[s], index[t])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[s])
+                if low[s] == index[s]:
+                    while True:
+                        t = stack.pop()
+                        on_stack[t] = 0
+                        component[t] = emitted
+                        if t == s:
+                            break
+                    emitted += 1
+
+        # Tarjan emits every component after all the components it reaches
+        return component, list(range(emitted - 1, -1, -1))
+
+    @staticmethod
+    def _parts(compact: CompactKnowledgeBase, units: list[list[int]], inferred: bytearray,
+               part_count: int) -> list[tuple[array, array, array, set]]:
+        """Packs the units of a stage into at most part_count balanced CSR parts"""
+        bins = [[] for _ in range(min(part_count, len(units)))]
+        sizes = [0] * len(bins)
+        for unit in sorted(units, key=len, reverse=True):
+            smallest = sizes.index(min(sizes))
+            bins[smallest].extend(unit)
+            sizes[smallest] += len(unit)
+
+        parts = []
+        for clause_ids in bins:
+            clause_ids.sort()
+            offsets, premises = array('i', [0]), array('i')
+            for i in clause_ids:
+                premises.extend(compact.premises[compact.offsets[i]:compact.offsets[i + 1]])
+                offsets.append(len(premises))
+            conclusions = array('i', (compact.conclusions[i] for i in clause_ids))
+            known = {p for p in set(premises) if inferred[p]}
+            parts.append((offsets, premises, conclusions, known))
+        return parts
@@ -0,0 +1,94 @@
+# /algorithms/sparse_fc.py
+from data.knowledge_base import KnowledgeBase, CompactKnowledgeBase
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # Optional dependencies, only needed by this engine
+    np = None
+    sparse = None
+
+
+class SparseForwardChaining:
+    """
+    Level-synchronous forward chaining over a sparse premise matrix
+
+    The Horn program is a symbol x clause matrix in CSR form whose entry
+    (s, i) counts the occurrences of s among the premises of clause i. Each
+    level multiplies the sparse indicator vector of the newly derived
+    symbols with the matrix, which yields the premise count decrement of
+    exactly the clauses they touch, and then gathers the heads of the
+    clauses whose count reached zero. All per-premise work runs inside
+    NumPy/SciPy.
+
+    Requires numpy and scipy (see AVAILABLE).
+    """
+
+    # Whether the optional numpy and scipy dependencies are installed
+    AVAILABLE = np is not None
+
+    @staticmethod
+    def check_entailment(kb: KnowledgeBase, query: str) -> tuple[bool, list[str]]:
+        """
+        Checks if KB entails query using level-synchronous forward chaining
+
+        Args:
+            kb (KnowledgeBase): The knowledge base (or a CompactKnowledgeBase)
+            query (str): The query to check
+
+        Returns:
+            tuple[bool, list[str]]: (Whether KB entails query, List of symbols
+                derived level by level: the facts first, then every symbol whose
+                clause fired in level k before those of level k + 1; within a
+                level symbols follow the order of their first firing clause)
+
+        Raises:
+            ImportError: If numpy or scipy is not installed
+        """
+        if not SparseForwardChaining.AVAILABLE:
+            raise ImportError("Sparse forward chaining requires numpy and scipy")
+
+        compact = kb if isinstance(kb, CompactKnowledgeBase) else \
+            CompactKnowledgeBase.from_knowledge_base(kb)
+        symbol_count, clause_count = len(compact.names), compact.clause_count
+
+        # Negated premises count towards a clause but are never derived
+        offsets = np.frombuffer(compact.offsets, dtype=np.intc).astype(np.int64)
+        remaining = np.diff(offsets)
+        premises = np.frombuffer(compact.premises, dtype=np.intc)
+        owners = np.repeat(np.arange(clause_count), remaining)
+        positive = premises >= 0
+        # Repeated premises are summed into one entry by the COO conversion
+        matrix = sparse.csr_matrix(
+            (np.ones(int(positive.sum()), dtype=np.int64),
+             (premises[positive], owners[positive])),
+            shape=(symbol_count, clause_count))
+        conclusions = np.frombuffer(compact.conclusions, dtype=np.intc)
+
+        inferred = np.zeros(symbol_count, dtype=bool)
+        frontier = np.frombuffer(compact.facts, dtype=np.intc).astype(np.int64)
+        inferred[frontier] = True
+        levels = [frontier]
+
+        while len(frontier):
+            indicator = sparse.csr_matrix(
+                (np.ones(len(frontier), dtype=np.int64),
+                 (np.zeros(len(frontier), dtype=np.int64), frontier)),
+                shape=(1, symbol_count))
+            touched = indicator @ matrix
+            clauses = touched.indices
+            remaining[clauses] -= touched.data
+
+            # Fired clauses in clause order, keeping the first one per new head
+            fired = np.sort(clauses[remaining[clauses] == 0])
+            heads = conclusions[fired]
+            heads = heads[~inferred[heads]]
+            _, first = np.unique(heads, return_index=True)
+            frontier = heads[np.sort(first)].astype(np.int64)
+
+            inferred[frontier] = True
+            levels.append(frontier)
+
+        target = compact.ids.get(query)
+        entailed = target is not None and bool(inferred[target])
+        return entailed, [compact.names[s] for level in levels for s in level.tolist()]
@@ -1,29 +1,109 @@
 # /algorithms/tt.py
-from itertools import product
-from data.knowledge_base import KnowledgeBase, Clause, Literal
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product, repeat
+from typing import Optional
+from data.knowledge_base import KnowledgeBase, CompactKnowledgeBase, Clause, Literal
+
+
+# Per-process state of parallel truth table workers, set up by _init_worker
+_worker = {}
+
+
+def _init_worker(kb: KnowledgeBase, symbols: list, query: str, first_failed) -> None:
+    """Compiles the KB once in each worker process"""
+    _worker.update(kb_holds=TruthTable.compile_kb(kb, symbols),
+                   query_index=symbols.index(query),
+                   symbol_count=len(symbols), first_failed=first_failed)
+
+
+def _check_shard(shard: int, prefix_length: int) -> Optional[tuple[bool, int]]:
+    """
+    Enumerates every model whose first prefix_length values spell out 'shard'
+
+    Returns:
+        Optional[tuple[bool, int]]: (False, KB models up to the counterexample) if
+        one is found, (True, KB models in the shard) otherwise, or None when an
+        earlier shard already holds a counterexample and this one was abandoned
+    """
+    kb_holds, query_index = _worker["kb_holds"], _worker["query_index"]
+    first_failed = _worker["first_failed"]
+    prefix = tuple(bool((shard >> (prefix_length - 1 - i)) & 1) for i in range(prefix_length))
+
+    models_count = 0
+    suffixes = product((False, True), repeat=_worker["symbol_count"] - prefix_length)
+    for checked, suffix in enumerate(suffixes):
+        if not checked & TruthTable.CANCEL_CHECK_MASK and first_failed.value < shard:
+            return None
+
+        values = prefix + suffix
+        if kb_holds(values):
+            models_count += 1
+            if not values[query_index]:
+                with first_failed.get_lock():
+                    first_failed.value = min(first_failed.value, shard)
+                return False, models_count
+
+    return True, models_count
 
 
 class TruthTable:
     """Implementation of the Truth Table checking algorithm"""
 
+    # Supported model enumeration strategies
+    MODES = ("enumerate", "compiled", "parallel", "prune", "gray")
+
+    # Strategies that run on a CompactKnowledgeBase
+    COMPACT_MODES = ("enumerate", "compiled", "parallel")
+
+    # Below this many symbols process start-up costs more than the enumeration
+    PARALLEL_MIN_SYMBOLS = 12
+
+    # Parallel workers poll the cancel flag every CANCEL_CHECK_MASK + 1 models
+    CANCEL_CHECK_MASK = 0xFFF
+
     @staticmethod
-    def check_entailment(kb: KnowledgeBase, query: str) -> tuple[bool, int]:
+    def check_entailment(kb: KnowledgeBase, query: str, mode: str = "enumerate",
+                         workers: Optional[int] = None) -> tuple[bool, int]:
         """
         Checks if the knowledge base entails the query using truth table method
 
         Works by checking all possible truth assignments. KB entails query if
         query is true in all models where KB is true.
 
+        A CompactKnowledgeBase is compiled straight from its integer columns;
+        it supports the modes in TruthTable.COMPACT_MODES.
+
         Args:
             kb (KnowledgeBase): The knowledge base
             query (str): The query to check
+            mode (str): Enumeration strategy, one of TruthTable.MODES
+            workers (Optional[int]): Process count for the parallel mode
+                                     (defaults to the number of CPUs)
 
         Returns:
             tuple[bool, int]: (Whether KB entails query, Number of models where KB is true)
         """
+        if mode not in TruthTable.MODES:
+            raise ValueError(f"Unknown truth table mode: {mode}")
+        if isinstance(kb, CompactKnowledgeBase):
+            if mode not in TruthTable.COMPACT_MODES:
+                raise ValueError(f"Truth table mode {mode} needs a KnowledgeBase")
+            mode = "compiled" if mode == "enumerate" else mode
+
         symbols = list(kb.symbols)
         models_count = 0
 
+        if mode == "parallel" and len(symbols) >= TruthTable.PARALLEL_MIN_SYMBOLS:
+            return TruthTable._check_parallel(kb, symbols, query, workers)
+        if mode in ("compiled", "parallel"):
+            return TruthTable._check_compiled(kb, symbols, query)
+        if mode == "prune":
+            return TruthTable._check_pruned(kb, symbols, query)
+        if mode == "gray":
+            return TruthTable._check_gray(kb, symbols, query)
+
         # Generate all possible truth assignments
         for values in product([False, True], repeat=len(symbols)):
             model = dict(zip(symbols, values))
@@ -37,6 +117,246 @@ class TruthTable:
 
         return True, models_count
 
+    @staticmethod
+    def check_entailments(kb: KnowledgeBase, queries: list[str], mode: str = "enumerate",
+                          workers: Optional[int] = None) -> list[tuple[bool, int]]:
+        """
+        Answers many queries from a single pass over the models
+
+        In the enumerate and compiled modes the models are generated once and
+        every query is checked against each model of the KB, so the results
+        equal those of separate check_entailment calls. Other modes answer
+        the queries one by one.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base
+            queries (list[str]): The queries to check
+            mode (str): Enumeration strategy, one of TruthTable.MODES
+            workers (Optional[int]): Process count for the parallel mode
+
+        Returns:
+            list[tuple[bool, int]]: check_entailment's result for each query
+        """
+        if mode not in ("enumerate", "compiled"):
+            return [TruthTable.check_entailment(kb, query, mode, workers) for query in queries]
+
+        symbols = list(kb.symbols)
+        kb_holds = TruthTable.compile_kb(kb, symbols)
+        open_indices = list(dict.fromkeys(symbols.index(query) for query in queries))
+        failed = {}  # Symbol index -> KB models seen up to its first counterexample
+        models_count = 0
+
+        for values in product((False, True), repeat=len(symbols)):
+            if kb_holds(values):
+                models_count += 1
+                for index in [i for i in open_indices if not values[i]]:
+                    failed[index] = models_count
+                    open_indices.remove(index)
+                if not open_indices:
+                    break
+
+        return [(False, failed[index]) if index in failed else (True, models_count)
+                for index in (symbols.index(query) for query in queries)]
+
+    @staticmethod
+    def _check_compiled(kb: KnowledgeBase, symbols: list, query: str) -> tuple[bool, int]:
+        """Enumerates all models against the compiled KB predicate"""
+        kb_holds = TruthTable.compile_kb(kb, symbols)
+        query_index = symbols.index(query)
+        models_count = 0
+
+        for values in product((False, True), repeat=len(symbols)):
+            if kb_holds(values):
+                models_count += 1
+                if not values[query_index]:
+                    return False, models_count
+
+        return True, models_count
+
+    @staticmethod
+    def _check_pruned(kb: KnowledgeBase, symbols: list, query: str) -> tuple[bool, int]:
+        """
+        Assigns symbols one at a time and prunes falsified subtrees
+
+        Symbols are ordered by the number of clauses mentioning them, and each
+        clause is checked as soon as its last symbol is assigned. A subtree in
+        which a clause is already false holds no KB models and is skipped.
+        Once every clause and the query are decided, the KB models of the
+        remaining free symbols are credited as a power of two instead of
+        being enumerated. A negative answer reports the KB models seen before
+        the first counterexample in the reordered enumeration.
+        """
+        occurrences = {symbol: 0 for symbol in symbols}
+        for clause in kb.clauses:
+            for name in {clause.conclusion.name, *(p.name for p in clause.premises)}:
+                occurrences[name] += 1
+        order = sorted(symbols, key=lambda symbol: (-occurrences[symbol], symbol))
+        position = {symbol: i for i, symbol in enumerate(order)}
+
+        # checks[d] holds the clauses decided once the first d symbols are assigned
+        checks = [[] for _ in range(len(order) + 1)]
+        decided = position[query] + 1
+        for clause in kb.clauses:
+            depth = 1 + max(position[name] for name in
+                            [clause.conclusion.name, *(p.name for p in clause.premises)])
+            source = f"lambda m: {TruthTable._clause_source(clause, position)}"
+            checks[depth].append(eval(compile(source, "<compiled clause>", "eval")))
+            decided = max(decided, depth)
+
+        query_index = position[query]
+        values = [False] * len(order)
+        models_count = 0
+
+        def visit(depth: int) -> bool:
+            """Explores the subtree below the first 'depth' assignments, False on a counterexample"""
+            nonlocal models_count
+            if not all(check(values) for check in checks[depth]):
+                return True
+
+            if depth == decided:
+                if values[query_index]:
+                    models_count += 1 << (len(order) - depth)
+                    return True
+                # The first model of this subtree is the counterexample
+                models_count += 1
+                return False
+
+            for value in (False, True):
+                values[depth] = value
+                if not visit(depth + 1):
+                    return False
+            return True
+
+        return visit(0), models_count
+
+    @staticmethod
+    def _check_gray(kb: KnowledgeBase, symbols: list, query: str) -> tuple[bool, int]:
+        """
+        Walks the models in Gray-code order with incremental clause checks
+
+        Consecutive models differ in exactly one symbol, so only the clauses
+        mentioning the flipped symbol are re-evaluated. A running count of
+        falsified clauses tells whether the KB holds in the current model.
+        A negative answer reports the KB models seen before the first
+        counterexample in Gray-code order.
+        """
+        position = {symbol: i for i, symbol in enumerate(symbols)}
+        checks = []
+        # Occurrence index from each symbol to the clauses mentioning it
+        occurrences = [[] for _ in symbols]
+        for i, clause in enumerate(kb.clauses):
+            source = f"lambda m: {TruthTable._clause_source(clause, position)}"
+            checks.append(eval(compile(source, "<compiled clause>", "eval")))
+            for name in {clause.conclusion.name, *(p.name for p in clause.premises)}:
+                occurrences[position[name]].append(i)
+
+        query_index = position[query]
+        values = [False] * len(symbols)
+        states = [check(values) for check in checks]
+        falsified = states.count(False)
+        models_count = 0
+
+        step = 0
+        while True:
+            if not falsified:
+                models_count += 1
+                if not values[query_index]:
+                    return False, models_count
+
+            step += 1
+            if step >> len(symbols):
+                return True, models_count
+
+            # Gray code step i flips the bit at the position of i's lowest set bit
+            flipped = (step & -step).bit_length() - 1
+            values[flipped] = not values[flipped]
+            for i in occurrences[flipped]:
+                state = checks[i](values)
+                if state != states[i]:
+                    states[i] = state
+                    falsified += -1 if state else 1
+
+    @staticmethod
+    def _check_parallel(kb: KnowledgeBase, symbols: list, query: str,
+                        workers: Optional[int]) -> tuple[bool, int]:
+        """
+        Spreads the enumeration over a pool of worker processes
+
+        The assignment space is split into shards by fixing the values of the
+        first few symbols. Every worker receives the KB once, compiles it, and
+        enumerates whole shards. A shared 'first failed shard' value lets later
+        shards stop as soon as an earlier one finds a counterexample, while
+        earlier shards still finish so the partial model count matches the
+        serial scan exactly.
+        """
+        workers = workers or os.cpu_count() or 1
+        # Around four shards per worker keeps the load balanced
+        prefix_length = min(len(symbols), (4 * workers - 1).bit_length())
+        shards = 1 << prefix_length
+        first_failed = multiprocessing.Value('i', shards)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(kb, symbols, query, first_failed)) as pool:
+            results = list(pool.map(_check_shard, range(shards), repeat(prefix_length)))
+
+        models_count = 0
+        for result in results:
+            # Abandoned shards (None) only ever follow the first failing shard
+            entailed, count = result
+            models_count += count
+            if not entailed:
+                return False, models_count
+
+        return True, models_count
+
+    @staticmethod
+    def compile_kb(kb: KnowledgeBase, symbols: list):
+        """
+        Compiles the KB into a single predicate over positional models
+
+        The returned function takes a sequence of truth values indexed like
+        'symbols' and evaluates every clause inline. Facts come first and rules
+        are ordered by premise count, so the short-circuiting conjunction
+        rejects most models after a few lookups.
+        """
+        index = {symbol: i for i, symbol in enumerate(symbols)}
+        if isinstance(kb, CompactKnowledgeBase):
+            terms = TruthTable._compact_sources(kb, index)
+        else:
+            terms = [TruthTable._clause_source(clause, index)
+                     for clause in sorted(kb.clauses, key=lambda c: len(c.premises))]
+
+        source = f"def kb_holds(m):\n    return {' and '.join(terms) or 'True'}\n"
+        namespace = {}
+        exec(compile(source, "<compiled kb>", "exec"), namespace)
+        return namespace["kb_holds"]
+
+    @staticmethod
+    def _clause_source(clause: Clause, index: dict) -> str:
+        """Generates a Python boolean expression evaluating clause on model 'm'"""
+        conclusion = f"m[{index[clause.conclusion.name]}]"
+        if not clause.premises:
+            return conclusion
+        premises = " or ".join(f"not m[{index[premise.name]}]" for premise in clause.premises)
+        return f"({premises} or {conclusion})"
+
+    @staticmethod
+    def _compact_sources(kb: CompactKnowledgeBase, index: dict) -> list[str]:
+        """Generates the clause expressions of a compact KB, ordered like compile_kb's"""
+        position = [index[name] for name in kb.names]
+        offsets, premises, conclusions = kb.offsets, kb.premises, kb.conclusions
+        terms = []
+        for i in sorted(range(kb.clause_count), key=lambda i: offsets[i + 1] - offsets[i]):
+            conclusion = f"m[{position[conclusions[i]]}]"
+            if offsets[i] == offsets[i + 1]:
+                terms.append(conclusion)
+                continue
+            # Truth tables read negated premises by name, like _clause_source
+            body = " or ".join(f"not m[{position[p if p >= 0 else ~p]}]"
+                               for p in premises[offsets[i]:offsets[i + 1]])
+            terms.append(f"({body} or {conclusion})")
+        return terms
+
     @staticmethod
     def _evaluate_kb(kb: KnowledgeBase, model: dict) -> bool:
         """Evaluates if KB is true under given model"""
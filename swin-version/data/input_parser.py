@@ -1,6 +1,12 @@
 # /data/input_parser.py
+import codecs
+import mmap
+import re
 from pathlib import Path
-from data.knowledge_base import KnowledgeBase, Clause, Literal, KnowledgeBaseError
+from typing import BinaryIO, Iterable, Iterator, Optional, TextIO, Union
+from data.knowledge_base import (
+    KnowledgeBase, CompactKnowledgeBase, Clause, Literal, KnowledgeBaseError
+)
 
 
 class InputParserError(Exception):
@@ -16,6 +22,13 @@ class FileFormatError(InputParserError):
 class InputParser:
     """Handles parsing of input files into a knowledge base and query"""
 
+    # Characters decoded per step when streaming a file or text stream
+    CHUNK_SIZE = 1 << 20
+
+    # Statement separator and section keywords (whole words only, so symbols
+    # such as TASK or ASKED are left alone)
+    SEPARATOR = re.compile(r';|\b(?:TELL|ASK)\b')
+
     @staticmethod
     def parse_file(filename: str) -> tuple[KnowledgeBase, str]:
         """
@@ -39,96 +52,248 @@ class InputParser:
             InputParserError: For other parsing errors
             KnowledgeBaseError: If knowledge base construction fails
         """
+        kb, queries = InputParser.parse_file_queries(filename)
+        if len(queries) != 1:
+            raise FileFormatError(
+                "Invalid file format: File must contain exactly one TELL and one ASK section")
+        return kb, queries[0]
+
+    @staticmethod
+    def parse_file_queries(filename: str, compact: bool = False
+                           ) -> tuple[Union[KnowledgeBase, CompactKnowledgeBase], list[str]]:
+        """
+        Parses an input file with any number of queries
+
+        The file is memory-mapped and streamed through the parser, so only
+        the knowledge base is built in memory, never a copy of the text.
+        With compact=True the clauses go straight into a
+        CompactKnowledgeBase, without creating Literal or Clause objects.
+
+        Format:
+        TELL
+        [Horn clauses separated by semicolons]
+        ASK
+        [queries separated by semicolons]
+        [further ASK sections...]
+
+        Args:
+            filename (str): Path to the input file
+            compact (bool): Whether to build a CompactKnowledgeBase
+
+        Returns:
+            tuple[Union[KnowledgeBase, CompactKnowledgeBase], list[str]]:
+                The parsed knowledge base and queries in file order
+
+        Raises:
+            FileFormatError: If file format is invalid
+            FileNotFoundError: If file doesn't exist
+            InputParserError: For other parsing errors
+            KnowledgeBaseError: If knowledge base construction fails
+        """
+        file_path = Path(filename)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Error reading file: File not found: {filename}")
+
+        with open(file_path, 'rb') as file:
+            return InputParser._parse_chunks(InputParser._mapped_chunks(file), compact)
+
+    @staticmethod
+    def parse_stream(stream: TextIO, compact: bool = False
+                     ) -> tuple[Union[KnowledgeBase, CompactKnowledgeBase], list[str]]:
+        """
+        Parses the input format from a text stream, reading it in chunks
+
+        Args:
+            stream (TextIO): The stream, e.g. an open file or io.StringIO
+            compact (bool): Whether to build a CompactKnowledgeBase
+
+        Returns:
+            tuple[Union[KnowledgeBase, CompactKnowledgeBase], list[str]]:
+                The parsed knowledge base and queries, as parse_file_queries
+        """
+        chunks = iter(lambda: stream.read(InputParser.CHUNK_SIZE), '')
+        return InputParser._parse_chunks(chunks, compact)
+
+    @staticmethod
+    def parse_string(text: str, compact: bool = False
+                     ) -> tuple[Union[KnowledgeBase, CompactKnowledgeBase], list[str]]:
+        """
+        Parses the input format from a string
+
+        Args:
+            text (str): The TELL and ASK sections
+            compact (bool): Whether to build a CompactKnowledgeBase
+
+        Returns:
+            tuple[Union[KnowledgeBase, CompactKnowledgeBase], list[str]]:
+                The parsed knowledge base and queries, as parse_file_queries
+        """
+        return InputParser._parse_chunks([text], compact)
+
+    @staticmethod
+    def _mapped_chunks(file: BinaryIO) -> Iterator[str]:
+        """Decodes a memory-mapped file chunk by chunk"""
         try:
-            file_path = Path(filename)
-            if not file_path.exists():
-                raise FileNotFoundError(f"File not found: {filename}")
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped
+            return
 
-            with open(file_path, 'r') as file:
-                content = file.read().strip()
+        with mapped:
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            for start in range(0, len(mapped), InputParser.CHUNK_SIZE):
+                yield decoder.decode(mapped[start:start + InputParser.CHUNK_SIZE])
+            yield decoder.decode(b'', final=True)
 
-                # Split into TELL and ASK sections
-                tell_ask = content.split('ASK')
-                if len(tell_ask) != 2:
-                    raise FileFormatError(
-                        "File must contain exactly one TELL and one ASK section")
-
-                tell_section = tell_ask[0].strip()
-                ask_section = tell_ask[1].strip()
-
-                # Validate TELL section
-                if not tell_section.startswith('TELL'):
-                    raise FileFormatError("File must start with TELL")
-
-                # Parse TELL section
-                kb = KnowledgeBase()
-                tell_content = tell_section[4:].strip()
-
-                if tell_content:  # Only process if there's content
-                    clauses = tell_content.split(';')
-
-                    for clause in clauses:
-                        clause = clause.strip()
-                        if not clause:
-                            continue
-
-                        try:
-                            # Parse single fact
-                            if '=>' not in clause:
-                                if any(op in clause for op in ['&', '||', '<=>']):
-                                    raise FileFormatError(
-                                        f"Non-Horn clause detected: {clause}")
-                                kb.add_clause(
-                                    Clause([], Literal(clause.strip())))
-                                continue
-
-                            # Parse implication
-                            parts = clause.split('=>')
-                            if len(parts) != 2:
-                                raise FileFormatError(
-                                    f"Invalid clause format: {clause}")
-
-                            premises_str, conclusion_str = parts[0].strip(
-                            ), parts[1].strip()
-
-                            # Parse premises
-                            premises = []
-                            if '&' in premises_str:
-                                premise_parts = premises_str.split('&')
-                                premises = [Literal(p.strip())
-                                            for p in premise_parts]
-                            else:
-                                premises = [Literal(premises_str)]
-
-                            # Parse conclusion
-                            conclusion = Literal(conclusion_str)
-
-                            kb.add_clause(Clause(premises, conclusion))
-
-                        except KnowledgeBaseError as e:
-                            raise InputParserError(
-                                f"Error in clause '{clause}': {str(e)}")
-
-                # Validate and parse ASK section
-                query = ask_section.strip()
-                if not query:
-                    raise FileFormatError("ASK section cannot be empty")
-                if any(op in query for op in ['&', '=>', '||', '<=>']):
-                    raise FileFormatError(
-                        f"Query must be a single proposition: {query}")
+    @staticmethod
+    def _statements(chunks: Iterable[str]) -> Iterator[tuple[str, Optional[str]]]:
+        """
+        Splits streamed text at separators and section keywords
+
+        Yields:
+            tuple[str, Optional[str]]: (Text up to the next separator, the
+                separator: ';', 'TELL' or 'ASK'; None after the last text)
+        """
+        pending = ''
+        for chunk in chunks:
+            buffer = pending + chunk
+            if 'ASK' not in buffer and 'TELL' not in buffer:
+                # No keyword: only semicolons separate the statements
+                *statements, pending = buffer.split(';')
+                for statement in statements:
+                    yield statement, ';'
+                continue
+
+            start = 0
+            for match in InputParser.SEPARATOR.finditer(buffer):
+                # A keyword at the end of the chunk may go on in the next one
+                if match.end() == len(buffer) and match.group() != ';':
+                    break
+                yield buffer[start:match.start()], match.group()
+                start = match.end()
+            pending = buffer[start:]
+
+        start = 0
+        for match in InputParser.SEPARATOR.finditer(pending):
+            yield pending[start:match.start()], match.group()
+            start = match.end()
+        yield pending[start:], None
+
+    @staticmethod
+    def _parse_chunks(chunks: Iterable[str], compact: bool
+                      ) -> tuple[Union[KnowledgeBase, CompactKnowledgeBase], list[str]]:
+        """
+        Parses streamed text, adding each clause to the KB as soon as it is read
+
+        After the first error the rest of the text is only scanned for an ASK
+        section, because a missing ASK section is reported before any other
+        error.
+        """
+        try:
+            kb = CompactKnowledgeBase() if compact else KnowledgeBase()
+            queries = []
+            section = None  # Becomes 'TELL', then 'ASK'
+            ask_empty = False
+            asked = False
+            error = None
+
+            for text, separator in InputParser._statements(chunks):
+                asked = asked or separator == 'ASK'
+                if error is not None:
+                    continue
+                text = text.strip()
 
-                # Validate query is a symbol in the knowledge base
-                if query not in kb.symbols:
-                    raise InputParserError(
-                        f"Query symbol '{query}' not found in knowledge base")
+                try:
+                    # Validate TELL section
+                    if section is None:
+                        if text or separator != 'TELL':
+                            raise FileFormatError("File must start with TELL")
+                        section = 'TELL'
+                        continue
 
-                return kb, query
+                    if section == 'TELL':
+                        if text:
+                            InputParser._add_clause(kb, text, compact)
+                    elif text:
+                        ask_empty = False
+                        InputParser._add_query(kb, queries, text)
+
+                    if separator == 'TELL':
+                        raise FileFormatError("TELL may only start the file")
+                    if separator == 'ASK':
+                        if ask_empty:
+                            raise FileFormatError("ASK section cannot be empty")
+                        section, ask_empty = 'ASK', True
+                except (InputParserError, KnowledgeBaseError) as e:
+                    error = e
+
+            if not asked:
+                raise FileFormatError(
+                    "File must contain a TELL section and at least one ASK section")
+            if error is not None:
+                raise error
+            if ask_empty:
+                raise FileFormatError("ASK section cannot be empty")
+            return kb, queries
 
-        except FileNotFoundError as e:
-            raise FileNotFoundError(f"Error reading file: {str(e)}")
         except FileFormatError as e:
             raise FileFormatError(f"Invalid file format: {str(e)}")
         except KnowledgeBaseError as e:
             raise KnowledgeBaseError(f"Knowledge base error: {str(e)}")
         except Exception as e:
             raise InputParserError(f"Error parsing input: {str(e)}")
+
+    @staticmethod
+    def _add_clause(kb: Union[KnowledgeBase, CompactKnowledgeBase], clause: str,
+                    compact: bool) -> None:
+        """Parses one TELL clause into the knowledge base"""
+        try:
+            # Parse single fact
+            if '=>' not in clause:
+                if any(op in clause for op in ['&', '||', '<=>']):
+                    raise FileFormatError(
+                        f"Non-Horn clause detected: {clause}")
+                if compact:
+                    kb.add_clause([], clause)
+                else:
+                    kb.add_clause(Clause([], Literal(clause)))
+                return
+
+            # Parse implication
+            parts = clause.split('=>')
+            if len(parts) != 2:
+                raise FileFormatError(
+                    f"Invalid clause format: {clause}")
+
+            premises_str, conclusion_str = parts[0].strip(), parts[1].strip()
+
+            # Parse premises
+            premise_names = [p.strip() for p in premises_str.split('&')]
+
+            if compact:
+                kb.add_clause(premise_names, conclusion_str)
+                return
+
+            premises = [Literal(p) for p in premise_names]
+
+            # Parse conclusion
+            conclusion = Literal(conclusion_str)
+
+            kb.add_clause(Clause(premises, conclusion))
+
+        except KnowledgeBaseError as e:
+            raise InputParserError(
+                f"Error in clause '{clause}': {str(e)}")
+
+    @staticmethod
+    def _add_query(kb: Union[KnowledgeBase, CompactKnowledgeBase], queries: list[str],
+                   query: str) -> None:
+        """Validates one ASK query and appends it to queries"""
+        if any(op in query for op in ['&', '=>', '||', '<=>']):
+            raise FileFormatError(
+                f"Query must be a single proposition: {query}")
+
+        # Validate query is a symbol in the knowledge base
+        if query not in kb.symbols:
+            raise InputParserError(
+                f"Query symbol '{query}' not found in knowledge base")
+        queries.append(query)
@@ -0,0 +1,262 @@
+# /data/kb_cache.py
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+from data.input_parser import InputParser
+from data.knowledge_base import CompactKnowledgeBase
+
+
+class KBCache:
+    """
+    Persistent cache of compiled knowledge bases
+
+    A parsed input file is stored as a CompactKnowledgeBase in a binary
+    file named after the input's path and the SHA-256 of its content,
+    together with its queries, the symbol ids in name order and the head,
+    occurrence and sorted premise indexes. Running again on unchanged input
+    memory-maps that file and serves its columns as memoryview casts over
+    the mapping, skipping tokenization and index construction without
+    copying the columns; symbols are looked up through a SymbolIndex over
+    the name order, so not even the name dict is rebuilt.
+
+    File layout: a header (magic, format version, array item size, byte
+    order, section count), the byte length of each section, then the
+    sections, each starting at a multiple of ALIGNMENT bytes: symbol names
+    and queries as newline-separated UTF-8, followed by the raw integer
+    columns in SECTIONS order.
+    """
+
+    MAGIC = b'IEKB'
+    FORMAT_VERSION = 2
+
+    # Environment variable naming the cache directory; main.py only caches
+    # when it is set
+    ENVIRONMENT = 'INFERENCE_ENGINE_CACHE'
+
+    # Sections start at multiples of this many bytes, so integer columns
+    # are aligned in the mapping
+    ALIGNMENT = 8
+
+    # Columns after the names and queries sections (is_fact is bytes, the
+    # others are arrays of C ints)
+    SECTIONS = ("offsets", "premises", "conclusions", "facts", "is_fact",
+                "head_offsets", "head_clauses", "occurrence_offsets",
+                "occurrence_clauses", "sorted_premises", "name_order")
+
+    _HEADER = struct.Struct('<4sBBBxI')
+    _LENGTH = struct.Struct('<Q')
+
+    @staticmethod
+    def parse_file_queries(filename: str, cache_dir: Optional[str] = None
+                           ) -> tuple[CompactKnowledgeBase, list[str]]:
+        """
+        Returns the compact knowledge base and queries of an input file
+
+        The cached copy is used when the file's content is unchanged;
+        otherwise the file is parsed as with
+        InputParser.parse_file_queries(filename, compact=True) and the
+        result is cached, replacing older caches of the same file. A cache
+        that cannot be read or written is ignored.
+
+        Args:
+            filename (str): Path to the input file
+            cache_dir (Optional[str]): Directory of the cache files, by
+                default default_directory()
+
+        Returns:
+            tuple[CompactKnowledgeBase, list[str]]: The knowledge base and
+                queries in file order
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            Any error of InputParser.parse_file_queries
+        """
+        file_path = Path(filename)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Error reading file: File not found: {filename}")
+
+        path = KBCache.cache_path(file_path, KBCache.content_hash(file_path), cache_dir)
+        cached = KBCache.load(path)
+        if cached is not None:
+            return cached
+
+        kb, queries = InputParser.parse_file_queries(filename, compact=True)
+        try:
+            KBCache.save(path, kb, queries)
+        except OSError:
+            pass
+        return kb, queries
+
+    @staticmethod
+    def content_hash(filename: Union[str, Path]) -> str:
+        """Returns the hex SHA-256 of a file's content"""
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 24), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def enabled() -> bool:
+        """Returns whether the ENVIRONMENT variable opts in to caching"""
+        return bool(os.environ.get(KBCache.ENVIRONMENT))
+
+    @staticmethod
+    def default_directory() -> Path:
+        """
+        Returns the directory cache files are kept in unless one is given
+
+        This is the ENVIRONMENT variable if set, otherwise a kbcache
+        directory in the user's cache directory (XDG_CACHE_HOME or
+        ~/.cache, ~/Library/Caches on macOS, LOCALAPPDATA on Windows).
+        """
+        override = os.environ.get(KBCache.ENVIRONMENT)
+        if override:
+            return Path(override)
+        if sys.platform == 'win32':
+            base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+        elif sys.platform == 'darwin':
+            base = Path.home() / 'Library' / 'Caches'
+        else:
+            base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+        return Path(base) / 'inference_engine' / 'kbcache'
+
+    @staticmethod
+    def cache_path(filename: Union[str, Path], digest: str,
+                   cache_dir: Optional[str] = None) -> Path:
+        """
+        Returns the cache file of an input file with the given content hash
+
+        Caches of inputs sharing a name in different directories are told
+        apart by a hash of the input's absolute path.
+        """
+        file_path = Path(filename)
+        directory = Path(cache_dir) if cache_dir is not None else KBCache.default_directory()
+        location = hashlib.sha256(str(file_path.resolve()).encode()).hexdigest()[:16]
+        return directory / f"{file_path.name}.{location}.{digest}.kbc"
+
+    @staticmethod
+    def save(path: Union[str, Path], kb: CompactKnowledgeBase, queries: list[str]) -> None:
+        """
+        Writes a knowledge base, its indexes and queries to a cache file
+
+        The file is written under a temporary name and then renamed, so a
+        reader never sees a partial file. Other cache files of the same
+        input (other content hashes) are removed.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        names = kb.names
+        head_offsets, head_clauses = kb.head_index()
+        occurrence_offsets, occurrence_clauses = kb.occurrence_index()
+        name_order = array('i', sorted(range(len(names)), key=names.__getitem__))
+        sections = ['\n'.join(names).encode(), '\n'.join(queries).encode(),
+                    kb.offsets, kb.premises, kb.conclusions, kb.facts, kb.is_fact,
+                    head_offsets, head_clauses, occurrence_offsets, occurrence_clauses,
+                    kb.sorted_premises(), name_order]
+        sections = [memoryview(section).cast('B') for section in sections]
+
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, 'wb') as file:
+                file.write(KBCache._HEADER.pack(
+                    KBCache.MAGIC, KBCache.FORMAT_VERSION, array('i').itemsize,
+                    sys.byteorder == 'little', len(sections)))
+                position = KBCache._HEADER.size
+                for section in sections:
+                    file.write(KBCache._LENGTH.pack(section.nbytes))
+                    position += KBCache._LENGTH.size
+                for section in sections:
+                    padding = -position % KBCache.ALIGNMENT
+                    file.write(bytes(padding))
+                    file.write(section)
+                    position += padding + section.nbytes
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        # Caches of earlier contents of the same input are stale
+        prefix, digest, _ = path.name.rsplit('.', 2)
+        for entry in path.parent.glob('*.kbc'):
+            stem = entry.name[:-len('.kbc')]
+            if entry != path and stem.rpartition('.')[0] == prefix \
+                    and len(stem) == len(prefix) + 1 + len(digest):
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+    @staticmethod
+    def load(path: Union[str, Path]) -> Optional[tuple[CompactKnowledgeBase, list[str]]]:
+        """
+        Reads a cache file written by save
+
+        Returns:
+            Optional[tuple[CompactKnowledgeBase, list[str]]]: The knowledge
+                base with its indexes and the queries, or None if the file
+                is missing, truncated or from another format or platform
+        """
+        try:
+            with open(path, 'rb') as file:
+                return KBCache._read(file)
+        except (OSError, ValueError, TypeError, struct.error):
+            return None
+
+    @staticmethod
+    def _read(file: BinaryIO) -> Optional[tuple[CompactKnowledgeBase, list[str]]]:
+        """
+        Decodes a memory-mapped cache file
+
+        Only the names and queries are copied out. The integer columns are
+        read-only memoryview casts over the mapping, which stays open for
+        as long as the knowledge base uses them; CompactKnowledgeBase
+        copies them into arrays only if clauses are added.
+        """
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, itemsize, little, count = KBCache._HEADER.unpack_from(mapped)
+        if (magic, version, itemsize, little, count) != (
+                KBCache.MAGIC, KBCache.FORMAT_VERSION, array('i').itemsize,
+                sys.byteorder == 'little', len(KBCache.SECTIONS) + 2):
+            mapped.close()
+            return None
+
+        position = KBCache._HEADER.size
+        lengths = []
+        for _ in range(count):
+            lengths.append(KBCache._LENGTH.unpack_from(mapped, position)[0])
+            position += KBCache._LENGTH.size
+
+        starts = []
+        for length in lengths:
+            position += -position % KBCache.ALIGNMENT
+            starts.append(position)
+            position += length
+        if position != len(mapped):
+            mapped.close()
+            return None
+
+        view = memoryview(mapped)
+        sections = [view[start:start + length] for start, length in zip(starts, lengths)]
+        names_blob, queries_blob = str(sections[0], 'utf-8'), str(sections[1], 'utf-8')
+        columns = {name: section if name == "is_fact" else section.cast('i')
+                   for name, section in zip(KBCache.SECTIONS, sections[2:])}
+
+        names = names_blob.split('\n') if names_blob else []
+        queries = queries_blob.split('\n') if queries_blob else []
+        if len(columns["is_fact"]) != len(names) or len(columns["name_order"]) != len(names) \
+                or len(columns["offsets"]) != len(columns["conclusions"]) + 1:
+            return None
+        kb = CompactKnowledgeBase.from_arrays(
+            names, columns["offsets"], columns["premises"], columns["conclusions"],
+            columns["facts"], columns["is_fact"],
+            head_index=(columns["head_offsets"], columns["head_clauses"]),
+            occurrence_index=(columns["occurrence_offsets"], columns["occurrence_clauses"]),
+            sorted_premises=columns["sorted_premises"], name_order=columns["name_order"])
+        return kb, queries
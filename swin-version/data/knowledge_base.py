@@ -1,6 +1,8 @@
 # /data/knowledge_base.py
-from dataclasses import dataclass
-from typing import List, Set
+from array import array
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+from weakref import WeakValueDictionary
 
 
 class KnowledgeBaseError(Exception):
@@ -18,32 +20,58 @@ class InvalidClauseError(KnowledgeBaseError):
     pass
 
 
-@dataclass
 class Literal:
     """
     Represents a propositional logic literal (e.g., 'p' or '~p')
 
+    Literals are immutable flyweights: constructing an existing (name,
+    negative) pair returns the same instance, so each name is validated
+    once and equal literals are identical. The table of instances only
+    holds them weakly, so the symbols of knowledge bases that are no longer
+    used are freed.
+
     Attributes:
         name (str): The symbol name (e.g., 'p', 'q')
         negative (bool): True if this is a negated literal (e.g., '~p')
     """
-    name: str
-    negative: bool = False
+    __slots__ = ("name", "negative", "__weakref__")
+
+    # The one live instance of each (name, negative) pair
+    _instances: "WeakValueDictionary[tuple, Literal]" = WeakValueDictionary()
 
-    def __post_init__(self):
-        if not isinstance(self.name, str):
+    def __new__(cls, name: str, negative: bool = False):
+        if not isinstance(name, str):
             raise InvalidLiteralError("Literal name must be a string")
-        if not self.name.strip():
-            raise InvalidLiteralError("Literal name cannot be empty")
-        if not all(c.isalnum() or c == '_' for c in self.name):
-            raise InvalidLiteralError(
-                f"Invalid literal name '{self.name}'. Only alphanumeric characters and underscores are allowed.")
+        key = (name, bool(negative))
+        literal = cls._instances.get(key)
+        if literal is None:
+            if not name.strip():
+                raise InvalidLiteralError("Literal name cannot be empty")
+            if not all(c.isalnum() or c == '_' for c in name):
+                raise InvalidLiteralError(
+                    f"Invalid literal name '{name}'. Only alphanumeric characters and underscores are allowed.")
+            literal = object.__new__(cls)
+            object.__setattr__(literal, "name", name)
+            object.__setattr__(literal, "negative", key[1])
+            cls._instances[key] = literal
+        return literal
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete field '{name}'")
+
+    def __reduce__(self):
+        return Literal, (self.name, self.negative)
+
+    def __repr__(self):
+        return f"Literal(name={self.name!r}, negative={self.negative!r})"
 
     def __str__(self):
         return f"{'~' if self.negative else ''}{self.name}"
 
 
-@dataclass
 class Clause:
     """
     Represents a Horn clause in the knowledge base
@@ -52,20 +80,46 @@ class Clause:
     1. A fact (empty premises, just a conclusion)
     2. An implication (premises => conclusion)
 
+    Clauses are immutable and hashable, so they can be deduplicated with
+    sets or used as dictionary keys.
+
     Attributes:
-        premises (List[Literal]): List of literals in the antecedent
+        premises (Tuple[Literal, ...]): Literals in the antecedent (given as a list or tuple)
         conclusion (Literal): The consequent literal
     """
-    premises: List[Literal]
-    conclusion: Literal
+    __slots__ = ("premises", "conclusion", "_hash")
 
-    def __post_init__(self):
-        if not isinstance(self.premises, list):
-            raise InvalidClauseError("Premises must be a list")
-        if not isinstance(self.conclusion, Literal):
+    def __init__(self, premises: Sequence[Literal], conclusion: Literal):
+        if not isinstance(premises, (list, tuple)):
+            raise InvalidClauseError("Premises must be a list or tuple")
+        if not isinstance(conclusion, Literal):
             raise InvalidClauseError("Conclusion must be a Literal")
-        if any(not isinstance(p, Literal) for p in self.premises):
+        if any(not isinstance(p, Literal) for p in premises):
             raise InvalidClauseError("All premises must be Literals")
+        premises = tuple(premises)
+        object.__setattr__(self, "premises", premises)
+        object.__setattr__(self, "conclusion", conclusion)
+        object.__setattr__(self, "_hash", hash((premises, conclusion)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other):
+        if not isinstance(other, Clause):
+            return NotImplemented
+        return self.conclusion is other.conclusion and self.premises == other.premises
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return Clause, (self.premises, self.conclusion)
+
+    def __repr__(self):
+        return f"Clause(premises={list(self.premises)!r}, conclusion={self.conclusion!r})"
 
     def __str__(self):
         if not self.premises:  # It's a fact
@@ -79,14 +133,39 @@ class KnowledgeBase:
 
     Attributes:
         clauses (List[Clause]): List of all clauses in the knowledge base
+            (retracting a clause moves the last clause into its place)
         facts (Set[str]): Set of known facts (clauses with no premises)
         symbols (Set[str]): Set of all unique symbols used in the knowledge base
+        by_head (Dict[str, List[Tuple[Clause, Tuple[str, ...]]]]): Clauses
+            concluding each symbol, in the order they were added, with
+            their premise names sorted once on insertion
+        materialized (bool): Whether the forward chaining closure is maintained
+        closure (Dict[str, None]): Symbols derived by forward chaining, in
+                                   derivation order (when materialized)
     """
 
     def __init__(self):
         self.clauses: List[Clause] = []
         self.facts: Set[str] = set()
         self.symbols: Set[str] = set()
+        self.by_head: Dict[str, List[Tuple[Clause, Tuple[str, ...]]]] = {}
+        # Number of clause occurrences of each symbol, so retraction can update symbols
+        self._references: Dict[str, int] = {}
+        # Positions in clauses of each clause, and number of fact clauses of
+        # each symbol, so retraction needs no scan of the clause list
+        self._positions: Dict[Clause, Dict[int, None]] = {}
+        self._fact_counts: Dict[str, int] = {}
+
+        self.materialized = False
+        self.closure: Dict[str, None] = {}
+        # Closure bookkeeping, keyed by stable clause ids (self._ids runs parallel to clauses)
+        self._ids: List[int] = []
+        self._next_id = 0
+        self._by_id: Dict[int, Clause] = {}
+        self._unsatisfied: Dict[int, int] = {}
+        self._uses: Dict[str, Dict[int, None]] = {}     # premise -> clause ids
+        self._heads: Dict[str, Dict[int, None]] = {}    # conclusion -> clause ids
+        self._waiting: Dict[str, Dict[int, None]] = {}  # underived premise -> clause ids
 
     def add_clause(self, clause: Clause) -> None:
         """
@@ -101,18 +180,477 @@ class KnowledgeBase:
         try:
             if not isinstance(clause, Clause):
                 raise InvalidClauseError("Must provide a valid Clause object")
+            if not clause.premises and clause.conclusion.negative:
+                raise InvalidClauseError(
+                    "Facts cannot be negative literals")
 
+            self._positions.setdefault(clause, {})[len(self.clauses)] = None
             self.clauses.append(clause)
-            self.symbols.add(clause.conclusion.name)
+            self.by_head.setdefault(clause.conclusion.name, []).append(
+                (clause, tuple(sorted(p.name for p in clause.premises))))
 
             if not clause.premises:  # If it's a fact
-                if clause.conclusion.negative:
-                    raise InvalidClauseError(
-                        "Facts cannot be negative literals")
                 self.facts.add(clause.conclusion.name)
+                self._fact_counts[clause.conclusion.name] = \
+                    self._fact_counts.get(clause.conclusion.name, 0) + 1
+
+            for name in [clause.conclusion.name] + [p.name for p in clause.premises]:
+                self.symbols.add(name)
+                self._references[name] = self._references.get(name, 0) + 1
+
+        except Exception as e:
+            raise InvalidClauseError(f"Error adding clause: {str(e)}")
+
+        if self.materialized:
+            self._ids.append(self._chain_clause(clause))
+
+    def retract_clause(self, clause: Clause) -> None:
+        """
+        Removes one occurrence of a clause from the knowledge base
+
+        The last clause is moved into the freed position, so no other clause
+        is shifted. If the closure is materialized it is repaired with
+        delete-and-rederive: everything derived through the clause is
+        provisionally removed, then whatever still has another derivation is
+        derived again. The work is proportional to the affected part of the
+        closure.
+
+        Args:
+            clause (Clause): The clause to remove
+
+        Raises:
+            InvalidClauseError: If the clause is not in the knowledge base
+        """
+        positions = self._positions.get(clause) if isinstance(clause, Clause) else None
+        if not positions:
+            raise InvalidClauseError(f"Clause not in knowledge base: {clause}")
+
+        index = positions.popitem()[0]
+        if not positions:
+            del self._positions[clause]
+        last = len(self.clauses) - 1
+        if index != last:
+            moved = self.clauses[last]
+            self.clauses[index] = moved
+            moved_positions = self._positions[moved]
+            del moved_positions[last]
+            moved_positions[index] = None
+            if self.materialized:
+                self._ids[index], self._ids[last] = self._ids[last], self._ids[index]
+        self.clauses.pop()
+
+        # Equal clauses are interchangeable, so the first one of the head goes
+        rules = self.by_head[clause.conclusion.name]
+        del rules[next(i for i, (c, _) in enumerate(rules) if c == clause)]
+        if not rules:
+            del self.by_head[clause.conclusion.name]
+        if not clause.premises:
+            self._fact_counts[clause.conclusion.name] -= 1
+            if not self._fact_counts[clause.conclusion.name]:
+                del self._fact_counts[clause.conclusion.name]
+                self.facts.discard(clause.conclusion.name)
+
+        for name in [clause.conclusion.name] + [p.name for p in clause.premises]:
+            self._references[name] -= 1
+            if not self._references[name]:
+                del self._references[name]
+                self.symbols.discard(name)
+
+        if self.materialized:
+            self._unchain_clause(self._ids.pop())
+
+    def retract_fact(self, symbol: str) -> None:
+        """
+        Removes a fact from the knowledge base
+
+        Args:
+            symbol (str): The fact to withdraw
+
+        Raises:
+            InvalidClauseError: If the fact is not in the knowledge base
+        """
+        self.retract_clause(Clause([], Literal(symbol)))
+
+    def materialize(self) -> None:
+        """
+        Starts maintaining the forward chaining closure of the knowledge base
+
+        The closure is computed once from the existing clauses. Afterwards
+        every add_clause only propagates the conclusions the new clause
+        enables, so checking whether a symbol is entailed is a set lookup.
+        """
+        self.materialized = True
+        self.closure = {}
+        self._by_id, self._unsatisfied = {}, {}
+        self._uses, self._heads, self._waiting = {}, {}, {}
+        self._ids = [self._chain_clause(clause) for clause in self.clauses]
+
+    def entails(self, symbol: str) -> bool:
+        """
+        Checks if the materialized closure contains symbol
+
+        Raises:
+            KnowledgeBaseError: If the closure is not being maintained
+        """
+        if not self.materialized:
+            raise KnowledgeBaseError("Knowledge base closure is not materialized")
+        return symbol in self.closure
+
+    def _chain_clause(self, clause: Clause) -> int:
+        """Registers a clause with the closure, fires it if already satisfied and returns its id"""
+        clause_id = self._next_id
+        self._next_id += 1
+        self._by_id[clause_id] = clause
+        self._heads.setdefault(clause.conclusion.name, {})[clause_id] = None
+
+        # Negated premises are never derived, so they keep the clause from firing
+        unsatisfied = 1 if any(p.negative for p in clause.premises) else 0
+        for name in dict.fromkeys(p.name for p in clause.premises if not p.negative):
+            self._uses.setdefault(name, {})[clause_id] = None
+            if name not in self.closure:
+                self._waiting.setdefault(name, {})[clause_id] = None
+                unsatisfied += 1
+        self._unsatisfied[clause_id] = unsatisfied
+
+        if unsatisfied == 0:
+            self._derive(clause.conclusion.name)
+        return clause_id
+
+    def _unchain_clause(self, clause_id: int) -> None:
+        """Unregisters a clause from the closure and repairs it (delete-and-rederive)"""
+        clause = self._by_id.pop(clause_id)
+        fired = self._unsatisfied.pop(clause_id) == 0
+        for name in {p.name for p in clause.premises if not p.negative}:
+            self._uses[name].pop(clause_id, None)
+            self._waiting.get(name, {}).pop(clause_id, None)
+        head = clause.conclusion.name
+        del self._heads[head][clause_id]
+
+        if not fired or head not in self.closure:
+            return
+
+        # Overdelete everything derived through fired clauses downstream of head
+        deleted, stack = {head: None}, [head]
+        while stack:
+            for user in self._uses.get(stack.pop(), ()):
+                if self._unsatisfied[user] == 0:
+                    conclusion = self._by_id[user].conclusion.name
+                    if conclusion in self.closure and conclusion not in deleted:
+                        deleted[conclusion] = None
+                        stack.append(conclusion)
+
+        for name in deleted:
+            del self.closure[name]
+        for name in deleted:
+            for user in self._uses.get(name, ()):
+                self._unsatisfied[user] += 1
+                self._waiting.setdefault(name, {})[user] = None
+
+        # Rederive the deleted symbols that still have a satisfied clause
+        for name in deleted:
+            if any(self._unsatisfied[c] == 0 for c in self._heads.get(name, ())):
+                self._derive(name)
+
+    def _derive(self, symbol: str) -> None:
+        """Adds symbol to the closure and forward chains from it"""
+        if symbol in self.closure:
+            return
+        self.closure[symbol] = None
+        agenda = deque([symbol])
+
+        while agenda:
+            p = agenda.popleft()
+            for clause_id in self._waiting.pop(p, ()):
+                self._unsatisfied[clause_id] -= 1
+                if self._unsatisfied[clause_id] == 0:
+                    conclusion = self._by_id[clause_id].conclusion.name
+                    if conclusion not in self.closure:
+                        self.closure[conclusion] = None
+                        agenda.append(conclusion)
+
+
+class SymbolIndex(Mapping[str, int]):
+    """
+    Read-only map from symbol names to ids, searched in a name-sorted order
+
+    Used instead of a dict when a CompactKnowledgeBase is loaded with its
+    sorted symbol order (e.g. from the compiled KB cache): lookups are
+    binary searches, so no dict of all names has to be built before the
+    first one.
+
+    Attributes:
+        names (List[str]): Name of each symbol id
+        order (array): The symbol ids sorted by name
+    """
+
+    def __init__(self, names: List[str], order: array):
+        self.names = names
+        self.order = order
+
+    def __getitem__(self, name: str) -> int:
+        if not isinstance(name, str):
+            raise KeyError(name)
+        names, order = self.names, self.order
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if names[order[middle]] < name:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order) and names[order[low]] == name:
+            return order[low]
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def group_by_symbol(symbol_count: int, pairs: Callable[[], Iterable[tuple[int, int]]]) -> tuple[array, array]:
+    """
+    Builds a CSR index from (symbol, clause id) pairs with a counting sort
+
+    pairs is called twice, once to count and once to fill, so it must
+    yield the same pairs both times. Clause ids keep their order within
+    each symbol.
+
+    Returns:
+        tuple[array, array]: (offsets, clause ids), the clauses of symbol s
+            being clause_ids[offsets[s]:offsets[s + 1]]
+    """
+    offsets = array('i', [0]) * (symbol_count + 1)
+    for symbol, _ in pairs():
+        offsets[symbol + 1] += 1
+    for s in range(symbol_count):
+        offsets[s + 1] += offsets[s]
+
+    clause_ids = array('i', [0]) * offsets[symbol_count]
+    fill = array('i', offsets)
+    for symbol, clause_id in pairs():
+        clause_ids[fill[symbol]] = clause_id
+        fill[symbol] += 1
+    return offsets, clause_ids
+
+
+class CompactKnowledgeBase:
+    """
+    Horn knowledge base stored as integer columns
+
+    Symbols are interned to dense ids in order of first appearance, and the
+    clauses are kept in compressed sparse row form: clause i has the premises
+    premises[offsets[i]:offsets[i + 1]] and the conclusion conclusions[i]. A
+    negated premise p is stored as ~p. No Literal or Clause objects are kept,
+    so large KBs take a few bytes per symbol occurrence and the algorithms
+    index plain arrays; names are only looked up again to report results.
+
+    Attributes:
+        names (List[str]): Name of each symbol id
+        ids (Mapping[str, int]): Id of each symbol name, a dict unless loaded
+            with a SymbolIndex (see from_arrays)
+        offsets (array): Start of each clause's premises, followed by the end
+        premises (array): Premise ids of all clauses, concatenated
+        conclusions (array): Conclusion id of each clause
+        facts (array): Ids of the facts, each once, in order of addition
+        is_fact (bytearray): 1 for the ids of facts
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.offsets = array('i', [0])
+        self.premises = array('i')
+        self.conclusions = array('i')
+        self.facts = array('i')
+        self.is_fact = bytearray()
+        # Indexes built on first use, dropped whenever a clause is added
+        self._head_index: Optional[tuple[array, array]] = None
+        self._occurrence_index: Optional[tuple[array, array]] = None
+        self._sorted_premises: Optional[array] = None
+
+    @classmethod
+    def from_knowledge_base(cls, kb: KnowledgeBase) -> "CompactKnowledgeBase":
+        """Builds the compact form of a knowledge base, keeping its clause order"""
+        compact = cls()
+        for clause in kb.clauses:
+            compact.add_clause_ids(
+                [~compact.intern(p.name) if p.negative else compact.intern(p.name)
+                 for p in clause.premises],
+                compact.intern(clause.conclusion.name))
+        return compact
+
+    @classmethod
+    def from_arrays(cls, names: List[str], offsets: array, premises: array,
+                    conclusions: array, facts: array, is_fact: bytearray,
+                    head_index: Optional[tuple[array, array]] = None,
+                    occurrence_index: Optional[tuple[array, array]] = None,
+                    sorted_premises: Optional[array] = None,
+                    name_order: Optional[array] = None) -> "CompactKnowledgeBase":
+        """
+        Rebuilds a knowledge base from its columns and, optionally, its indexes
+
+        The columns are taken as they are, without validating the names or
+        the clauses again, so they must come from an existing
+        CompactKnowledgeBase (e.g. one written to the compiled KB cache).
+        They may be read-only buffers, such as memoryview casts over a
+        mapped file, which are copied into arrays only once a symbol or
+        clause is added. Given name_order, the symbol ids sorted by name,
+        ids is a SymbolIndex until a new symbol is interned.
+        """
+        compact = cls()
+        compact.names = names
+        compact.ids = SymbolIndex(names, name_order) if name_order is not None \
+            else dict(zip(names, range(len(names))))
+        compact.offsets, compact.premises, compact.conclusions = offsets, premises, conclusions
+        compact.facts, compact.is_fact = facts, is_fact
+        compact._head_index = head_index
+        compact._occurrence_index = occurrence_index
+        compact._sorted_premises = sorted_premises
+        return compact
+
+    def __getstate__(self):
+        # Columns served from a mapped file cannot be pickled, so workers
+        # receive copies
+        state = dict(self.__dict__)
+        for name, value in state.items():
+            if isinstance(value, tuple):
+                state[name] = tuple(self._owned(column) for column in value)
+            elif isinstance(value, SymbolIndex):
+                state[name] = SymbolIndex(value.names, self._owned(value.order))
+            else:
+                state[name] = self._owned(value)
+        return state
+
+    @staticmethod
+    def _owned(column):
+        """Returns a memoryview column as an array (bytearray for bytes), other values as they are"""
+        if not isinstance(column, memoryview):
+            return column
+        if column.format == 'B':
+            return bytearray(column)
+        owned = array('i')
+        owned.frombytes(column.cast('B'))
+        return owned
+
+    def _own_columns(self) -> None:
+        """Copies read-only columns (see from_arrays) into arrays before they grow"""
+        if type(self.premises) is array and type(self.is_fact) is bytearray:
+            return
+        for name in ("offsets", "premises", "conclusions", "facts", "is_fact"):
+            setattr(self, name, self._owned(getattr(self, name)))
+
+    @property
+    def symbols(self):
+        """All symbol names, in id order"""
+        return self.ids.keys()
 
-            for premise in clause.premises:
-                self.symbols.add(premise.name)
+    @property
+    def clause_count(self) -> int:
+        return len(self.conclusions)
 
+    def intern(self, name: str) -> int:
+        """
+        Returns the id of a symbol, allocating it on first use
+
+        Raises:
+            InvalidLiteralError: If the name is not a valid symbol
+        """
+        symbol = self.ids.get(name)
+        if symbol is None:
+            Literal(name)  # Validates the name once per symbol
+            if type(self.ids) is not dict:  # A SymbolIndex is read-only
+                self.ids = dict(zip(self.names, range(len(self.names))))
+            self._own_columns()
+            symbol = len(self.names)
+            self.names.append(name)
+            self.ids[name] = symbol
+            self.is_fact.append(0)
+        return symbol
+
+    def add_clause(self, premises: Iterable[str], conclusion: str) -> None:
+        """
+        Adds a clause given by symbol names
+
+        Args:
+            premises (Iterable[str]): The premise names
+            conclusion (str): The conclusion name
+
+        Raises:
+            InvalidClauseError: If a symbol name is invalid
+        """
+        try:
+            premise_ids = [self.intern(p) for p in premises]
+            conclusion_id = self.intern(conclusion)
         except Exception as e:
             raise InvalidClauseError(f"Error adding clause: {str(e)}")
+        self.add_clause_ids(premise_ids, conclusion_id)
+
+    def add_clause_ids(self, premise_ids: List[int], conclusion_id: int) -> None:
+        """
+        Adds a clause given by interned ids
+
+        Args:
+            premise_ids (List[int]): Premise ids, ~id for a negated premise
+            conclusion_id (int): The conclusion id
+        """
+        self._own_columns()
+        self.premises.extend(premise_ids)
+        self.offsets.append(len(self.premises))
+        self.conclusions.append(conclusion_id)
+        self._head_index = self._occurrence_index = self._sorted_premises = None
+        if not premise_ids and not self.is_fact[conclusion_id]:
+            self.is_fact[conclusion_id] = 1
+            self.facts.append(conclusion_id)
+
+    def occurrence_index(self) -> tuple[array, array]:
+        """
+        Maps each symbol to the clauses using it as a (non-negated) premise
+
+        The index is kept until the next clause is added.
+
+        Returns:
+            tuple[array, array]: CSR (offsets, clause ids), with a clause
+                listed once per occurrence
+        """
+        def pairs():
+            for i in range(self.clause_count):
+                for p in self.premises[self.offsets[i]:self.offsets[i + 1]]:
+                    if p >= 0:
+                        yield p, i
+        if self._occurrence_index is None:
+            self._occurrence_index = group_by_symbol(len(self.names), pairs)
+        return self._occurrence_index
+
+    def head_index(self) -> tuple[array, array]:
+        """
+        Maps each symbol to the clauses concluding it
+
+        The index is kept until the next clause is added.
+
+        Returns:
+            tuple[array, array]: CSR (offsets, clause ids), in clause order
+        """
+        if self._head_index is None:
+            self._head_index = group_by_symbol(
+                len(self.names), lambda: zip(self.conclusions, range(self.clause_count)))
+        return self._head_index
+
+    def sorted_premises(self) -> array:
+        """
+        Returns the premises with each clause's premises sorted by name
+
+        Laid out like premises (same offsets), and kept until the next
+        clause is added.
+        """
+        if self._sorted_premises is None:
+            names, offsets = self.names, self.offsets
+            premises = array('i', self.premises)
+            for i in range(self.clause_count):
+                start, end = offsets[i], offsets[i + 1]
+                if end - start > 1:
+                    premises[start:end] = array('i', sorted(
+                        premises[start:end], key=lambda p: names[p if p >= 0 else ~p]))
+            self._sorted_premises = premises
+        return self._sorted_premises
@@ -1,6 +1,7 @@
 # main.py
 import sys
 from data.input_parser import InputParser
+from data.kb_cache import KBCache
 from algorithms.tt import TruthTable
 from algorithms.fc import ForwardChaining
 from algorithms.bc import BackwardChaining
@@ -10,32 +11,49 @@ def main():
     """
     Main entry point for the inference engine
 
-    Usage: python main.py <filename> <method>
+    Usage: python main.py <filename> <method> [mode]
     where method is one of: TT, FC, BC
+    and mode optionally selects the strategy of the method:
+    TT (enumerate, compiled, parallel, prune, gray), FC (saturate, goal, sparse, parallel),
+    BC (search, tabled, cost)
     """
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <filename> <method>")
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python main.py <filename> <method> [mode]")
         sys.exit(1)
 
     filename = sys.argv[1]
     method = sys.argv[2].upper()
+    mode = sys.argv[3].lower() if len(sys.argv) == 4 else None
 
     try:
-        # Parse input file
-        kb, query = InputParser.parse_file(filename)
+        # Parse input file (one output line per query), into the compact
+        # integer store unless the requested strategy needs Clause objects.
+        # With INFERENCE_ENGINE_CACHE set, the compact store is cached there,
+        # so unchanged input is not parsed again
+        compact = method != "TT" or (mode or "enumerate") in TruthTable.COMPACT_MODES
+        if compact and KBCache.enabled():
+            kb, queries = KBCache.parse_file_queries(filename)
+        else:
+            kb, queries = InputParser.parse_file_queries(filename, compact=compact)
 
         # Run requested inference method
         if method == "TT":
-            result, models = TruthTable.check_entailment(kb, query)
-            print(f"YES: {models}" if result else "NO")
+            results = TruthTable.check_entailments(
+                kb, queries, mode=mode or "enumerate")
+            for result, models in results:
+                print(f"YES: {models}" if result else "NO")
 
         elif method == "FC":
-            result, inferred = ForwardChaining.check_entailment(kb, query)
-            print(f"YES: {', '.join(inferred)}" if result else "NO")
+            results = ForwardChaining.check_entailments(
+                kb, queries, mode=mode or "saturate")
+            for result, inferred in results:
+                print(f"YES: {', '.join(inferred)}" if result else "NO")
 
         elif method == "BC":
-            result, inferred = BackwardChaining.check_entailment(kb, query)
-            print(f"YES: {', '.join(inferred)}" if result else "NO")
+            results = BackwardChaining.check_entailments(
+                kb, queries, mode=mode or "search")
+            for result, inferred in results:
+                print(f"YES: {', '.join(inferred)}" if result else "NO")
 
         else:
             print(f"Unknown method: {method}")
@@ -1,10 +1,21 @@
+import gc
+import io
+import os
+import pickle
+import sys
 import unittest
+from array import array
 from pathlib import Path
+from unittest import mock
 from data.input_parser import InputParser, FileFormatError
-from data.knowledge_base import KnowledgeBase, Clause, Literal, KnowledgeBaseError
+from data.kb_cache import KBCache
+from data.knowledge_base import KnowledgeBase, CompactKnowledgeBase, Clause, Literal, KnowledgeBaseError
 from algorithms.fc import ForwardChaining
+from algorithms.sparse_fc import SparseForwardChaining
+from algorithms.parallel_fc import ParallelForwardChaining
 from algorithms.bc import BackwardChaining
 from algorithms.tt import TruthTable
+import main
 
 
 class TestLogicEngine(unittest.TestCase):
@@ -34,6 +45,124 @@ class TestLogicEngine(unittest.TestCase):
         with self.assertRaises(FileFormatError):
             InputParser.parse_file(str(file_path))
 
+    def test_input_parser_empty_ask_section(self):
+        for content in ("TELL a; ASK ;", "TELL a; ASK ; ;", "TELL a; ASK ; ASK a"):
+            with self.assertRaises(FileFormatError):
+                InputParser.parse_string(content)
+        self.assertEqual(InputParser.parse_string("TELL a; ASK ; a;")[1], ["a"])
+
+    def test_streamed_parsing_matches_file_parsing(self):
+        content = """TELL
+        TASK => ASKED; p1 & TASK => p2; TASK; p1
+        ASK
+        p2; ASKED
+        ASK
+        TASK"""
+        file_path = self.create_test_file(content)
+        kb, queries = InputParser.parse_file_queries(str(file_path))
+        self.assertEqual(queries, ["p2", "ASKED", "TASK"])
+        self.assertEqual(len(kb.clauses), 4)
+
+        InputParser.CHUNK_SIZE = 3  # Split keywords and clauses across chunks
+        try:
+            for compact in (False, True):
+                streamed_kb, streamed_queries = InputParser.parse_stream(io.StringIO(content), compact)
+                self.assertEqual(streamed_queries, queries)
+                self.assertEqual(BackwardChaining.check_entailments(streamed_kb, queries),
+                                 BackwardChaining.check_entailments(kb, queries))
+            self.assertEqual(InputParser.parse_file_queries(str(file_path))[1], queries)
+        finally:
+            InputParser.CHUNK_SIZE = 1 << 20
+
+        self.assertEqual(InputParser.parse_string(content)[1], queries)
+        with self.assertRaises(FileFormatError):
+            InputParser.parse_string("TELL p1; TELL p2; ASK p1")
+
+    def test_compiled_kb_cache_matches_parsing(self):
+        content = """TELL
+        p2 => p3; p3 => p1; c => e; p1 & p3 => c; p2
+        ASK
+        e; p1"""
+        file_path = self.create_test_file(content)
+        cache_dir = str(self.test_files_dir)
+        kb, queries = KBCache.parse_file_queries(str(file_path), cache_dir)
+        cached_kb, cached_queries = KBCache.parse_file_queries(str(file_path), cache_dir)
+        self.assertEqual(cached_queries, queries)
+        self.assertEqual(list(cached_kb.symbols), list(kb.symbols))
+        self.assertEqual(cached_kb.ids.get("c"), kb.ids["c"])
+        self.assertIsNone(cached_kb.ids.get("x"))
+        for mode in BackwardChaining.MODES:
+            self.assertEqual(BackwardChaining.check_entailments(cached_kb, queries, mode=mode),
+                             BackwardChaining.check_entailments(kb, queries, mode=mode))
+        self.assertEqual(ForwardChaining.check_entailments(cached_kb, queries),
+                         ForwardChaining.check_entailments(kb, queries))
+
+        # A changed file gets a new cache, replacing the stale one
+        file_path.write_text(content + "; c")
+        self.assertEqual(KBCache.parse_file_queries(str(file_path), cache_dir)[1], ["e", "p1", "c"])
+        self.assertEqual(len(list(self.test_files_dir.glob("*.kbc"))), 1)
+
+    def test_compiled_kb_cache_serves_mapped_columns(self):
+        file_path = self.create_test_file("TELL a; a => b; b & c => d; ASK b; d")
+        cache_dir = str(self.test_files_dir)
+        kb, queries = KBCache.parse_file_queries(str(file_path), cache_dir)
+        cached_kb, _ = KBCache.parse_file_queries(str(file_path), cache_dir)
+        self.assertIsInstance(cached_kb.premises, memoryview)
+        self.assertEqual(pickle.loads(pickle.dumps(cached_kb)).premises, kb.premises)
+        self.assertEqual(TruthTable.check_entailments(cached_kb, queries, mode="parallel"),
+                         TruthTable.check_entailments(kb, queries))
+
+        # Adding to a cached KB copies its columns first
+        cached_kb.add_clause([], "c")
+        self.assertIsInstance(cached_kb.premises, array)
+        self.assertEqual(ForwardChaining.check_entailment(cached_kb, "d"),
+                         (True, ["a", "c", "b", "d"]))
+
+    def test_compiled_kb_cache_directory(self):
+        with mock.patch.dict(os.environ, {KBCache.ENVIRONMENT: str(self.test_files_dir)}):
+            self.assertEqual(KBCache.default_directory(), self.test_files_dir)
+            path = KBCache.cache_path("input.txt", "0" * 64)
+            self.assertEqual(path.parent, self.test_files_dir)
+        with mock.patch.dict(os.environ, {KBCache.ENVIRONMENT: "", "XDG_CACHE_HOME": "/tmp/xdg"}):
+            if sys.platform not in ("win32", "darwin"):
+                self.assertEqual(KBCache.default_directory(), Path("/tmp/xdg/inference_engine/kbcache"))
+            self.assertNotEqual(KBCache.cache_path("input.txt", "0" * 64).parent, Path("."))
+        # Inputs with the same name in different directories get different caches
+        self.assertNotEqual(KBCache.cache_path("input.txt", "0" * 64, "cache"),
+                            KBCache.cache_path("other/input.txt", "0" * 64, "cache"))
+
+    def test_main_caches_only_when_enabled(self):
+        file_path = self.create_test_file("TELL a; a => b; ASK b")
+        for environment, saves in (({KBCache.ENVIRONMENT: ""}, 0),
+                                   ({KBCache.ENVIRONMENT: str(self.test_files_dir)}, 1)):
+            with mock.patch.dict(os.environ, environment), \
+                    mock.patch.object(sys, "argv", ["main.py", str(file_path), "FC"]), \
+                    mock.patch.object(KBCache, "save") as save, \
+                    mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                main.main()
+            self.assertEqual(stdout.getvalue(), "YES: a, b\n")
+            self.assertEqual(save.call_count, saves)
+
+    def test_multiple_queries_match_single_answers(self):
+        content = """TELL
+        p2 => p3; p3 => p1; c => e; p1 & p3 => c; p2
+        ASK
+        e; p1
+        ASK
+        c"""
+        file_path = self.create_test_file(content)
+        kb, queries = InputParser.parse_file_queries(str(file_path))
+        self.assertEqual(queries, ["e", "p1", "c"])
+        with self.assertRaises(FileFormatError):
+            InputParser.parse_file(str(file_path))
+
+        self.assertEqual(TruthTable.check_entailments(kb, queries),
+                         [TruthTable.check_entailment(kb, query) for query in queries])
+        self.assertEqual(ForwardChaining.check_entailments(kb, queries),
+                         [ForwardChaining.check_entailment(kb, query) for query in queries])
+        self.assertEqual(BackwardChaining.check_entailments(kb, queries),
+                         [BackwardChaining.check_entailment(kb, query) for query in queries])
+
     def test_knowledge_base_construction(self):
         kb = KnowledgeBase()
         kb.add_clause(Clause([], Literal("p1")))
@@ -42,6 +171,23 @@ class TestLogicEngine(unittest.TestCase):
         self.assertEqual(len(kb.facts), 1)
         self.assertEqual(len(kb.symbols), 2)
 
+    def test_literals_are_interned_and_clauses_hashable(self):
+        self.assertIs(Literal("p1"), Literal("p1"))
+        self.assertIsNot(Literal("p1"), Literal("p1", True))
+        with self.assertRaises(AttributeError):
+            Literal("p1").name = "p2"
+
+        clause = Clause([Literal("p1")], Literal("p2"))
+        self.assertEqual(clause.premises, (Literal("p1"),))
+        self.assertEqual(len({clause, Clause((Literal("p1"),), Literal("p2"))}), 1)
+
+        # Literals no longer referenced leave the table of instances
+        kb, _ = InputParser.parse_string("TELL unused_symbol; ASK unused_symbol")
+        self.assertIn(("unused_symbol", False), Literal._instances)
+        del kb
+        gc.collect()
+        self.assertNotIn(("unused_symbol", False), Literal._instances)
+
     def test_forward_chaining_simple(self):
         kb = KnowledgeBase()
         kb.add_clause(Clause([], Literal("p1")))
@@ -50,6 +196,202 @@ class TestLogicEngine(unittest.TestCase):
         self.assertTrue(entailed)
         self.assertEqual(order, ["p1", "p2"])
 
+    def test_forward_chaining_shared_premises(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([Literal("a")], Literal("b")))
+        kb.add_clause(Clause([Literal("a"), Literal("b")], Literal("c")))
+        kb.add_clause(Clause([Literal("a")], Literal("d")))
+        kb.add_clause(Clause([Literal("c"), Literal("d")], Literal("e")))
+        kb.add_clause(Clause([Literal("f")], Literal("g")))
+        kb.add_clause(Clause([], Literal("a")))
+        entailed, order = ForwardChaining.check_entailment(kb, "e")
+        self.assertTrue(entailed)
+        self.assertEqual(order, ["a", "b", "d", "c", "e"])
+        self.assertFalse(ForwardChaining.check_entailment(kb, "g")[0])
+
+    def test_forward_chaining_goal_mode_stops_at_query(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("a")))
+        kb.add_clause(Clause([], Literal("x")))
+        kb.add_clause(Clause([Literal("x")], Literal("y")))
+        kb.add_clause(Clause([Literal("a")], Literal("b")))
+        kb.add_clause(Clause([Literal("b")], Literal("c")))
+        kb.add_clause(Clause([Literal("c")], Literal("d")))
+        self.assertEqual(ForwardChaining.check_entailment(kb, "c", mode="goal"),
+                         (True, ["a", "b", "c"]))
+        self.assertEqual(ForwardChaining.check_entailment(kb, "z", mode="goal"),
+                         (False, []))
+
+    @unittest.skipUnless(SparseForwardChaining.AVAILABLE, "requires numpy and scipy")
+    def test_sparse_forward_chaining_orders_by_level(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("a")))
+        kb.add_clause(Clause([Literal("b"), Literal("c")], Literal("d")))
+        kb.add_clause(Clause([Literal("a")], Literal("c")))
+        kb.add_clause(Clause([Literal("a")], Literal("b")))
+        kb.add_clause(Clause([Literal("x")], Literal("y")))
+        self.assertEqual(ForwardChaining.check_entailment(kb, "d", mode="sparse"),
+                         (True, ["a", "c", "b", "d"]))
+        self.assertFalse(ForwardChaining.check_entailment(kb, "y", mode="sparse")[0])
+
+    def test_parallel_forward_chaining_matches_serial(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("a")))
+        kb.add_clause(Clause([Literal("a")], Literal("b")))
+        kb.add_clause(Clause([Literal("b")], Literal("c")))
+        kb.add_clause(Clause([Literal("c")], Literal("b")))
+        kb.add_clause(Clause([Literal("b"), Literal("c")], Literal("d")))
+        kb.add_clause(Clause([Literal("x")], Literal("y")))
+        serial = ForwardChaining.check_entailment(kb, "d")
+        parallel = ForwardChaining.check_entailment(kb, "d", mode="parallel", workers=2)
+        self.assertEqual(parallel[0], serial[0])
+        self.assertEqual(sorted(parallel[1]), sorted(serial[1]))
+
+        # The b <-> c cycle is one unit, stratified between a and d
+        compact = CompactKnowledgeBase.from_knowledge_base(kb)
+        with mock.patch.multiple(ParallelForwardChaining, STAGE_MIN_UNITS=1, STAGE_MIN_CLAUSES=0):
+            stages = ParallelForwardChaining.plan_stages(compact, list(range(5)))
+        self.assertEqual([[sorted(compact.names[compact.conclusions[i]] for i in unit)
+                           for unit in stage] for stage in stages],
+                         [[["a"]], [["b", "b", "c"]], [["d"]]])
+        # Narrow strata are merged into one stage
+        self.assertEqual(len(ParallelForwardChaining.plan_stages(compact, list(range(5)))), 1)
+        # Independent modules share a single stage
+        self.assertEqual(len(ParallelForwardChaining.plan_stages(compact, list(range(6)))), 1)
+
+    def test_parallel_forward_chaining_pool(self):
+        # a fans out to ten chains that join again in d, after a long chain
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("s0")))
+        for i in range(50):
+            kb.add_clause(Clause([Literal(f"s{i}")], Literal(f"s{i + 1}")))
+        kb.add_clause(Clause([Literal("s50")], Literal("a")))
+        for i in range(10):
+            kb.add_clause(Clause([Literal("a")], Literal(f"b{i}")))
+            kb.add_clause(Clause([Literal(f"b{i}")], Literal(f"c{i}")))
+        kb.add_clause(Clause([Literal(f"c{i}") for i in range(10)], Literal("d")))
+        serial = ForwardChaining.check_entailment(kb, "d")
+
+        with mock.patch.multiple(ParallelForwardChaining, PARALLEL_MIN_CLAUSES=0, STAGE_MIN_CLAUSES=4):
+            compact = CompactKnowledgeBase.from_knowledge_base(kb)
+            stages = ParallelForwardChaining.plan_stages(compact, list(range(len(kb.clauses))))
+            # The chain up to a is one stage, the b and c strata are wide, d is narrow
+            self.assertEqual([len(stage) for stage in stages], [1, 10, 10, 1])
+            parallel = ForwardChaining.check_entailment(kb, "d", mode="parallel", workers=2)
+        self.assertEqual(parallel[0], serial[0])
+        self.assertEqual(sorted(parallel[1]), sorted(serial[1]))
+
+    def test_materialized_closure_follows_added_clauses(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([Literal("p1"), Literal("p2")], Literal("p3")))
+        kb.materialize()
+        self.assertFalse(kb.entails("p3"))
+
+        kb.add_clause(Clause([], Literal("p1")))
+        kb.add_clause(Clause([Literal("p3")], Literal("p4")))
+        self.assertFalse(kb.entails("p4"))
+
+        kb.add_clause(Clause([], Literal("p2")))
+        self.assertTrue(kb.entails("p4"))
+        self.assertEqual(ForwardChaining.check_entailment(kb, "p4"),
+                         (True, ["p1", "p2", "p3", "p4"]))
+
+    def test_goal_mode_on_materialized_closure_stops_at_query(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("a")))
+        kb.add_clause(Clause([Literal("a")], Literal("c")))
+        kb.add_clause(Clause([Literal("a")], Literal("b")))
+        kb.add_clause(Clause([Literal("b")], Literal("d")))
+        kb.add_clause(Clause([Literal("e")], Literal("f")))
+        kb.materialize()
+
+        self.assertEqual(ForwardChaining.check_entailment(kb, "c"), (True, ["a", "c", "b", "d"]))
+        self.assertEqual(ForwardChaining.check_entailment(kb, "c", "goal"), (True, ["a", "c"]))
+        self.assertEqual(ForwardChaining.check_entailment(kb, "f", "goal"), (False, []))
+
+        # Symbols outside the cone are left out, as without materialization
+        kb = KnowledgeBase()
+        for clause in (Clause([], Literal("x")), Clause([], Literal("a")),
+                       Clause([Literal("x")], Literal("y")), Clause([Literal("a")], Literal("c"))):
+            kb.add_clause(clause)
+        unmaterialized = ForwardChaining.check_entailment(kb, "c", "goal")
+        kb.materialize()
+        self.assertEqual(list(kb.closure), ["x", "a", "y", "c"])
+        self.assertEqual(ForwardChaining.check_entailment(kb, "c", "goal"), unmaterialized)
+        self.assertEqual(unmaterialized, (True, ["a", "c"]))
+
+    def test_relevant_clauses_follow_head_index(self):
+        kb = KnowledgeBase()
+        rule = Clause([Literal("a"), Literal("b")], Literal("c"))
+        for clause in (Clause([], Literal("a")), Clause([Literal("x")], Literal("y")),
+                       rule, Clause([Literal("a")], Literal("b"))):
+            kb.add_clause(clause)
+        self.assertEqual([str(c) for c in ForwardChaining.relevant_clauses(kb, "c")],
+                         ["a & b => c", "a => b", "a"])
+        kb.retract_clause(rule)
+        self.assertEqual(ForwardChaining.relevant_clauses(kb, "c"), [])
+
+    def test_retraction_rederives_alternative_support(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("p1")))
+        kb.add_clause(Clause([], Literal("p2")))
+        kb.add_clause(Clause([Literal("p1")], Literal("p3")))
+        kb.add_clause(Clause([Literal("p2")], Literal("p3")))
+        kb.add_clause(Clause([Literal("p1")], Literal("p4")))
+        kb.materialize()
+
+        kb.retract_fact("p1")
+        self.assertTrue(kb.entails("p3"))
+        self.assertFalse(kb.entails("p4"))
+        self.assertNotIn("p1", kb.facts)
+
+        kb.retract_fact("p2")
+        self.assertEqual(list(kb.closure), [])
+        with self.assertRaises(KnowledgeBaseError):
+            kb.retract_fact("p2")
+
+    def test_retraction_moves_last_clause_and_counts_duplicate_facts(self):
+        kb = KnowledgeBase()
+        fact, rule = Clause([], Literal("a")), Clause([Literal("a")], Literal("b"))
+        for clause in (fact, rule, fact, Clause([Literal("b")], Literal("c"))):
+            kb.add_clause(clause)
+        kb.materialize()
+
+        kb.retract_clause(rule)
+        self.assertEqual([str(c) for c in kb.clauses], ["a", "b => c", "a"])
+        self.assertFalse(kb.entails("c"))
+        kb.retract_fact("a")
+        self.assertIn("a", kb.facts)
+        self.assertTrue(kb.entails("a"))
+        kb.retract_fact("a")
+        self.assertNotIn("a", kb.facts)
+        self.assertEqual(list(kb.closure), [])
+
+        kb.add_clause(Clause([], Literal("b")))
+        kb.retract_clause(Clause([Literal("b")], Literal("c")))
+        self.assertEqual(kb.clauses, [Clause([], Literal("b"))])
+        self.assertEqual(list(kb.closure), ["b"])
+        with self.assertRaises(KnowledgeBaseError):
+            kb.retract_clause(rule)
+
+    def test_compact_knowledge_base_matches_clauses(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("a")))
+        kb.add_clause(Clause([Literal("a"), Literal("b")], Literal("c")))
+        kb.add_clause(Clause([Literal("a")], Literal("b")))
+        kb.add_clause(Clause([Literal("c")], Literal("d")))
+        compact = CompactKnowledgeBase.from_knowledge_base(kb)
+
+        self.assertEqual(compact.names, ["a", "b", "c", "d"])
+        self.assertEqual(list(compact.offsets), [0, 0, 2, 3, 4])
+        for query in ["a", "b", "c", "d"]:
+            self.assertEqual(ForwardChaining.check_entailment(compact, query),
+                             (True, ["a", "b", "c", "d"]))
+            self.assertEqual(BackwardChaining.check_entailment(compact, query),
+                             BackwardChaining.check_entailment(kb, query))
+            self.assertEqual(TruthTable.check_entailment(compact, query),
+                             TruthTable.check_entailment(kb, query))
+
     def test_backward_chaining_simple(self):
         kb = KnowledgeBase()
         kb.add_clause(Clause([], Literal("p1")))
@@ -58,6 +400,61 @@ class TestLogicEngine(unittest.TestCase):
         self.assertTrue(entailed)
         self.assertEqual(order, ["p1", "p2"])
 
+    def test_head_index_follows_added_and_retracted_clauses(self):
+        kb = KnowledgeBase()
+        rule = Clause([Literal("c"), Literal("a")], Literal("d"))
+        kb.add_clause(Clause([], Literal("a")))
+        kb.add_clause(rule)
+        kb.add_clause(Clause([Literal("b")], Literal("d")))
+        self.assertEqual([premises for _, premises in kb.by_head["d"]], [("a", "c"), ("b",)])
+        kb.retract_clause(rule)
+        self.assertEqual([premises for _, premises in kb.by_head["d"]], [("b",)])
+        kb.retract_fact("a")
+        self.assertNotIn("a", kb.by_head)
+
+    def test_backward_chaining_tabled_matches_search(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("f")))
+        kb.add_clause(Clause([Literal("s")], Literal("a")))
+        kb.add_clause(Clause([Literal("f")], Literal("a")))
+        kb.add_clause(Clause([Literal("a")], Literal("s")))
+        kb.add_clause(Clause([Literal("a"), Literal("s")], Literal("q")))
+        kb.add_clause(Clause([Literal("r")], Literal("q")))
+        kb.add_clause(Clause([Literal("q")], Literal("r")))
+        # s first fails against a, still in progress, and is retried once a is proven
+        self.assertEqual(BackwardChaining.check_entailment(kb, "q", mode="tabled"),
+                         BackwardChaining.check_entailment(kb, "q"))
+        self.assertEqual(BackwardChaining.check_entailment(kb, "r", mode="tabled"),
+                         (True, ["f", "a", "s", "q", "r"]))
+        kb.add_clause(Clause([Literal("x")], Literal("y")))
+        self.assertFalse(BackwardChaining.check_entailment(kb, "y", mode="tabled")[0])
+
+    def test_backward_chaining_cost_order_fails_first(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("f")))
+        kb.add_clause(Clause([Literal("a"), Literal("z")], Literal("goal")))
+        kb.add_clause(Clause([Literal("f")], Literal("goal")))
+        kb.add_clause(Clause([Literal("f")], Literal("a")))
+        compact = CompactKnowledgeBase.from_knowledge_base(kb)
+        head_offsets, head_clauses, premises = BackwardChaining.cost_ordered_rules(compact)
+        goal = compact.ids["goal"]
+        # The all-fact body first, and z (no rule, not a fact) before a
+        self.assertEqual(list(head_clauses[head_offsets[goal]:head_offsets[goal + 1]]), [2, 1])
+        self.assertEqual([compact.names[p] for p in premises[0:2]], ["z", "a"])
+        self.assertEqual(BackwardChaining.check_entailment(kb, "goal", mode="cost"),
+                         (True, ["f", "goal"]))
+
+    def test_backward_chaining_deep_chain(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("a0")))
+        for i in range(5000):
+            kb.add_clause(Clause([Literal(f"a{i}")], Literal(f"a{i + 1}")))
+        expected = (True, [f"a{i}" for i in range(5001)])
+        self.assertEqual(BackwardChaining.check_entailment(kb, "a5000"), expected)
+        self.assertEqual(BackwardChaining.check_entailment(kb, "a5000", mode="tabled"), expected)
+        compact = CompactKnowledgeBase.from_knowledge_base(kb)
+        self.assertEqual(BackwardChaining.check_entailment(compact, "a5000"), expected)
+
     def test_truth_table_simple(self):
         kb = KnowledgeBase()
         kb.add_clause(Clause([], Literal("p1")))
@@ -66,6 +463,44 @@ class TestLogicEngine(unittest.TestCase):
         self.assertTrue(entailed)
         self.assertEqual(models, 1)
 
+    def test_truth_table_compiled_matches_enumeration(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("p1")))
+        kb.add_clause(Clause([Literal("p1"), Literal("p3")], Literal("p2")))
+        kb.add_clause(Clause([Literal("p2")], Literal("p4")))
+        for query in ("p1", "p2", "p3", "p4"):
+            self.assertEqual(TruthTable.check_entailment(kb, query, mode="compiled"),
+                             TruthTable.check_entailment(kb, query))
+
+    def test_truth_table_parallel_matches_enumeration(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("p0")))
+        for i in range(1, TruthTable.PARALLEL_MIN_SYMBOLS):
+            kb.add_clause(Clause([Literal(f"p{i - 1}")], Literal(f"p{i}")))
+        kb.add_clause(Clause([Literal("p3"), Literal("q")], Literal("r")))
+        for query in ("p5", "r"):
+            self.assertEqual(
+                TruthTable.check_entailment(kb, query, mode="parallel", workers=2),
+                TruthTable.check_entailment(kb, query))
+
+    def test_truth_table_pruned_matches_enumeration(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("p1")))
+        kb.add_clause(Clause([Literal("p1"), Literal("p3")], Literal("p2")))
+        kb.add_clause(Clause([Literal("p2")], Literal("p4")))
+        self.assertEqual(TruthTable.check_entailment(kb, "p1", mode="prune"),
+                         TruthTable.check_entailment(kb, "p1"))
+        self.assertFalse(TruthTable.check_entailment(kb, "p4", mode="prune")[0])
+
+    def test_truth_table_gray_code_matches_enumeration(self):
+        kb = KnowledgeBase()
+        kb.add_clause(Clause([], Literal("p1")))
+        kb.add_clause(Clause([Literal("p1"), Literal("p3")], Literal("p2")))
+        kb.add_clause(Clause([Literal("p2")], Literal("p4")))
+        self.assertEqual(TruthTable.check_entailment(kb, "p1", mode="gray"),
+                         TruthTable.check_entailment(kb, "p1"))
+        self.assertFalse(TruthTable.check_entailment(kb, "p4", mode="gray")[0])
+
     def test_algorithm_consistency(self):
         kb = KnowledgeBase()
         kb.add_clause(Clause([], Literal("p1")))